@@ -3,6 +3,7 @@ from config.coins.xrp_config import XRPConfig
 from utils.logger import log
 import traceback
 from src.api_client import UpbitClient
+from src.candle_archive import candle_archive
 import numpy as np
 from datetime import datetime
 
@@ -125,6 +126,12 @@ def main():
         
         print(f"데이터 확인: {len(df)}일치 (최근: {df.index[-1]})")
         
+        # 로컬 아카이브 보유 구간 (백필/실거래 중 저장된 일봉)
+        first_ts, last_ts = candle_archive.get_range(market, 'day')
+        if first_ts is not None:
+            archived = len(candle_archive.get_view(market, 'day'))
+            print(f"로컬 아카이브: {archived}일치 ({datetime.fromtimestamp(first_ts):%Y-%m-%d} ~ {datetime.fromtimestamp(last_ts):%Y-%m-%d})")
+        
         # 지표 계산
         print("\n[기술적 지표 계산 중...]")
         indicators = strategy.calculate_indicators(market)
@@ -22,4 +22,6 @@ class XRPConfig:
     # 기술적 지표 설정
     MA_PERIODS = [5, 10, 20, 60]
     BB_PERIOD = 20
-    RSI_PERIOD = 14
\ No newline at end of file
+    RSI_PERIOD = 14
+    RSI_BUY = 25     # RSI 매수 기준 (이하)
+    RSI_SELL = 75    # RSI 매도 기준 (이상)
\ No newline at end of file
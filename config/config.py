@@ -24,6 +24,15 @@ class Config:
     LOSS_RATE = 0.008        # 손실 제한 (-0.8%)
     TRADE_INTERVAL = 10      # 거래 간격 10초
     SELL_ALL_ON_STOP = False # 종료 시 전량 매도 여부
+    FEE_RATE = 0.0005        # 거래 수수료율 (0.05%)
+    
+    # 거래 대상 마켓 (코인 티커 -> 전략/설정)
+    # strategy: 전략 이름, config: config/coins의 설정 클래스 (없으면 전략 기본 설정),
+    # params: 설정값 덮어쓰기 (예: {'TRADE_UNIT': 5000})
+    TRADING_MARKETS = {
+        'XRP': {'strategy': 'xrp', 'config': 'XRPConfig'},
+        # 'BTC': {'strategy': 'xrp', 'config': 'BTCConfig'},
+    }
     
     # 출력 형식 설정
     PRICE_DECIMAL = 2        # 가격 소수점 자릿수
@@ -58,7 +67,124 @@ class Config:
     AUTO_ADJUST_INTERVAL = True  # 거래 간격 자동 조정 여부
     
     # API 설정
-    MAX_API_CALLS = 600      # 분당 최대 API 호출 수
     MIN_API_INTERVAL = 0.1   # API 호출 간 최소 간격 (초)
+    UPBIT_DEFAULT_SERVER_URL = 'https://api.upbit.com'  # 실제 거래소 REST API 주소
+    UPBIT_SERVER_URL = os.getenv('UPBIT_SERVER_URL', UPBIT_DEFAULT_SERVER_URL)  # REST API 주소
+    
+    # HTTP 커넥션 풀 설정
+    HTTP_POOL_CONNECTIONS = 4  # 캐시할 호스트별 풀 개수
+    HTTP_POOL_MAXSIZE = 10     # 호스트당 최대 커넥션 수
+    HTTP_POOL_BLOCK = True     # 풀이 가득 차면 새 연결 대신 대기
+    HTTP_TIMEOUT = 5           # 요청 타임아웃 (초)
+    
+    # API 요청 제한 설정 (그룹별 초당 최대 요청 수, Remaining-Req 헤더로 재동기화)
+    RATE_LIMIT_QUOTATION = 10  # 시세 조회 API
+    RATE_LIMIT_ACCOUNT = 30    # 계좌/주문 조회 API
+    RATE_LIMIT_ORDER = 8       # 주문 생성/취소 API
+    RATE_LIMIT_BACKOFF = 1.0   # 429 응답 시 대기 시간 (초)
+    RATE_LIMIT_RETRIES = 2     # 429 응답 시 재시도 횟수
+    
+    # 계좌 스냅샷 설정
+    ACCOUNT_CACHE_TTL = 3.0    # 계좌 스냅샷 재사용 시간 (초, 주문 후에는 즉시 무효화)
+    
+    # 시세 스냅샷 설정
+    PRICE_SNAPSHOT_TTL = 2.0   # 배치 조회한 현재가 재사용 시간 (초)
+    TICKER_BATCH_SIZE = 100    # 시세 조회 1회당 최대 마켓 수
+    
+    # 실시간 시세(웹소켓) 설정
+    USE_WEBSOCKET_FEED = True  # 웹소켓 실시간 시세 사용 여부 (연결 실패 시 REST 조회로 대체)
+    UPBIT_WEBSOCKET_URL = os.getenv('UPBIT_WEBSOCKET_URL', 'wss://api.upbit.com/websocket/v1')
+    # REST 주소가 실제 거래소가 아닐 때도 웹소켓 시세 사용 (같은 가격 원천을 제공하는 웹소켓일 때만 켤 것)
+    FEED_WITH_CUSTOM_SERVER = os.getenv('FEED_WITH_CUSTOM_SERVER', '').lower() in ('1', 'true', 'yes')
+    FEED_PING_INTERVAL = 60        # 연결 유지 ping 간격 (초)
+    FEED_RECONNECT_MIN_DELAY = 1   # 재연결 최소 대기 시간 (초)
+    FEED_RECONNECT_MAX_DELAY = 30  # 재연결 최대 대기 시간 (초)
+    FEED_TRADE_HISTORY = 100       # 마켓별 보관할 최근 체결 수
+    FEED_PRICE_MAX_AGE = 10.0      # 실시간 현재가 최대 사용 시간 (초, 넘으면 REST 조회)
+    FEED_ORDERBOOK_MAX_AGE = 2.0   # 실시간 호가 최대 사용 시간 (초, 넘으면 REST 조회)
+    
+    # 캔들 저장소 설정
+    CANDLE_STORE_CAPACITY = 200     # 마켓/간격별 보관 캔들 수
+    CANDLE_STORE_MIN_REFRESH = 1.0  # 같은 캔들 재조회 최소 간격 (초)
+    
+    # 캔들 리샘플링 설정 (1분봉으로 상위 간격 캔들을 로컬 생성)
+    USE_LOCAL_RESAMPLING = True     # 다중 시간대 분석에 로컬 생성 캔들 사용
+    RESAMPLER_CAPACITY = 200        # 간격별 보관 캔들 수
+    
+    # 캔들 아카이브/과거 데이터 수집 설정
+    USE_CANDLE_ARCHIVE = True       # 캔들 저장소가 아카이브에서 이력을 읽고 마감된 캔들을 추가
+    CANDLE_ARCHIVE_DIR = os.path.join('data', 'candles')  # 마켓/간격별 메모리 맵 캔들 파일 위치
+    BACKFILL_CHECKPOINT_FILE = os.path.join('data', 'backfill_checkpoint.json')  # 수집 진행 상황
+    BACKFILL_WORKERS = 4            # 동시에 수집할 (마켓, 간격) 작업 수
+    BACKFILL_FLUSH_PAGES = 50       # 아카이브 저장/체크포인트 기록 주기 (페이지)
+    
+    # 지표 캐시 설정 (마감 캔들 기준 지표 상태 재사용)
+    INDICATOR_CACHE_MAX_ENTRIES = 1024            # 최대 (마켓, 간격, 마감 시각, 파라미터) 항목 수
+    INDICATOR_CACHE_MAX_BYTES = 32 * 1024 * 1024  # 최대 메모리 사용량 (바이트)
+    
+    # 전략 이벤트 설정
+    USE_EVENT_ENGINE = True         # 전략을 틱/캔들 마감/체결 이벤트로 호출 (False면 매 틱 신호 조회)
+    
+    # 신호 재평가 설정 (입력이 그대로면 이전 신호 재사용)
+    USE_SIGNAL_GATE = True          # False면 매 틱 신호 평가
+    SIGNAL_PRICE_THRESHOLD = 0.001  # 마지막 평가 대비 현재가 변화율이 이 이상이면 재평가 (0.1%)
+    SIGNAL_MAX_AGE = 60             # 변화가 없어도 이 시간(초)이 지나면 재평가
+    
+    # 주문 체결 추적 설정
+    ORDER_POLL_BATCH = 100          # 주문 상태 조회 1회당 최대 주문 수
+    ORDER_POLL_INTERVAL = 0.3       # 주문 직후 체결 확인 조회 간격 (초)
+    ORDER_CONFIRM_TIMEOUT = 3.0     # 주문 직후 체결 확인 대기 시간 (초, 이후는 거래 주기마다 확인)
+    ORDER_HISTORY = 1000            # 보관할 완료 주문 수
+    
+    # 주문 일괄 정리 설정 (시작/종료 시 미체결 취소 및 청산)
+    MIN_ORDER_AMOUNT = 5000         # 최소 주문 금액 (원)
+    RECONCILE_WORKERS = 8           # 취소/매도 요청 동시 실행 수 (실제 속도는 주문 요청 제한이 결정)
+    RECONCILE_PAGE_SIZE = 100       # 미체결 주문 조회 1페이지 크기
+    
+    # 실행 주기 설정 (TRADE_INTERVAL초 경계 + SCHEDULE_OFFSET에 실행, 60의 약수면 분봉 마감 직후와 맞춰짐)
+    SCHEDULE_OFFSET = 2.0           # 경계 이후 실행까지 여유 (초, 거래소 캔들 마감 반영 대기)
+    SCHEDULER_LATE_TOLERANCE = 2.0  # 이보다 늦게 깨어난 주기는 실행하지 않고 버림 (초)
+    SCHEDULER_STATS_WINDOW = 1000   # 지연 통계에 쓰는 최근 실행 수
+    
+    # 마켓별 작업자 설정 (마켓마다 각자의 주기로 동시 실행)
+    USE_MARKET_WORKERS = True       # False면 모든 마켓을 한 루프에서 순서대로 실행
+    MARKET_WORKERS = 8              # 동시에 실행할 최대 마켓 수
+    MARKET_WORKER_POLL = 0.01       # 실행할 마켓 확인 최소 간격 (초)
+    MARKET_WORKER_LATENCY_WINDOW = 100  # 마켓별 지연 통계에 쓰는 최근 실행 수
+    
+    # 마켓 스캐너 설정 (전체 마켓 매수 조건 평가)
+    USE_SCREENER = True             # 거래 틱마다 전체 마켓 매수 후보 스캔
+    SCREENER_BUDGET = 2.0           # 스캔 1회 지연 예산 (초)
+    SCREENER_EVAL_RESERVE = 0.25    # 예산 중 지표 계산에 남겨둘 비율 (나머지로 이력 조회)
+    SCREENER_HISTORY = 100          # 평가에 사용할 일봉 수 (형성 중 캔들 포함)
+    SCREENER_TOP_N = 10             # 보고할 최대 후보 수
+    SCREENER_MARKET_REFRESH = 3600  # 대상 마켓 목록 갱신 주기 (초)
+    
+    # 거래소 에뮬레이터 설정 (emulator/rest_server.py, UPBIT_SERVER_URL을 서버 주소로 설정해 접속)
+    EMULATOR_HOST = '127.0.0.1'
+    EMULATOR_PORT = 8780
+    EMULATOR_LATENCY = 0.02         # 응답 지연 (초)
+    EMULATOR_LATENCY_JITTER = 0.01  # 응답 지연에 더할 최대 무작위 값 (초)
+    EMULATOR_MARKETS = 200          # 마켓 수 (거래 대상 마켓 + 합성 마켓)
+    EMULATOR_HISTORY_DAYS = 200     # 현재 시각 이전 가격 이력 일수
+    EMULATOR_DAILY_VOLATILITY = 0.04  # 합성 가격 경로 일간 변동성
+    EMULATOR_DAY_CACHE = 256        # 메모리에 보관할 (마켓, 날짜)별 1분봉 수
+    EMULATOR_INITIAL_KRW = 10000000 # 시작 원화 잔고
+    EMULATOR_ORDERBOOK_DEPTH = 15   # 호가 단계 수
+    EMULATOR_LEVEL_VALUE = 5000000  # 호가 단계별 평균 잔량 (원)
+    EMULATOR_RATE_LIMITS = {        # 그룹별 초당 요청 한도 (Remaining-Req 그룹 이름)
+        'market': 10, 'ticker': 10, 'candles': 10, 'orderbook': 10,
+        'default': 30, 'order': 8,
+    }
     
-   
\ No newline at end of file
+    # 주문 분할 실행 설정 (지정가/IOC 자식 주문으로 나눠 실행해 스프레드와 슬리피지 비용 절감)
+    USE_SMART_EXECUTION = False     # True면 실거래 매수/매도를 분할 실행 (False면 시장가 주문)
+    EXECUTION_STYLE = 'twap'        # 'twap': 시간 구간별 분할, 'peg': 전량을 최우선 호가에 대기
+    EXECUTION_DURATION = 60         # 부모 주문 실행 시간 (초, 이후 남은 수량은 IOC로 처리)
+    EXECUTION_SLICES = 6            # TWAP 분할 수
+    EXECUTION_POLL_INTERVAL = 1.0   # 호가/체결 확인 간격 (초)
+    EXECUTION_REPRICE_INTERVAL = 2.0  # 같은 자식 주문을 다시 호가하기까지 최소 시간 (초)
+    EXECUTION_ORDER_RATE = 4        # 실행 엔진이 쓰는 초당 주문 생성/취소 수 (주문 API 한도의 일부)
+    EXECUTION_MAX_SLIPPAGE = 0.005  # IOC 주문 가격 한도 (최우선 호가 대비 비율)
+    EXECUTION_SWEEP_ATTEMPTS = 3    # 마감 후 남은 수량 IOC 시도 횟수
+    EXECUTION_CANCEL_TIMEOUT = 10.0  # 자식 주문 취소/완료 확인 최대 대기 (초, 넘으면 포기하고 경고)
@@ -0,0 +1,166 @@
+import argparse
+import bisect
+import json
+import os
+import sys
+import time
+
+# 프로젝트 루트 경로를 Python 경로에 추가
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from config.config import Config
+from utils.logger import log
+from emulator.rest_server import EmulatorError, ExchangeState
+
+
+def load_snapshots(path):
+    """기록 파일(한 줄에 /v1/orderbook 호가 하나)을 마켓별 (시각, 호가) 목록으로 읽음"""
+    snapshots = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            orderbook = json.loads(line)
+            snapshots.setdefault(orderbook['market'], []).append((orderbook['timestamp'] / 1000.0, orderbook))
+    for rows in snapshots.values():
+        rows.sort(key=lambda row: row[0])
+    return snapshots
+
+
+def record_orderbooks(session, markets, path, interval=1.0, duration=60.0):
+    """markets 호가를 interval초마다 한 번에 조회해 path에 한 줄씩 추가, 기록한 호가 수 반환"""
+    markets = list(markets)
+    count = 0
+    deadline = time.monotonic() + duration
+    with open(path, 'a', encoding='utf-8') as f:
+        while time.monotonic() < deadline:
+            started = time.monotonic()
+            try:
+                orderbooks = session.get('/v1/orderbook', params={'markets': ','.join(markets)}) or []
+            except Exception as e:
+                log.log('WA', f"호가 기록 중 오류: {str(e)}")
+                orderbooks = []
+            for orderbook in orderbooks:
+                f.write(json.dumps(orderbook, separators=(',', ':')) + '\n')
+            count += len(orderbooks)
+            f.flush()
+            time.sleep(max(interval - (time.monotonic() - started), 0.0))
+    return count
+
+
+class ReplayVenue:
+    """기록된 호가 스냅샷 위에서 주문을 체결하는 실행 대상 (가상 시계)
+
+    sleep은 실제로 기다리지 않고 시계만 앞으로 옮기며, 호가는 시계 시각 이전의 마지막 스냅샷을
+    쓴다. 주문 장부와 체결 규칙은 REST 에뮬레이터의 ExchangeState를 그대로 쓰므로 지정가 대기 주문은
+    반대편 최우선 호가가 주문 가격에 닿을 때 체결된다 (대기열 순서는 고려하지 않음).
+    ExecutionEngine에 넘기면 같은 기록으로 실행 방식별 비용을 반복해서 비교할 수 있다.
+    """
+    def __init__(self, snapshots, initial_krw=None, balances=None, fee_rate=None, start=None):
+        self.snapshots = snapshots
+        self.times = {market: [ts for ts, _ in rows] for market, rows in snapshots.items()}
+        first = min(rows[0][0] for rows in snapshots.values() if rows)
+        self.clock = first if start is None else start
+        self.market_data = self
+        self.state = ExchangeState(self, initial_krw=initial_krw, fee_rate=fee_rate)
+        for currency, balance in (balances or {}).items():
+            self.state.get_account(currency)['balance'] = float(balance)
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        return cls(load_snapshots(path), **kwargs)
+
+    @property
+    def end(self):
+        """마지막 스냅샷 시각"""
+        return max(rows[-1][0] for rows in self.snapshots.values() if rows)
+
+    def now(self):
+        return self.clock
+
+    def sleep(self, seconds):
+        self.clock += max(seconds, 0.0)
+
+    def has_market(self, market):
+        return bool(self.snapshots.get(market))
+
+    def get_orderbook(self, market, now=None):
+        """now(없으면 시계) 이전의 마지막 호가 (기록 시작 전이면 첫 호가)"""
+        times = self.times.get(market)
+        if not times:
+            return None
+        index = bisect.bisect_right(times, self.clock if now is None else now) - 1
+        return self.snapshots[market][max(index, 0)][1]
+
+    def get_price(self, market, now=None):
+        """중간 가격"""
+        orderbook = self.get_orderbook(market, now)
+        if orderbook is None:
+            return None
+        unit = orderbook['orderbook_units'][0]
+        return (unit['ask_price'] + unit['bid_price']) / 2
+
+    def place_limit_order(self, market, side, price, volume, time_in_force=None):
+        try:
+            return self.state.place_order({
+                'market': market, 'side': side, 'ord_type': 'limit',
+                'price': str(price), 'volume': f"{volume:.8f}", 'time_in_force': time_in_force,
+            })
+        except EmulatorError as e:
+            log.log('WA', f"재생 주문 실패 ({market} {side} {volume} @ {price}): {e.name} {e.message}")
+            return None
+
+    def cancel_order(self, uuid):
+        try:
+            return self.state.cancel_order(uuid)
+        except EmulatorError as e:
+            log.log('WA', f"재생 주문 취소 실패 ({uuid}): {e.name} {e.message}")
+            return None
+
+    def get_order(self, uuid):
+        try:
+            return self.state.get_order(uuid)
+        except EmulatorError as e:
+            log.log('WA', f"재생 주문 조회 실패 ({uuid}): {e.name} {e.message}")
+            return None
+
+    def get_orders(self, uuids):
+        """완료(done/cancel)된 주문만 반환"""
+        return self.state.list_orders({'uuids[]': list(uuids), 'states[]': ['done', 'cancel'], 'limit': 100})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="호가 기록 / 기록된 호가로 분할 실행 재생")
+    commands = parser.add_subparsers(dest='command', required=True)
+    record = commands.add_parser('record', help="/v1/orderbook 호가를 주기적으로 기록")
+    record.add_argument('path')
+    record.add_argument('--markets', nargs='+', default=[f"{Config.CURRENCY}-{ticker}" for ticker in Config.TRADING_MARKETS])
+    record.add_argument('--interval', type=float, default=1.0, help="기록 간격 (초)")
+    record.add_argument('--duration', type=float, default=600.0, help="기록 시간 (초)")
+    replay = commands.add_parser('replay', help="기록된 호가로 부모 주문 분할 실행")
+    replay.add_argument('path')
+    replay.add_argument('market')
+    replay.add_argument('side', choices=['bid', 'ask'])
+    replay.add_argument('amount', type=float, help="매수 금액(원) 또는 매도 수량")
+    replay.add_argument('--style', choices=['twap', 'peg'], default=Config.EXECUTION_STYLE)
+    replay.add_argument('--duration', type=float, default=Config.EXECUTION_DURATION)
+    replay.add_argument('--slices', type=int, default=Config.EXECUTION_SLICES)
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        from src.http_session import upbit_session
+        count = record_orderbooks(upbit_session, args.markets, args.path, args.interval, args.duration)
+        print(f"호가 {count}개를 {args.path}에 기록했습니다")
+    else:
+        from src.execution_engine import ExecutionEngine, ParentOrder
+        ticker = args.market.split('-')[1]
+        venue = ReplayVenue.from_file(args.path, balances={ticker: args.amount} if args.side == 'ask' else None)
+        parent = ParentOrder(args.market, args.side, funds=args.amount if args.side == 'bid' else None,
+                             volume=args.amount if args.side == 'ask' else None,
+                             style=args.style, duration=args.duration, slices=args.slices)
+        report = ExecutionEngine(venue).execute(parent)
+        print(f"평균 체결가 {report.price:,.4f} / 도착 중간가 {report.arrival_price:,.4f}, "
+              f"실행 비용 {report.shortfall_bps:+.1f}bp (시장가 추정 {report.market_cost_bps:+.1f}bp), "
+              f"미체결 {report.unfilled_volume:.8f}")
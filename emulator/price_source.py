@@ -0,0 +1,268 @@
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+# 프로젝트 루트 경로를 Python 경로에 추가
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from config.config import Config
+from src.candle_store import CANDLE_FIELDS
+
+DAY = 86400
+MINUTES_PER_DAY = 1440
+
+
+def empty_arrays():
+    """빈 캔들 배열"""
+    return {field: np.empty(0, dtype=np.int64 if field == 'ts' else np.float64) for field in CANDLE_FIELDS}
+
+
+def week_start(ts):
+    """주봉 시작 시각 (월요일 UTC 자정, epoch 0은 목요일)"""
+    return (ts - 4 * DAY) // (7 * DAY) * (7 * DAY) + 4 * DAY
+
+
+def month_start(ts):
+    """월봉 시작 시각 (매월 1일 UTC 자정)"""
+    return ts.astype('datetime64[s]').astype('datetime64[M]').astype('datetime64[s]').astype(np.int64)
+
+
+def aggregate(arrays, seconds=None, bucket_func=None):
+    """과거순 캔들 배열을 seconds 간격(또는 bucket_func가 정한 구간) 캔들로 합침"""
+    if len(arrays['ts']) == 0:
+        return empty_arrays()
+    buckets = bucket_func(arrays['ts']) if bucket_func else arrays['ts'] // seconds * seconds
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(buckets)] - 1
+    return {
+        'ts': buckets[starts],
+        'open': arrays['open'][starts],
+        'high': np.maximum.reduceat(arrays['high'], starts),
+        'low': np.minimum.reduceat(arrays['low'], starts),
+        'close': arrays['close'][ends],
+        'volume': np.add.reduceat(arrays['volume'], starts),
+        'value': np.add.reduceat(arrays['value'], starts),
+    }
+
+
+class SyntheticPriceSource:
+    """마켓별 합성 가격 경로 (같은 seed면 항상 같은 경로)
+
+    일봉 종가는 로그 정규 랜덤 워크로 만들고, 하루 안의 1분봉은 전날 종가에서 그날 종가로
+    이어지는 브라운 브리지로 필요할 때 만든다. 1분봉은 (seed, 마켓, 날짜)로 정해지므로
+    전부 저장하지 않아도 같은 날을 다시 조회하면 같은 캔들이 나온다.
+    """
+    def __init__(self, markets, history_days=None, volatility=None, seed=0, base_prices=None, start=None):
+        self.markets = list(markets)
+        self.history_days = history_days or Config.EMULATOR_HISTORY_DAYS
+        self.volatility = volatility or Config.EMULATOR_DAILY_VOLATILITY
+        self.seed = seed
+        today = int(time.time() if start is None else start) // DAY * DAY
+        self.first_day = today - self.history_days * DAY
+        base_prices = base_prices or {}
+        rng = np.random.default_rng([seed, 0])
+        self.base_prices = {
+            market: float(base_prices.get(market) or 10 ** rng.uniform(1, 7)) for market in self.markets
+        }
+        self.index = {market: i + 1 for i, market in enumerate(self.markets)}
+        self.closes = {market: [] for market in self.markets}  # 마켓 -> first_day부터의 일봉 종가
+        self.lock = threading.Lock()
+
+    def has_market(self, market):
+        return market in self.index
+
+    def get_day_close(self, market, day):
+        """day(UTC 자정)의 일봉 시가/종가 (필요한 날까지 종가 경로를 늘림)"""
+        position = (day - self.first_day) // DAY
+        if position < 0:
+            return self.base_prices[market], self.base_prices[market]
+        with self.lock:
+            closes = self.closes[market]
+            if len(closes) <= position:
+                start = len(closes)
+                rng = np.random.default_rng([self.seed, self.index[market], start])
+                steps = rng.normal(-0.5 * self.volatility ** 2, self.volatility, position + 1 - start + 64)
+                previous = closes[-1] if closes else self.base_prices[market]
+                closes.extend((previous * np.exp(np.cumsum(steps))).tolist())
+            opening = closes[position - 1] if position > 0 else self.base_prices[market]
+            return opening, closes[position]
+
+    def get_minutes(self, market, day):
+        """day(UTC 자정) 하루의 1분봉 배열"""
+        opening, closing = self.get_day_close(market, day)
+        rng = np.random.default_rng([self.seed, self.index[market], day // DAY, 1])
+        sigma = self.volatility / np.sqrt(MINUTES_PER_DAY)
+        walk = np.concatenate(([0.0], np.cumsum(rng.normal(0.0, sigma, MINUTES_PER_DAY))))
+        fraction = np.linspace(0.0, 1.0, MINUTES_PER_DAY + 1)
+        path = np.exp(np.log(opening) + (np.log(closing) - np.log(opening)) * fraction + walk - fraction * walk[-1])
+
+        opens, closes = path[:-1], path[1:]
+        wick = np.abs(rng.normal(0.0, sigma * 0.5, (2, MINUTES_PER_DAY)))
+        volume = rng.lognormal(0.0, 1.0, MINUTES_PER_DAY) * 1e6 / opening
+        return {
+            'ts': day + np.arange(MINUTES_PER_DAY, dtype=np.int64) * 60,
+            'open': opens,
+            'high': np.maximum(opens, closes) * (1 + wick[0]),
+            'low': np.minimum(opens, closes) * (1 - wick[1]),
+            'close': closes,
+            'volume': volume,
+            'value': volume * closes,
+        }
+
+
+class ArchivePriceSource:
+    """캔들 아카이브의 1분봉을 재생하는 가격 경로
+
+    기록된 시각을 하루 단위로 옮겨 재생 시작 시점(기록 첫날 + history_days)이 오늘이 되게 한다.
+    일 경계가 유지되므로 일봉/분봉 경계도 실제 거래소와 같다. 기록이 끝나면 마지막 가격에 머문다.
+    """
+    def __init__(self, archive, markets=None, history_days=None, start=None):
+        self.archive = archive
+        self.history_days = history_days or Config.EMULATOR_HISTORY_DAYS
+        self.markets = [market for market in (markets or []) if archive.exists(market, 'minute1')]
+        firsts = [archive.get_range(market, 'minute1')[0] for market in self.markets]
+        firsts = [first for first in firsts if first is not None]
+        today = int(time.time() if start is None else start) // DAY * DAY
+        recorded_start = (min(firsts) // DAY + self.history_days) * DAY if firsts else today
+        self.shift = today - recorded_start
+        self.first_day = today - self.history_days * DAY
+
+    def has_market(self, market):
+        return market in self.markets
+
+    def get_minutes(self, market, day):
+        """day(UTC 자정) 하루의 1분봉 배열 (기록이 없으면 빈 배열)"""
+        arrays = self.archive.read(market, 'minute1', day - self.shift, day + DAY - self.shift)
+        arrays['ts'] = arrays['ts'] + self.shift
+        return arrays
+
+
+class MarketData:
+    """가격 경로에서 현재가, 형성 중 캔들, 간격별 캔들을 만드는 조회 계층
+
+    하루치 1분봉은 LRU로 최근 EMULATOR_DAY_CACHE일만 보관하고, 마감된 날의 일봉 요약은
+    마켓별로 계속 보관한다. 현재 시각 이후의 데이터는 어떤 응답에도 나오지 않는다.
+    """
+    def __init__(self, source, cache_days=None):
+        self.source = source
+        self.cache_days = cache_days or Config.EMULATOR_DAY_CACHE
+        self.minutes = OrderedDict()   # (마켓, 날짜) -> 1분봉 배열
+        self.day_rows = {}             # (마켓, 날짜) -> 마감 일봉 한 행
+        self.lock = threading.Lock()
+
+    @property
+    def markets(self):
+        return self.source.markets
+
+    def has_market(self, market):
+        return self.source.has_market(market)
+
+    def get_minutes(self, market, day):
+        """하루치 1분봉 (LRU 캐시)"""
+        key = (market, day)
+        with self.lock:
+            arrays = self.minutes.get(key)
+            if arrays is not None:
+                self.minutes.move_to_end(key)
+                return arrays
+        arrays = self.source.get_minutes(market, day)
+        with self.lock:
+            self.minutes[key] = arrays
+            while len(self.minutes) > self.cache_days:
+                self.minutes.popitem(last=False)
+        return arrays
+
+    def get_minutes_until(self, market, day, now):
+        """day의 1분봉 중 now까지 (형성 중인 1분봉은 now까지의 경로로 잘라서 포함)"""
+        arrays = self.get_minutes(market, day)
+        ts = arrays['ts']
+        count = int(np.searchsorted(ts, now, side='right'))
+        rows = {field: arrays[field][:count] for field in CANDLE_FIELDS}
+        if count and ts[count - 1] + 60 > now:
+            # 분 안의 가격은 시가에서 종가로 선형 이동
+            last = count - 1
+            fraction = (now - ts[last]) / 60.0
+            opening = arrays['open'][last]
+            price = opening + (arrays['close'][last] - opening) * fraction
+            rows = {field: rows[field].copy() for field in CANDLE_FIELDS}
+            rows['close'][last] = price
+            rows['high'][last] = max(opening, price)
+            rows['low'][last] = min(opening, price)
+            rows['volume'][last] = arrays['volume'][last] * fraction
+            rows['value'][last] = rows['volume'][last] * price
+        return rows
+
+    def get_day_row(self, market, day):
+        """마감된 날의 일봉 한 행 (기록이 없으면 None, 1분봉 LRU를 거치지 않음)"""
+        key = (market, day)
+        row = self.day_rows.get(key)
+        if row is None and key not in self.day_rows:
+            arrays = aggregate(self.source.get_minutes(market, day), DAY)
+            row = {field: arrays[field][0] for field in CANDLE_FIELDS} if len(arrays['ts']) else None
+            self.day_rows[key] = row
+        return row
+
+    def get_price(self, market, now=None):
+        """now 시각의 현재가 (없으면 None)"""
+        now = time.time() if now is None else now
+        day = int(now) // DAY * DAY
+        while day >= self.source.first_day:
+            rows = self.get_minutes_until(market, day, now)
+            if len(rows['ts']):
+                return float(rows['close'][-1])
+            day -= DAY
+        return None
+
+    def get_days(self, market, end, count):
+        """end 이전에 시작한 일봉 최대 count개 (과거순, 형성 중인 오늘 일봉 포함)"""
+        now = time.time()
+        day = (min(int(end), int(now) + 1) - 1) // DAY * DAY
+        rows = []
+        while len(rows) < count and day >= self.source.first_day:
+            if day + DAY > now:
+                arrays = aggregate(self.get_minutes_until(market, day, now), DAY)
+                row = {field: arrays[field][0] for field in CANDLE_FIELDS} if len(arrays['ts']) else None
+            else:
+                row = self.get_day_row(market, day)
+            if row is not None:
+                rows.append(row)
+            day -= DAY
+        rows.reverse()
+        if not rows:
+            return empty_arrays()
+        return {field: np.array([row[field] for row in rows]) for field in CANDLE_FIELDS}
+
+    def get_candles(self, market, seconds, end, count):
+        """end 이전에 시작한 seconds 간격 분봉 최대 count개 (과거순, 형성 중인 캔들 포함)"""
+        now = time.time()
+        end = min(int(end), int(now) + 1)
+        day = (end - 1) // DAY * DAY
+        parts = []
+        total = 0
+        while total < count and day >= self.source.first_day:
+            rows = self.get_minutes_until(market, day, now) if day + DAY > now else self.get_minutes(market, day)
+            candles = aggregate(rows, seconds)
+            keep = int(np.searchsorted(candles['ts'], end, side='left'))
+            parts.append({field: candles[field][:keep] for field in CANDLE_FIELDS})
+            total += keep
+            day -= DAY
+        if not parts:
+            return empty_arrays()
+        merged = {field: np.concatenate([part[field] for part in reversed(parts)]) for field in CANDLE_FIELDS}
+        return {field: merged[field][-count:] for field in CANDLE_FIELDS}
+
+    def get_day_stats(self, market, now=None):
+        """현재가 시세용 오늘 일봉과 전일 종가"""
+        now = time.time() if now is None else now
+        today = int(now) // DAY * DAY
+        days = self.get_days(market, today + DAY, 2)
+        if not len(days['ts']):
+            return None, None
+        current = {field: days[field][-1] for field in CANDLE_FIELDS}
+        previous_close = days['close'][-2] if len(days['ts']) > 1 else current['open']
+        return current, float(previous_close)
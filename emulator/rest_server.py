@@ -0,0 +1,687 @@
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid as uuid_lib
+import zlib
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, unquote, urlencode, urlsplit
+
+import jwt
+import numpy as np
+
+# 프로젝트 루트 경로를 Python 경로에 추가
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from config.config import Config
+from utils.logger import log
+from src.candle_store import CANDLE_FIELDS
+from src.upbit_market import get_tick_size, round_to_tick
+from src.fill_simulator import walk_book
+from emulator.price_source import (
+    DAY, SyntheticPriceSource, ArchivePriceSource, MarketData, aggregate, week_start, month_start,
+)
+
+KST = timezone(timedelta(hours=9))
+FINAL_STATES = ('done', 'cancel')
+
+
+class EmulatorError(Exception):
+    """업비트 형식 오류 응답 ({"error": {"name", "message"}})"""
+    def __init__(self, status, name, message):
+        self.status = status
+        self.name = name
+        self.message = message
+        super().__init__(f"[{status}] {name}: {message}")
+
+
+def format_number(value):
+    """업비트 응답처럼 숫자를 문자열로 표시"""
+    return f"{value:.8f}".rstrip('0').rstrip('.') or '0'
+
+
+def format_time(ts, tz=timezone.utc, with_offset=False):
+    """epoch 초를 업비트 응답 시각 문자열로 변환"""
+    moment = datetime.fromtimestamp(ts, tz)
+    return moment.isoformat(timespec='seconds') if with_offset else moment.strftime('%Y-%m-%dT%H:%M:%S')
+
+
+def parse_to(value):
+    """캔들 조회 to 파라미터를 epoch 초로 변환 (시간대가 없으면 UTC)"""
+    moment = datetime.fromisoformat(value.replace(' ', 'T').replace('Z', '+00:00'))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+class RequestLimiter:
+    """그룹별 초당 요청 수 제한 (최근 1초/1분 요청 시각 기록)"""
+    def __init__(self, limits=None):
+        self.limits = dict(limits or Config.EMULATOR_RATE_LIMITS)
+        self.seconds = {group: deque() for group in self.limits}
+        self.minutes = {group: deque() for group in self.limits}
+        self.lock = threading.Lock()
+        self.throttled_count = 0
+
+    def check(self, group):
+        """요청 기록 후 (허용 여부, Remaining-Req 헤더 값) 반환"""
+        now = time.monotonic()
+        rate = self.limits[group]
+        with self.lock:
+            seconds, minutes = self.seconds[group], self.minutes[group]
+            while seconds and now - seconds[0] >= 1:
+                seconds.popleft()
+            while minutes and now - minutes[0] >= 60:
+                minutes.popleft()
+            allowed = len(seconds) < rate
+            if allowed:
+                seconds.append(now)
+                minutes.append(now)
+            else:
+                self.throttled_count += 1
+            return allowed, f"group={group}; min={max(rate * 60 - len(minutes), 0)}; sec={max(rate - len(seconds), 0)}"
+
+
+class ExchangeState:
+    """계좌와 주문 장부 (시장가/지정가/IOC/FOK 주문을 에뮬레이터 호가로 체결)"""
+    def __init__(self, emulator, initial_krw=None, fee_rate=None):
+        self.emulator = emulator
+        self.fee_rate = Config.FEE_RATE if fee_rate is None else fee_rate
+        self.accounts = {'KRW': {'balance': float(initial_krw or Config.EMULATOR_INITIAL_KRW), 'locked': 0.0, 'avg_buy_price': 0.0}}
+        self.orders = {}       # uuid -> 주문
+        self.resting = {}      # 마켓 -> 대기 중인 지정가 주문 uuid 목록
+        self.lock = threading.RLock()
+        self.fill_count = 0
+
+    def get_account(self, currency):
+        return self.accounts.setdefault(currency, {'balance': 0.0, 'locked': 0.0, 'avg_buy_price': 0.0})
+
+    def get_accounts(self):
+        """/v1/accounts 응답"""
+        with self.lock:
+            self.match_resting()
+            return [{
+                'currency': currency,
+                'balance': format_number(account['balance']),
+                'locked': format_number(account['locked']),
+                'avg_buy_price': format_number(account['avg_buy_price']),
+                'avg_buy_price_modified': False,
+                'unit_currency': 'KRW',
+            } for currency, account in self.accounts.items() if account['balance'] > 0 or account['locked'] > 0 or currency == 'KRW']
+
+    def place_order(self, params):
+        """주문 생성 (요청 시점 상태를 반환하고, 체결 가능한 수량은 바로 체결)"""
+        market = params.get('market')
+        side = params.get('side')
+        ord_type = params.get('ord_type')
+        time_in_force = params.get('time_in_force')
+        if not self.emulator.market_data.has_market(market):
+            raise EmulatorError(400, 'market_does_not_exist', f"마켓이 존재하지 않습니다: {market}")
+        if side not in ('bid', 'ask') or ord_type not in ('limit', 'price', 'market'):
+            raise EmulatorError(400, 'validation_error', f"잘못된 주문 유형: side={side}, ord_type={ord_type}")
+        if (ord_type == 'price' and side != 'bid') or (ord_type == 'market' and side != 'ask'):
+            raise EmulatorError(400, 'validation_error', f"{ord_type} 주문은 {'매수' if ord_type == 'price' else '매도'}만 가능합니다")
+        try:
+            price = float(params['price']) if ord_type in ('limit', 'price') else None
+            volume = float(params['volume']) if ord_type in ('limit', 'market') else None
+        except (KeyError, TypeError, ValueError):
+            raise EmulatorError(400, 'validation_error', "price/volume 값이 올바르지 않습니다")
+
+        current = self.emulator.market_data.get_price(market)
+        if ord_type == 'limit':
+            if abs(round_to_tick(price) - price) > get_tick_size(price) * 1e-6:
+                raise EmulatorError(400, f'invalid_price_{side}', f"호가 단위에 맞지 않는 가격: {price}")
+            total = price * volume
+        elif ord_type == 'price':
+            total = price
+        else:
+            total = volume * current
+        if total < Config.MIN_ORDER_AMOUNT:
+            raise EmulatorError(400, f'under_min_total_{side}', f"최소 주문 금액은 {Config.MIN_ORDER_AMOUNT}원입니다")
+
+        ticker = market.split('-')[1]
+        with self.lock:
+            if side == 'bid':
+                account = self.get_account('KRW')
+                reserved = total * (1 + self.fee_rate)
+                if account['balance'] + 1e-9 < reserved:
+                    raise EmulatorError(400, 'insufficient_funds_bid', "주문 가능 금액이 부족합니다")
+            else:
+                account = self.get_account(ticker)
+                reserved = volume
+                if account['balance'] + 1e-12 < reserved:
+                    raise EmulatorError(400, 'insufficient_funds_ask', "주문 가능 수량이 부족합니다")
+            account['balance'] -= reserved
+            account['locked'] += reserved
+
+            order = {
+                'uuid': str(uuid_lib.uuid4()), 'market': market, 'side': side, 'ord_type': ord_type,
+                'price': price, 'volume': volume, 'time_in_force': time_in_force, 'state': 'wait',
+                'created_at': time.time(), 'locked': reserved, 'executed_volume': 0.0,
+                'executed_funds': 0.0, 'paid_fee': 0.0, 'trades': [],
+            }
+            self.orders[order['uuid']] = order
+            response = self.to_payload(order)
+            self.execute(order)
+            if order['state'] == 'wait':
+                self.resting.setdefault(market, []).append(order['uuid'])
+        return response
+
+    def execute(self, order):
+        """주문 접수 직후 호가를 따라 체결 (지정가는 가격 범위까지, IOC/FOK 잔량은 취소)"""
+        orderbook = self.emulator.get_orderbook(order['market'])
+        if order['ord_type'] == 'price':
+            fills, remaining = walk_book(orderbook['orderbook_units'], 'bid', funds=order['price'])
+        else:
+            limit = order['price'] if order['ord_type'] == 'limit' else None
+            fills, remaining = walk_book(orderbook['orderbook_units'], order['side'], volume=order['volume'], limit=limit)
+        fully_filled = not remaining
+
+        if order['time_in_force'] == 'fok' and not fully_filled:
+            fills = []
+        for fill_price, fill_volume in fills:
+            self.fill(order, fill_price, fill_volume)
+
+        if order['ord_type'] != 'limit' or order['time_in_force'] in ('ioc', 'fok'):
+            # 시장가/IOC/FOK는 남은 수량을 대기시키지 않음
+            self.finish(order, 'done' if fully_filled else 'cancel')
+        elif fully_filled:
+            self.finish(order, 'done')
+
+    def fill(self, order, price, volume):
+        """체결 한 건을 주문과 계좌에 반영"""
+        funds = price * volume
+        fee = funds * self.fee_rate
+        ticker = order['market'].split('-')[1]
+        krw = self.get_account('KRW')
+        coin = self.get_account(ticker)
+        if order['side'] == 'bid':
+            krw['locked'] -= funds + fee
+            order['locked'] -= funds + fee
+            total = coin['balance'] + coin['locked']
+            coin['avg_buy_price'] = (coin['avg_buy_price'] * total + funds) / (total + volume)
+            coin['balance'] += volume
+        else:
+            coin['locked'] -= volume
+            order['locked'] -= volume
+            krw['balance'] += funds - fee
+        order['executed_volume'] += volume
+        order['executed_funds'] += funds
+        order['paid_fee'] += fee
+        order['trades'].append({
+            'market': order['market'], 'uuid': str(uuid_lib.uuid4()), 'price': format_number(price),
+            'volume': format_number(volume), 'funds': format_number(funds), 'side': order['side'],
+            'created_at': format_time(time.time(), KST, with_offset=True),
+        })
+        self.fill_count += 1
+
+    def finish(self, order, state):
+        """주문 종료 (남은 예약 금액/수량 반환)"""
+        if order['state'] in FINAL_STATES:
+            return
+        account = self.get_account('KRW' if order['side'] == 'bid' else order['market'].split('-')[1])
+        leftover = max(order['locked'], 0.0)
+        account['locked'] = max(account['locked'] - leftover, 0.0)
+        account['balance'] += leftover
+        order['locked'] = 0.0
+        order['state'] = state
+        resting = self.resting.get(order['market'])
+        if resting and order['uuid'] in resting:
+            resting.remove(order['uuid'])
+
+    def match_resting(self):
+        """대기 중인 지정가 주문 중 현재 최우선 호가와 만나는 주문을 지정가로 전량 체결"""
+        for market, uuids in list(self.resting.items()):
+            if not uuids:
+                continue
+            units = self.emulator.get_orderbook(market)['orderbook_units']
+            best_ask, best_bid = units[0]['ask_price'], units[0]['bid_price']
+            for order_uuid in list(uuids):
+                order = self.orders[order_uuid]
+                crossed = best_ask <= order['price'] if order['side'] == 'bid' else best_bid >= order['price']
+                if crossed:
+                    self.fill(order, order['price'], order['volume'] - order['executed_volume'])
+                    self.finish(order, 'done')
+
+    def cancel_order(self, order_uuid):
+        """대기 중인 주문 취소"""
+        with self.lock:
+            self.match_resting()
+            order = self.orders.get(order_uuid)
+            if order is None:
+                raise EmulatorError(404, 'order_not_found', "주문을 찾지 못했습니다")
+            if order['state'] != 'wait':
+                raise EmulatorError(400, 'order_not_found', "취소할 수 없는 주문입니다")
+            response = self.to_payload(order)
+            self.finish(order, 'cancel')
+            return response
+
+    def get_order(self, order_uuid):
+        """개별 주문 (체결 내역 포함)"""
+        with self.lock:
+            self.match_resting()
+            order = self.orders.get(order_uuid)
+            if order is None:
+                raise EmulatorError(404, 'order_not_found', "주문을 찾지 못했습니다")
+            return self.to_payload(order, trades=True)
+
+    def list_orders(self, params):
+        """주문 목록 (market, state/states[], uuids[], page, limit, order_by)"""
+        states = params.get('states[]') or [params.get('state', 'wait')]
+        uuids = params.get('uuids[]')
+        market = params.get('market')
+        page = max(int(params.get('page', 1)), 1)
+        limit = min(max(int(params.get('limit', 100)), 1), 100)
+        with self.lock:
+            self.match_resting()
+            if uuids is not None:
+                orders = [self.orders[order_uuid] for order_uuid in uuids if order_uuid in self.orders]
+            else:
+                orders = list(self.orders.values())
+            orders = [order for order in orders if order['state'] in states and (market is None or order['market'] == market)]
+            orders.sort(key=lambda order: order['created_at'], reverse=params.get('order_by', 'desc') == 'desc')
+            return [self.to_payload(order) for order in orders[(page - 1) * limit:page * limit]]
+
+    def to_payload(self, order, trades=False):
+        """업비트 주문 응답 형식"""
+        volume = order['volume']
+        payload = {
+            'uuid': order['uuid'],
+            'side': order['side'],
+            'ord_type': order['ord_type'],
+            'price': format_number(order['price']) if order['price'] is not None else None,
+            'state': order['state'],
+            'market': order['market'],
+            'created_at': format_time(order['created_at'], KST, with_offset=True),
+            'volume': format_number(volume) if volume is not None else None,
+            'remaining_volume': format_number(volume - order['executed_volume']) if volume is not None else None,
+            'reserved_fee': format_number((order['price'] or 0) * (volume or 1) * self.fee_rate if order['side'] == 'bid' else 0.0),
+            'remaining_fee': format_number(0.0),
+            'paid_fee': format_number(order['paid_fee']),
+            'locked': format_number(order['locked']),
+            'executed_volume': format_number(order['executed_volume']),
+            'executed_funds': format_number(order['executed_funds']),
+            'trades_count': len(order['trades']),
+        }
+        if order['time_in_force']:
+            payload['time_in_force'] = order['time_in_force']
+        if trades:
+            payload['trades'] = list(order['trades'])
+        return payload
+
+
+class ExchangeEmulator:
+    """로컬 업비트 REST API 대체 서버
+
+    /v1/market/all, /v1/ticker, /v1/orderbook, /v1/candles/*, /v1/accounts, /v1/orders, /v1/order를
+    업비트와 같은 경로/응답 형식으로 제공한다. 인증 API는 JWT(서명, access_key, nonce 재사용, query_hash)를
+    검사하고, 모든 응답에 그룹별 Remaining-Req 헤더를 붙이며 초당 한도를 넘으면 429를 반환한다.
+    응답마다 latency(+jitter)만큼 지연해 실제 네트워크 왕복 시간을 흉내 낸다.
+    """
+    def __init__(self, market_data, host=None, port=None, latency=None, jitter=None,
+                 access_key=None, secret_key=None, rate_limits=None, initial_krw=None, seed=None):
+        self.market_data = market_data
+        self.host = host or Config.EMULATOR_HOST
+        self.port = Config.EMULATOR_PORT if port is None else port
+        self.latency = Config.EMULATOR_LATENCY if latency is None else latency
+        self.jitter = Config.EMULATOR_LATENCY_JITTER if jitter is None else jitter
+        self.access_key = access_key or Config.UPBIT_ACCESS_KEY or 'emulator-access-key'
+        self.secret_key = secret_key or Config.UPBIT_SECRET_KEY or 'emulator-secret-key'
+        self.limiter = RequestLimiter(rate_limits)
+        self.state = ExchangeState(self, initial_krw)
+        self.seed = 0 if seed is None else seed
+        self.random = random.Random(seed)
+        self.nonces = set()
+        self.nonce_order = deque()
+        self.auth_lock = threading.Lock()
+        self.server = None
+        self.thread = None
+        self.request_counts = {}
+        self.error_count = 0
+
+    @property
+    def url(self):
+        """접속 주소 (UPBIT_SERVER_URL 값)"""
+        return f"http://{self.host}:{self.port}"
+
+    @staticmethod
+    def group_for(method, path):
+        """경로별 요청 제한 그룹"""
+        if path.startswith('/v1/candles/'):
+            return 'candles'
+        if path in ('/v1/market/all', '/v1/ticker', '/v1/orderbook'):
+            return {'/v1/market/all': 'market', '/v1/ticker': 'ticker', '/v1/orderbook': 'orderbook'}[path]
+        if path.startswith('/v1/order') and method in ('POST', 'DELETE'):
+            return 'order'
+        return 'default'
+
+    def authenticate(self, headers, query_string):
+        """JWT 인증 검사 (서명, access_key, nonce 재사용, query_hash)"""
+        authorization = headers.get('Authorization') or ''
+        if not authorization.startswith('Bearer '):
+            raise EmulatorError(401, 'jwt_verification', "인증 토큰이 없습니다")
+        try:
+            payload = jwt.decode(authorization[len('Bearer '):], self.secret_key, algorithms=['HS256'])
+        except jwt.InvalidTokenError as e:
+            raise EmulatorError(401, 'jwt_verification', f"JWT 검증 실패: {str(e)}")
+        if payload.get('access_key') != self.access_key:
+            raise EmulatorError(401, 'invalid_access_key', "잘못된 access key입니다")
+
+        nonce = payload.get('nonce')
+        with self.auth_lock:
+            if not nonce or nonce in self.nonces:
+                raise EmulatorError(401, 'nonce_used', "이미 사용한 nonce입니다")
+            self.nonces.add(nonce)
+            self.nonce_order.append(nonce)
+            if len(self.nonce_order) > 100000:
+                self.nonces.discard(self.nonce_order.popleft())
+
+        if query_string:
+            expected = hashlib.sha512(query_string.encode('utf-8')).hexdigest()
+            if payload.get('query_hash') != expected:
+                raise EmulatorError(401, 'invalid_query_payload', "query_hash가 요청 파라미터와 다릅니다")
+
+    def get_orderbook(self, market, now=None):
+        """현재가 주변 호가 (호가 단위 간격, 잔량은 (마켓, 초)마다 정해지는 무작위 값)"""
+        now = time.time() if now is None else now
+        price = self.market_data.get_price(market, now)
+        tick = get_tick_size(price)
+        best_bid = round_to_tick(price, 'down')
+        best_ask = round(best_bid + tick, 8)
+        rng = np.random.default_rng([self.seed, zlib.crc32(market.encode()), int(now)])
+        depth = Config.EMULATOR_ORDERBOOK_DEPTH
+        sizes = rng.lognormal(0.0, 0.75, (2, depth)) * Config.EMULATOR_LEVEL_VALUE / price
+        units = [{
+            'ask_price': round(best_ask + tick * i, 8), 'bid_price': round(best_bid - tick * i, 8),
+            'ask_size': round(float(sizes[0, i]), 8), 'bid_size': round(float(sizes[1, i]), 8),
+        } for i in range(depth)]
+        return {
+            'market': market, 'timestamp': int(now * 1000),
+            'total_ask_size': round(float(sizes[0].sum()), 8), 'total_bid_size': round(float(sizes[1].sum()), 8),
+            'orderbook_units': units,
+        }
+
+    def get_ticker(self, market, now):
+        """현재가 시세 한 건"""
+        current, previous_close = self.market_data.get_day_stats(market, now)
+        if current is None:
+            raise EmulatorError(404, 'not_found', f"Code not found: {market}")
+        price = float(current['close'])
+        change = price - previous_close
+        return {
+            'market': market,
+            'trade_date': format_time(now)[:10].replace('-', ''),
+            'trade_time': format_time(now)[11:].replace(':', ''),
+            'trade_timestamp': int(now * 1000),
+            'opening_price': float(current['open']),
+            'high_price': float(current['high']),
+            'low_price': float(current['low']),
+            'trade_price': price,
+            'prev_closing_price': previous_close,
+            'change': 'RISE' if change > 0 else 'FALL' if change < 0 else 'EVEN',
+            'change_price': abs(change),
+            'change_rate': abs(change) / previous_close if previous_close else 0.0,
+            'signed_change_price': change,
+            'signed_change_rate': change / previous_close if previous_close else 0.0,
+            'trade_volume': float(current['volume']) / 1440,
+            'acc_trade_price': float(current['value']),
+            'acc_trade_price_24h': float(current['value']),
+            'acc_trade_volume': float(current['volume']),
+            'acc_trade_volume_24h': float(current['volume']),
+            'timestamp': int(now * 1000),
+        }
+
+    def get_markets_param(self, params):
+        """markets 파라미터 (없는 마켓이 있으면 404)"""
+        markets = [market.strip() for market in (params.get('markets') or '').split(',') if market.strip()]
+        missing = [market for market in markets if not self.market_data.has_market(market)]
+        if not markets or missing:
+            raise EmulatorError(404, 'not_found', f"Code not found: {','.join(missing)}")
+        return markets
+
+    def get_candles(self, path, params):
+        """캔들 응답 (최신순, to 이전 캔들 최대 200개)"""
+        market = params.get('market')
+        if not self.market_data.has_market(market):
+            raise EmulatorError(404, 'not_found', f"Code not found: {market}")
+        count = min(max(int(params.get('count', 1)), 1), 200)
+        end = parse_to(params['to']) if params.get('to') else time.time() + 1
+        kind = path[len('/v1/candles/'):]
+        unit = None
+        if kind.startswith('minutes/'):
+            unit = int(kind.split('/')[1])
+            if unit not in (1, 3, 5, 10, 15, 30, 60, 240):
+                raise EmulatorError(400, 'validation_error', f"지원하지 않는 분봉 단위: {unit}")
+            arrays = self.market_data.get_candles(market, unit * 60, end, count)
+        elif kind == 'days':
+            arrays = self.market_data.get_days(market, end, count)
+        elif kind in ('weeks', 'months'):
+            days = self.market_data.get_days(market, end, 10 ** 6)
+            arrays = aggregate(days, bucket_func=week_start if kind == 'weeks' else month_start)
+            arrays = {field: arrays[field][-count:] for field in CANDLE_FIELDS}
+        else:
+            raise EmulatorError(404, 'not_found', f"지원하지 않는 캔들 경로: {path}")
+
+        rows = []
+        for i in range(len(arrays['ts']) - 1, -1, -1):
+            ts = int(arrays['ts'][i])
+            row = {
+                'market': market,
+                'candle_date_time_utc': format_time(ts),
+                'candle_date_time_kst': format_time(ts, KST),
+                'opening_price': float(arrays['open'][i]),
+                'high_price': float(arrays['high'][i]),
+                'low_price': float(arrays['low'][i]),
+                'trade_price': float(arrays['close'][i]),
+                'timestamp': int(min(ts + DAY, time.time()) * 1000),
+                'candle_acc_trade_price': float(arrays['value'][i]),
+                'candle_acc_trade_volume': float(arrays['volume'][i]),
+            }
+            if unit is not None:
+                row['unit'] = unit
+            elif kind == 'days' and i > 0:
+                previous = float(arrays['close'][i - 1])
+                row['prev_closing_price'] = previous
+                row['change_price'] = row['trade_price'] - previous
+                row['change_rate'] = row['change_price'] / previous if previous else 0.0
+            elif kind != 'days':
+                row['first_day_of_period'] = format_time(ts)[:10]
+            rows.append(row)
+        return rows
+
+    def route(self, method, path, params):
+        """경로별 응답 데이터"""
+        if method == 'GET' and path == '/v1/market/all':
+            return [{'market': market, 'korean_name': market.split('-')[1], 'english_name': market.split('-')[1]}
+                    for market in self.market_data.markets]
+        if method == 'GET' and path == '/v1/ticker':
+            now = time.time()
+            return [self.get_ticker(market, now) for market in self.get_markets_param(params)]
+        if method == 'GET' and path == '/v1/orderbook':
+            return [self.get_orderbook(market) for market in self.get_markets_param(params)]
+        if method == 'GET' and path.startswith('/v1/candles/'):
+            return self.get_candles(path, params)
+        if method == 'GET' and path == '/v1/accounts':
+            return self.state.get_accounts()
+        if path == '/v1/orders':
+            if method == 'POST':
+                return self.state.place_order(params)
+            if method == 'GET':
+                return self.state.list_orders(params)
+        if path == '/v1/order' and method in ('GET', 'DELETE'):
+            if not params.get('uuid'):
+                raise EmulatorError(400, 'validation_error', "uuid가 필요합니다")
+            if method == 'GET':
+                return self.state.get_order(params['uuid'])
+            return self.state.cancel_order(params['uuid'])
+        raise EmulatorError(404, 'not_found', f"{method} {path}")
+
+    def handle(self, method, raw_path, headers, body):
+        """요청 처리 후 (상태 코드, 응답 데이터, 추가 헤더) 반환"""
+        started = time.monotonic()
+        parts = urlsplit(raw_path)
+        path = parts.path
+        group = self.group_for(method, path)
+        key = f"{method} {path}"
+        self.request_counts[key] = self.request_counts.get(key, 0) + 1
+
+        allowed, remaining = self.limiter.check(group)
+        response_headers = {'Remaining-Req': remaining}
+        try:
+            if not allowed:
+                raise EmulatorError(429, 'too_many_requests', "Too many API requests.")
+            if method == 'POST':
+                params = json.loads(body or b'{}')
+                query_string = unquote(urlencode(params, doseq=True)) if params else ''
+            else:
+                pairs = parse_qsl(parts.query, keep_blank_values=True)
+                params = {}
+                for name, value in pairs:
+                    if name.endswith('[]'):
+                        params.setdefault(name, []).append(value)
+                    else:
+                        params[name] = value
+                query_string = unquote(parts.query)
+            if group in ('default', 'order'):
+                self.authenticate(headers, query_string)
+            payload = self.route(method, path, params)
+            status = 201 if method == 'POST' else 200
+        except EmulatorError as e:
+            status, payload = e.status, {'error': {'name': e.name, 'message': e.message}}
+        except (ValueError, KeyError) as e:
+            status, payload = 400, {'error': {'name': 'validation_error', 'message': str(e)}}
+        if status >= 400:
+            self.error_count += 1
+
+        # 처리 시간을 포함해 latency(+jitter)가 되도록 대기
+        delay = self.latency + self.random.uniform(0, self.jitter) - (time.monotonic() - started)
+        if delay > 0:
+            time.sleep(delay)
+        return status, payload, response_headers
+
+    def start(self):
+        """백그라운드 스레드에서 서버 시작 (포트가 0이면 빈 포트 할당), 접속 주소 반환"""
+        self.server = ThreadingHTTPServer((self.host, self.port), EmulatorRequestHandler)
+        self.server.daemon_threads = True
+        self.server.emulator = self
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True, name='exchange-emulator')
+        self.thread.start()
+        log.log('TR', f"거래소 에뮬레이터 시작: {self.url} (마켓 {len(self.market_data.markets)}개)")
+        return self.url
+
+    def stop(self):
+        """서버 종료"""
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+        if self.thread is not None:
+            self.thread.join(5)
+
+    def get_stats(self):
+        """요청 처리 통계"""
+        return {
+            'requests': sum(self.request_counts.values()),
+            'errors': self.error_count,
+            'throttled': self.limiter.throttled_count,
+            'orders': len(self.state.orders),
+            'fills': self.state.fill_count,
+            'by_path': dict(self.request_counts),
+        }
+
+    def log_stats(self):
+        """요청 처리 통계 로그"""
+        stats = self.get_stats()
+        log.log('TR', (
+            f"거래소 에뮬레이터: 요청 {stats['requests']}회 (오류 {stats['errors']}회, 429 {stats['throttled']}회), "
+            f"주문 {stats['orders']}건, 체결 {stats['fills']}건"
+        ))
+
+
+class EmulatorRequestHandler(BaseHTTPRequestHandler):
+    """HTTP 요청을 ExchangeEmulator.handle로 전달 (HTTP/1.1 keep-alive)"""
+    protocol_version = 'HTTP/1.1'
+
+    def dispatch(self, method):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        status, payload, headers = self.server.emulator.handle(method, self.path, self.headers, body)
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self.dispatch('GET')
+
+    def do_POST(self):
+        self.dispatch('POST')
+
+    def do_DELETE(self):
+        self.dispatch('DELETE')
+
+    def log_message(self, format, *args):
+        """요청마다 표준 출력에 기록하지 않음"""
+
+
+def default_markets(count):
+    """거래 대상 마켓 + 합성 마켓으로 count개 마켓 코드"""
+    markets = [f"{Config.CURRENCY}-{ticker}" for ticker in Config.TRADING_MARKETS]
+    for i in range(max(count - len(markets), 0)):
+        markets.append(f"{Config.CURRENCY}-SYN{i + 1:03d}")
+    return markets
+
+
+def create_emulator(markets=None, archive_dir=None, seed=0, **kwargs):
+    """가격 경로를 골라 에뮬레이터 생성 (archive_dir가 있으면 기록된 1분봉 재생, 없으면 합성 경로)"""
+    markets = markets or default_markets(Config.EMULATOR_MARKETS)
+    if archive_dir:
+        from src.candle_archive import CandleArchive
+        source = ArchivePriceSource(CandleArchive(archive_dir), markets)
+        if not source.markets:
+            raise ValueError(f"재생할 1분봉 기록이 없습니다: {archive_dir}")
+    else:
+        source = SyntheticPriceSource(markets, seed=seed)
+    return ExchangeEmulator(MarketData(source), seed=seed, **kwargs)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="업비트 REST API 대체 서버 (거래소 에뮬레이터)")
+    parser.add_argument('--host', default=Config.EMULATOR_HOST)
+    parser.add_argument('--port', type=int, default=Config.EMULATOR_PORT)
+    parser.add_argument('--markets', nargs='+', help="마켓 목록 (없으면 거래 대상 + 합성 마켓)")
+    parser.add_argument('--count', type=int, default=Config.EMULATOR_MARKETS, help="합성 마켓 수")
+    parser.add_argument('--archive', help="재생할 캔들 아카이브 디렉토리 (없으면 합성 가격 경로)")
+    parser.add_argument('--latency', type=float, default=Config.EMULATOR_LATENCY, help="응답 지연 (초)")
+    parser.add_argument('--jitter', type=float, default=Config.EMULATOR_LATENCY_JITTER, help="응답 지연 최대 추가값 (초)")
+    parser.add_argument('--krw', type=float, default=Config.EMULATOR_INITIAL_KRW, help="시작 원화 잔고")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    emulator = create_emulator(
+        args.markets or default_markets(args.count), args.archive, seed=args.seed,
+        host=args.host, port=args.port, latency=args.latency, jitter=args.jitter, initial_krw=args.krw,
+    )
+    emulator.start()
+    print(f"UPBIT_SERVER_URL={emulator.url} UPBIT_ACCESS_KEY={emulator.access_key} "
+          f"UPBIT_SECRET_KEY={emulator.secret_key} 로 설정해 접속하세요. (Ctrl+C로 종료)")
+    print("에뮬레이터는 웹소켓 시세를 제공하지 않으므로 트레이더는 실시간 시세 대신 이 서버의 REST 시세/호가를 사용합니다 "
+          "(FEED_WITH_CUSTOM_SERVER를 켜지 마세요).")
+    print("실제 캔들 아카이브와 섞이지 않도록 CANDLE_ARCHIVE_DIR를 별도 경로로 두거나 USE_CANDLE_ARCHIVE를 끄세요.")
+    try:
+        while True:
+            time.sleep(60)
+            emulator.log_stats()
+    except KeyboardInterrupt:
+        emulator.stop()
@@ -0,0 +1,149 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+import websockets
+
+# 프로젝트 루트 경로를 Python 경로에 추가
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from utils.logger import log
+
+
+class MockWebSocketServer:
+    """오프라인 테스트용 업비트 웹소켓 대체 서버
+
+    구독 요청을 받으면 구독한 마켓의 ticker/trade/orderbook 메시지를
+    임의 가격 경로로 생성해 업비트와 같은 JSON(bytes) 형식으로 전송한다.
+    """
+    def __init__(self, host='127.0.0.1', port=0, interval=0.2, base_prices=None, seed=None):
+        self.host = host
+        self.port = port
+        self.interval = interval
+        self.base_prices = dict(base_prices or {})
+        self.prices = {}
+        self.random = random.Random(seed)
+        self.clients = set()
+        self.loop = None
+        self.server = None
+        self.thread = None
+        self.ready = threading.Event()
+
+    @property
+    def url(self):
+        """접속 주소"""
+        return f"ws://{self.host}:{self.port}"
+
+    def next_price(self, market):
+        """마켓별 다음 가격 (랜덤 워크)"""
+        price = self.prices.get(market) or self.base_prices.get(market, 1000.0)
+        price = max(price * (1 + self.random.gauss(0, 0.001)), 0.0001)
+        self.prices[market] = price
+        return price
+
+    def build_messages(self, market, types):
+        """구독 타입별 메시지 생성"""
+        price = self.next_price(market)
+        now = int(time.time() * 1000)
+        volume = round(self.random.uniform(0.1, 100), 8)
+        messages = []
+        if 'ticker' in types:
+            messages.append({
+                'type': 'ticker', 'code': market, 'trade_price': price,
+                'opening_price': price, 'high_price': price, 'low_price': price,
+                'trade_volume': volume, 'timestamp': now, 'stream_type': 'REALTIME',
+            })
+        if 'trade' in types:
+            messages.append({
+                'type': 'trade', 'code': market, 'trade_price': price, 'trade_volume': volume,
+                'ask_bid': self.random.choice(['ASK', 'BID']), 'timestamp': now, 'stream_type': 'REALTIME',
+            })
+        if 'orderbook' in types:
+            tick = price * 0.0005
+            units = [{
+                'ask_price': price + tick * (i + 1), 'bid_price': price - tick * (i + 1),
+                'ask_size': round(self.random.uniform(1, 1000), 4),
+                'bid_size': round(self.random.uniform(1, 1000), 4),
+            } for i in range(15)]
+            messages.append({
+                'type': 'orderbook', 'code': market, 'orderbook_units': units,
+                'total_ask_size': sum(unit['ask_size'] for unit in units),
+                'total_bid_size': sum(unit['bid_size'] for unit in units),
+                'timestamp': now, 'stream_type': 'REALTIME',
+            })
+        return messages
+
+    async def handler(self, websocket, path=None):
+        """클라이언트 연결 처리 (구독 메시지 수신 후 주기적으로 전송)"""
+        self.clients.add(websocket)
+        subscriptions = {}
+        sender = None
+        try:
+            async for message in websocket:
+                request = json.loads(message)
+                subscriptions = {}
+                for item in request:
+                    for code in item.get('codes', []):
+                        subscriptions.setdefault(code, set()).add(item.get('type'))
+                if sender is None:
+                    sender = asyncio.ensure_future(self.stream(websocket, lambda: subscriptions))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self.clients.discard(websocket)
+            if sender is not None:
+                sender.cancel()
+
+    async def stream(self, websocket, get_subscriptions):
+        """구독 중인 마켓의 메시지를 주기적으로 전송"""
+        while True:
+            for market, types in list(get_subscriptions().items()):
+                for data in self.build_messages(market, types):
+                    await websocket.send(json.dumps(data).encode('utf-8'))
+            await asyncio.sleep(self.interval)
+
+    async def serve(self):
+        """서버 실행"""
+        self.server = await websockets.serve(self.handler, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.ready.set()
+        log.log('TR', f"웹소켓 대체 서버 시작: {self.url}")
+        await self.server.wait_closed()
+
+    def start(self):
+        """백그라운드 스레드에서 서버 시작 (포트가 0이면 빈 포트 할당)"""
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_until_complete, args=(self.serve(),), daemon=True)
+        self.thread.start()
+        self.ready.wait(5)
+        return self.url
+
+    def drop_connections(self):
+        """모든 클라이언트 연결 강제 종료 (재연결 테스트용)"""
+        for websocket in list(self.clients):
+            asyncio.run_coroutine_threadsafe(websocket.close(), self.loop)
+
+    def stop(self):
+        """서버 종료"""
+        if self.server is not None:
+            self.loop.call_soon_threadsafe(self.server.close)
+        if self.thread is not None:
+            self.thread.join(5)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="업비트 웹소켓 대체 서버")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--interval', type=float, default=0.2, help="메시지 전송 간격 (초)")
+    args = parser.parse_args()
+
+    server = MockWebSocketServer(args.host, args.port, args.interval)
+    print(f"UPBIT_WEBSOCKET_URL={server.url} 로 설정해 접속하세요.")
+    asyncio.run(server.serve())
@@ -7,6 +7,7 @@ from datetime import datetime, time as datetime_time
 from src.api_client import UpbitClient
 from src.strategies.xrp_strategy import XRPStrategy
 from src.trader import MultiCoinTrader
+from src.scheduler import AlignedScheduler, daily_offset
 from analysis.trade_analyzer import TradeAnalyzer
 from utils.logger import log
 from config.config import Config
@@ -72,17 +73,15 @@ def run_analysis():
         send_telegram_alert(error_msg, Config.TELEGRAM_BOT_TOKEN, Config.TELEGRAM_CHAT_ID)
         log.log('WA', f"분석 중 오류 발생: {str(e)}")
 
+def run_daily_tasks():
+    """일일 분석 및 로그 필터링"""
+    run_analysis()
+    filter_daily_logs()  # 로그 필터링 추가
+
 def schedule_analysis():
-    """분석 스케줄러"""
-    while True:
-        now = datetime.now().time()
-        analysis_time = datetime.strptime(Config.ANALYSIS_TIME, '%H:%M').time()
-        
-        if now.hour == analysis_time.hour and now.minute == analysis_time.minute:
-            run_analysis()
-            filter_daily_logs()  # 로그 필터링 추가
-            time.sleep(60)
-        time.sleep(30)
+    """분석 스케줄러 (매일 ANALYSIS_TIME에 실행, 1분 이상 늦으면 다음 날로 넘김)"""
+    scheduler = AlignedScheduler(86400, daily_offset(Config.ANALYSIS_TIME), late_tolerance=60, name="일일 분석")
+    scheduler.run(run_daily_tasks)
 
 def is_trading_time():
     """거래 가능 시간 확인"""
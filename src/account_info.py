@@ -1,36 +1,15 @@
-import jwt
-import hashlib
 import os
-import requests
-import uuid
-from urllib.parse import urlencode, unquote
-from dotenv import load_dotenv
+import sys
 
-def get_account_info():
-    # .env 파일 로드
-    load_dotenv()
-
-    # 환경 변수에서 API 키 가져오기
-    UPBIT_ACCESS = os.getenv('UPBIT_ACCESS_KEY')
-    UPBIT_SECRET = os.getenv('UPBIT_SECRET_KEY')
-
-    server_url = 'https://api.upbit.com'
+# 프로젝트 루트 경로를 Python 경로에 추가
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
 
-    # JWT 토큰 생성
-    payload = {
-        'access_key': UPBIT_ACCESS,
-        'nonce': str(uuid.uuid4()),
-    }
+from src.http_session import upbit_session
 
-    jwt_token = jwt.encode(payload, UPBIT_SECRET, algorithm='HS256')
-    authorization = 'Bearer {}'.format(jwt_token)
-    headers = {
-      'Authorization': authorization,
-    }
-
-    # 전체 계좌 조회 요청
-    res = requests.get(server_url + '/v1/accounts', headers=headers)
-    data = res.json()
+def get_account_info():
+    # 전체 계좌 조회 요청 (공용 세션이 JWT 인증 헤더를 생성)
+    data = upbit_session.get('/v1/accounts', auth=True)
 
     # 계좌 정보 출력
     for row in data:
@@ -45,4 +24,4 @@ def get_account_info():
             print(currency, balance)
 
 if __name__ == "__main__":
-    get_account_info() 
\ No newline at end of file
+    get_account_info()
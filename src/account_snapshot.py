@@ -0,0 +1,154 @@
+import threading
+import time
+
+from config.config import Config
+
+
+class AccountSnapshot:
+    """/v1/accounts 응답 한 번으로 모든 화폐의 잔고/평균 매수가를 조회하는 스냅샷"""
+    def __init__(self, accounts, fetched_at=None):
+        self.raw = accounts or []
+        self.accounts = {row.get('currency'): row for row in self.raw}
+        self.fetched_at = time.monotonic() if fetched_at is None else fetched_at
+
+    def get_value(self, ticker, field):
+        """화폐별 항목 값 (보유하지 않으면 0)"""
+        account = self.accounts.get(ticker)
+        if account is None:
+            return 0
+        try:
+            return float(account.get(field) or 0)
+        except (TypeError, ValueError):
+            return 0
+
+    def get_balance(self, ticker):
+        """주문 가능 잔고"""
+        return self.get_value(ticker, 'balance')
+
+    def get_locked(self, ticker):
+        """주문 중 묶인 수량"""
+        return self.get_value(ticker, 'locked')
+
+    def get_total(self, ticker):
+        """전체 보유 수량 (잔고 + 묶인 수량)"""
+        return self.get_balance(ticker) + self.get_locked(ticker)
+
+    def get_avg_buy_price(self, ticker):
+        """평균 매수가"""
+        return self.get_value(ticker, 'avg_buy_price')
+
+    def apply_fill(self, ticker, quote, side, volume, funds, fee):
+        """체결분을 반영한 새 스냅샷 (이 스냅샷이 주문 전 상태여야 함)
+
+        매수는 기준 통화에서 체결 금액+수수료를 빼고 코인 수량과 평균 매수가를 갱신하고,
+        매도는 코인 수량을 빼고 체결 금액-수수료를 기준 통화에 더한다.
+        """
+        accounts = {currency: dict(row) for currency, row in self.accounts.items()}
+        for currency in (ticker, quote):
+            accounts.setdefault(currency, {
+                'currency': currency, 'balance': '0', 'locked': '0',
+                'avg_buy_price': '0', 'unit_currency': quote,
+            })
+        coin, cash = accounts[ticker], accounts[quote]
+        total = self.get_total(ticker)
+        balance = self.get_balance(ticker)
+        cash_balance = self.get_balance(quote)
+
+        if side == 'bid':
+            avg_price = (total * self.get_avg_buy_price(ticker) + funds) / (total + volume) if total + volume else 0
+            coin['balance'] = str(balance + volume)
+            coin['avg_buy_price'] = str(avg_price)
+            cash['balance'] = str(cash_balance - funds - fee)
+        else:
+            coin['balance'] = str(max(balance - volume, 0.0))
+            if total - volume <= 0:
+                coin['avg_buy_price'] = '0'
+            cash['balance'] = str(cash_balance + funds - fee)
+        return AccountSnapshot(list(accounts.values()))
+
+    def has(self, ticker):
+        """화폐 보유 여부"""
+        return ticker in self.accounts
+
+    def currencies(self):
+        """보유 화폐 목록"""
+        return list(self.accounts.keys())
+
+    def age(self):
+        """스냅샷 경과 시간 (초)"""
+        return time.monotonic() - self.fetched_at
+
+
+class AccountCache:
+    """짧은 TTL 동안 계좌 스냅샷을 재사용하는 캐시 (주문 후 무효화)"""
+    def __init__(self, ttl=None):
+        self.ttl = Config.ACCOUNT_CACHE_TTL if ttl is None else ttl
+        self.snapshot = None
+        self.previous = None  # 주문으로 무효화되기 직전 스냅샷 (체결 반영 기준)
+        self.lock = threading.Lock()
+        self.fetch_count = 0
+        self.hit_count = 0
+        self.fill_count = 0   # 다시 조회하지 않고 체결을 반영한 횟수
+
+    def peek(self):
+        """유효한 스냅샷이 있으면 반환, 없으면 None"""
+        snapshot = self.snapshot
+        if snapshot is not None and snapshot.age() < self.ttl:
+            return snapshot
+        return None
+
+    def update(self, accounts):
+        """새 계좌 데이터로 스냅샷 갱신"""
+        snapshot = AccountSnapshot(accounts)
+        self.snapshot = snapshot
+        self.previous = None
+        self.fetch_count += 1
+        return snapshot
+
+    def get(self, fetch_func, force=False):
+        """스냅샷 조회 (만료되었거나 force면 fetch_func로 한 번만 다시 조회)"""
+        if not force:
+            snapshot = self.peek()
+            if snapshot is not None:
+                self.hit_count += 1
+                return snapshot
+
+        # 동시에 여러 스레드가 만료를 발견해도 조회는 한 번만 수행
+        with self.lock:
+            if not force:
+                snapshot = self.peek()
+                if snapshot is not None:
+                    self.hit_count += 1
+                    return snapshot
+            return self.update(fetch_func())
+
+    def invalidate(self):
+        """스냅샷 무효화 (주문 후 호출, 직전 스냅샷은 체결 반영 기준으로 보관)"""
+        if self.snapshot is not None:
+            self.previous = self.snapshot
+        self.snapshot = None
+
+    def clear(self):
+        """스냅샷과 체결 반영 기준 모두 제거 (다음 조회에서 새로 조회)"""
+        self.snapshot = None
+        self.previous = None
+
+    def apply_fill(self, placed_at, ticker, quote, side, volume, funds, fee):
+        """주문 전 스냅샷에 체결분을 반영해 캐시 갱신
+
+        기준 스냅샷이 없거나 주문(placed_at, 단조 시계) 이후에 조회된 것이면
+        이미 체결이 반영됐는지 알 수 없으므로 모두 지우고 다음 조회를 기다린다.
+        """
+        with self.lock:
+            base = self.snapshot or self.previous
+            if base is None or base.fetched_at > placed_at:
+                self.clear()
+                return None
+            self.snapshot = base.apply_fill(ticker, quote, side, volume, funds, fee)
+            self.previous = None
+            self.fill_count += 1
+            return self.snapshot
+
+
+# 전역 계좌 캐시 인스턴스 생성 (공용 세션을 사용하는 클라이언트가 공유)
+account_cache = AccountCache()
@@ -1,12 +1,44 @@
-import pyupbit
 import time
+import pandas as pd
 from datetime import datetime, timedelta
 from utils.logger import log
 from config.config import Config
+from src.http_session import upbit_session
+from src.account_snapshot import AccountCache, account_cache as shared_account_cache
+from src.price_snapshot import price_snapshot as shared_price_snapshot
+from src.candle_store import CandleStore
+from src.candle_archive import candle_archive
+from src.order_reconciler import OrderReconciler
+
+# 캔들 조회 간격별 API 경로
+CANDLE_PATHS = {
+    'minute1': '/v1/candles/minutes/1',
+    'minute3': '/v1/candles/minutes/3',
+    'minute5': '/v1/candles/minutes/5',
+    'minute10': '/v1/candles/minutes/10',
+    'minute15': '/v1/candles/minutes/15',
+    'minute30': '/v1/candles/minutes/30',
+    'minute60': '/v1/candles/minutes/60',
+    'minute240': '/v1/candles/minutes/240',
+    'day': '/v1/candles/days',
+    'week': '/v1/candles/weeks',
+    'month': '/v1/candles/months',
+}
+MAX_CANDLE_COUNT = 200  # 1회 요청당 최대 캔들 수
 
 class UpbitClient:
-    def __init__(self):
-        self.exchange = pyupbit.Upbit(Config.UPBIT_ACCESS_KEY, Config.UPBIT_SECRET_KEY)
+    def __init__(self, session=None, account_cache=None, price_snapshot=None):
+        # 모든 공개/인증 API가 하나의 keep-alive 커넥션 풀을 공유
+        self.session = session or upbit_session
+        # 같은 세션(같은 계정)을 쓰는 클라이언트는 계좌 스냅샷도 공유
+        if account_cache is None:
+            account_cache = shared_account_cache if session is None else AccountCache()
+        self.account_cache = account_cache
+        # 배치 시세 조회 결과를 모든 클라이언트/전략이 공유
+        self.price_snapshot = price_snapshot or shared_price_snapshot
+        self.market_feed = None  # 실시간 시세 수신기 (설정 시 현재가를 네트워크 요청 없이 조회)
+        # 증분 갱신 캔들 저장소 (아카이브가 있으면 이력을 읽고 마감된 캔들을 저장)
+        self.candle_store = CandleStore(self, archive=candle_archive if Config.USE_CANDLE_ARCHIVE else None)
         self.market = Config.MARKET
         self.coin_ticker = Config.COIN_TICKER
         log.log('TR', "업비트 API 클라이언트 초기화 완료")
@@ -23,28 +55,101 @@ class UpbitClient:
             time.sleep(delay)
         return None
     
-    def get_ohlcv(self, interval='minute1', count=200):
+    def get_candles(self, market, interval='minute1', count=200, to=None):
+        """캔들 원본 데이터 조회 (최신순, 200개 초과 시 to 커서로 페이지 조회)"""
+        path = CANDLE_PATHS.get(interval)
+        if path is None:
+            raise ValueError(f"지원하지 않는 캔들 간격: {interval}")
+        
+        candles = []
+        while len(candles) < count:
+            params = {'market': market, 'count': min(count - len(candles), MAX_CANDLE_COUNT)}
+            if to:
+                params['to'] = to
+            rows = self.session.get(path, params=params)
+            if not rows:
+                break
+            candles.extend(rows)
+            if len(rows) < params['count']:
+                break
+            to = rows[-1]['candle_date_time_utc']
+        return candles
+    
+    def candles_to_dataframe(self, candles):
+        """캔들 원본 데이터를 OHLCV DataFrame으로 변환 (과거순)"""
+        candles = list(reversed(candles))
+        df = pd.DataFrame({
+            'open': [row['opening_price'] for row in candles],
+            'high': [row['high_price'] for row in candles],
+            'low': [row['low_price'] for row in candles],
+            'close': [row['trade_price'] for row in candles],
+            'volume': [row['candle_acc_trade_volume'] for row in candles],
+            'value': [row['candle_acc_trade_price'] for row in candles],
+        }, index=pd.to_datetime([row['candle_date_time_kst'] for row in candles]))
+        return df[~df.index.duplicated(keep='last')]
+    
+    def get_ohlcv(self, interval='minute1', count=200, market=None, to=None):
         """OHLCV 데이터 조회"""
         try:
-            df = pyupbit.get_ohlcv(ticker=self.market, 
-                                  interval=interval, 
-                                  count=count)
+            market = market or self.market
+            candles = self.get_candles(market, interval=interval, count=count, to=to)
             
-            if df is not None and not df.empty:
-                return df
+            if candles:
+                return self.candles_to_dataframe(candles)
             else:
-                log.log('WA', f"OHLCV 데이터가 비어있습니다: {self.market}")
+                log.log('WA', f"OHLCV 데이터가 비어있습니다: {market}")
                 return None
                 
         except Exception as e:
             log.log('WA', f"OHLCV 데이터 조회 실패: {str(e)}")
             return None
     
+    def get_tickers(self, markets):
+        """여러 마켓의 시세를 배치로 조회 (요청당 TICKER_BATCH_SIZE개)"""
+        markets = list(markets)
+        tickers = []
+        for i in range(0, len(markets), Config.TICKER_BATCH_SIZE):
+            batch = markets[i:i + Config.TICKER_BATCH_SIZE]
+            tickers.extend(self.session.get('/v1/ticker', params={'markets': ','.join(batch)}) or [])
+        self.price_snapshot.update(tickers)
+        return tickers
+    
+    def refresh_prices(self, markets):
+        """틱 시작 시 시세 스냅샷 갱신 후 {마켓: 현재가} 반환"""
+        try:
+            tickers = self.get_tickers(markets)
+            return {row['market']: row['trade_price'] for row in tickers}
+        except Exception as e:
+            log.log('WA', f"배치 시세 조회 중 오류: {str(e)}")
+            return {}
+    
+    def get_markets(self, quote=None):
+        """거래 가능한 마켓 코드 목록 (quote를 주면 해당 기준 통화 마켓만)"""
+        markets = self.session.get('/v1/market/all', params={'isDetails': 'false'}) or []
+        codes = [row['market'] for row in markets]
+        if quote:
+            codes = [code for code in codes if code.startswith(f'{quote}-')]
+        return codes
+    
+    def set_market_feed(self, market_feed):
+        """실시간 시세 수신기 설정"""
+        self.market_feed = market_feed
+    
     def get_current_price(self, market=None):
-        """현재가 조회"""
+        """현재가 조회 (실시간 시세 또는 시세 스냅샷이 유효하면 요청 없이 반환)"""
         try:
             market = market or self.market
-            price = pyupbit.get_current_price(market)
+            if self.market_feed is not None:
+                price = self.market_feed.get_price(market)
+                if price is not None:
+                    return price
+            
+            price = self.price_snapshot.get_price(market)
+            if price is not None:
+                return price
+            
+            tickers = self.get_tickers([market])
+            price = tickers[0].get('trade_price') if tickers else None
             if price is not None:
                 return price
             log.log('WA', f"현재가 조회 실패: {market}")
@@ -53,6 +158,42 @@ class UpbitClient:
             log.log('WA', f"현재가 조회 중 오류: {str(e)}")
             return None
     
+    def get_orderbook(self, market=None):
+        """호가 조회 (실시간 호가가 있으면 요청 없이 반환)"""
+        try:
+            market = market or self.market
+            if self.market_feed is not None:
+                orderbook = self.market_feed.get_orderbook(market)
+                if orderbook is not None:
+                    return orderbook
+            
+            orderbooks = self.session.get('/v1/orderbook', params={'markets': market})
+            return orderbooks[0] if orderbooks else None
+        except Exception as e:
+            log.log('WA', f"호가 조회 중 오류: {str(e)}")
+            return None
+    
+    def get_accounts(self):
+        """전체 계좌 조회"""
+        return self.session.get('/v1/accounts', auth=True)
+    
+    def get_account_snapshot(self, force=False):
+        """계좌 스냅샷 조회 (TTL 내에는 캐시 재사용, 모든 잔고/평균가 조회가 공유)"""
+        return self.account_cache.get(self.get_accounts, force=force)
+    
+    def invalidate_account(self):
+        """계좌 스냅샷 무효화 (주문 후 다음 조회에서 새로 조회)"""
+        self.account_cache.invalidate()
+    
+    def get_locked(self, ticker=None):
+        """주문 중 묶인 수량 조회"""
+        try:
+            ticker = ticker or self.coin_ticker
+            return self.get_account_snapshot().get_locked(ticker)
+        except Exception as e:
+            log.log('WA', f"{ticker} 주문 중 수량 조회 중 오류: {str(e)}")
+            return 0
+    
     def get_balance(self, ticker=None):
         """잔고 조회"""
         try:
@@ -70,7 +211,7 @@ class UpbitClient:
             # 전체 잔고 조회 요청
             if ticker.lower() == 'all':
                 try:
-                    balances = self.exchange.get_balances()
+                    balances = self.get_account_snapshot().raw
                     if balances is None:
                         log.log('WA', "전체 잔고 조회 결과가 None입니다")
                         return {}
@@ -84,7 +225,8 @@ class UpbitClient:
             
             # 특정 코인 잔고 조회
             try:
-                balance = self.exchange.get_balance(ticker)
+                snapshot = self.get_account_snapshot()
+                balance = snapshot.get_balance(ticker) if snapshot.has(ticker) else None
                 # 결과 검증
                 if balance is None:
                     log.log('TR', f"{ticker} 잔고가 없습니다")
@@ -130,7 +272,8 @@ class UpbitClient:
             
             # 평균 매수가 조회
             try:
-                avg_price = self.exchange.get_avg_buy_price(ticker)
+                snapshot = self.get_account_snapshot()
+                avg_price = snapshot.get_avg_buy_price(ticker) if snapshot.has(ticker) else None
                 
                 # 결과 검증
                 if avg_price is None:
@@ -192,7 +335,13 @@ class UpbitClient:
             log.log('TR', f"매수 API 호출 매개변수: market={market}, price={price}, 타입: market={type(market).__name__}, price={type(price).__name__}")
             
             # 실제 API 호출
-            result = self.exchange.buy_market_order(market, price)
+            result = self.session.post('/v1/orders', params={
+                'market': market,
+                'side': 'bid',
+                'price': str(price),
+                'ord_type': 'price',
+            })
+            self.invalidate_account()
             
             # 호출 결과 로깅
             if result:
@@ -240,7 +389,13 @@ class UpbitClient:
             log.log('TR', f"매도 API 호출 매개변수: market={market}, volume={volume}, 타입: market={type(market).__name__}, volume={type(volume).__name__}")
             
             # 실제 API 호출
-            result = self.exchange.sell_market_order(market, volume)
+            result = self.session.post('/v1/orders', params={
+                'market': market,
+                'side': 'ask',
+                'volume': str(volume),
+                'ord_type': 'market',
+            })
+            self.invalidate_account()
             
             # 호출 결과 로깅
             if result:
@@ -257,11 +412,30 @@ class UpbitClient:
                 log.log('WA', f"시장가 매도 중 오류: {str(e)}, 타입: {type(e).__name__}, market={market}, volume={volume}")
             return None
     
+    def place_limit_order(self, market, side, price, volume, time_in_force=None):
+        """지정가 주문 (side: 'bid' 매수, 'ask' 매도, time_in_force: 'ioc', 'fok' 또는 None)"""
+        try:
+            params = {
+                'market': market,
+                'side': side,
+                'volume': f"{volume:.8f}".rstrip('0').rstrip('.'),
+                'price': f"{price:.8f}".rstrip('0').rstrip('.'),
+                'ord_type': 'limit',
+            }
+            if time_in_force:
+                params['time_in_force'] = time_in_force
+            result = self.session.post('/v1/orders', params=params)
+            self.invalidate_account()
+            return result
+        except Exception as e:
+            log.log('WA', f"지정가 주문 중 오류 ({market} {side} {volume} @ {price}): {str(e)}")
+            return None
+    
     def get_orders(self, market=None, state="wait"):
         """미체결 주문 조회"""
         try:
             market = market or self.market
-            orders = self.exchange.get_order(market, state=state)
+            orders = self.session.get('/v1/orders', params={'market': market, 'state': state}, auth=True)
             # 반환 값이 None인 경우 빈 리스트 반환
             if orders is None:
                 return []
@@ -270,45 +444,39 @@ class UpbitClient:
             log.log('WA', f"미체결 주문 조회 중 오류: {str(e)}")
             return []
     
+    def get_order(self, uuid):
+        """개별 주문 조회 (체결 내역 포함)"""
+        return self.session.get('/v1/order', params={'uuid': uuid}, auth=True)
+    
+    def get_orders_by_uuids(self, uuids, states=('done', 'cancel')):
+        """여러 주문을 uuid 목록으로 한 번에 조회 (해당 상태인 주문만 반환)"""
+        return self.session.get('/v1/orders', params={
+            'uuids[]': list(uuids),
+            'states[]': list(states),
+        }, auth=True) or []
+    
     def cancel_order(self, uuid):
         """주문 취소"""
         try:
-            return self.exchange.cancel_order(uuid)
+            return self.session.delete('/v1/order', params={'uuid': uuid})
         except Exception as e:
             log.log('WA', f"주문 취소 중 오류: {str(e)}")
             return None
     
     def cancel_orders(self, market=None):
-        """특정 마켓의 미체결 주문 취소"""
+        """특정 마켓의 미체결 주문 동시 취소"""
         try:
-            market = market or self.market
-            orders = self.get_orders(market)
-            if not orders:
-                log.log('TR', f"{market} 취소할 미체결 주문이 없습니다.")
-                return
-                
-            if isinstance(orders, list):
-                for order in orders:
-                    if 'uuid' in order:
-                        self.cancel_order(order['uuid'])
-            elif isinstance(orders, dict) and 'uuid' in orders:
-                self.cancel_order(orders['uuid'])
+            OrderReconciler(self).cancel_all([market or self.market])
         except Exception as e:
             log.log('WA', f"미체결 주문 취소 중 오류: {str(e)}")
     
     def cancel_all_orders(self):
-        """모든 미체결 주문 취소"""
+        """모든 마켓의 미체결 주문 동시 취소"""
         try:
-            orders = self.get_orders(self.market)
-            if not orders:
-                log.log('TR', "취소할 미체결 주문이 없습니다.")
-                return
-                
-            if isinstance(orders, list):
-                for order in orders:
-                    if 'uuid' in order:
-                        self.cancel_order(order['uuid'])
-            elif isinstance(orders, dict) and 'uuid' in orders:
-                self.cancel_order(orders['uuid'])
+            OrderReconciler(self).cancel_all()
         except Exception as e:
-            log.log('WA', f"전체 미체결 주문 취소 중 오류: {str(e)}") 
\ No newline at end of file
+            log.log('WA', f"전체 미체결 주문 취소 중 오류: {str(e)}")
+    
+    def get_connection_stats(self):
+        """HTTP 커넥션 재사용 통계 조회"""
+        return self.session.get_stats()
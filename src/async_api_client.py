@@ -0,0 +1,222 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from utils.logger import log
+from config.config import Config
+from src.api_client import UpbitClient, CANDLE_PATHS, MAX_CANDLE_COUNT
+from src.http_session import upbit_session
+
+
+class AsyncUpbitClient:
+    """asyncio 기반 업비트 API 클라이언트 (UpbitClient와 동일한 인터페이스)
+
+    HTTP 요청은 공용 keep-alive 세션을 그대로 사용하고, 스레드 풀에서 실행해
+    독립적인 요청을 동시에 처리한다. 요청 제한 대기는 이벤트 루프를 막지 않는다.
+    """
+    def __init__(self, session=None, max_workers=None, client=None):
+        # client: 계좌 캐시/시세 스냅샷을 함께 쓸 동기 클라이언트 (없으면 session으로 생성)
+        self.client = client or UpbitClient(session)  # 응답 변환, 계좌 캐시 등 공용 로직
+        self.session = session or self.client.session
+        self.market = self.client.market
+        self.coin_ticker = self.client.coin_ticker
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or Config.HTTP_POOL_MAXSIZE,
+            thread_name_prefix='upbit-async'
+        )
+
+    async def request(self, method, path, params=None, auth=False):
+        """요청 제한 토큰을 비동기로 획득한 뒤 스레드 풀에서 요청 실행"""
+        group = self.session.rate_limiter.group_for(method, path, auth)
+        await self.session.rate_limiter.acquire_async(group)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor,
+            partial(self.session.request, method, path, params=params, auth=auth, limit=False)
+        )
+
+    def set_market_feed(self, market_feed):
+        """실시간 시세 수신기 설정"""
+        self.client.set_market_feed(market_feed)
+
+    async def gather(self, *coroutines):
+        """여러 요청을 동시에 실행"""
+        return await asyncio.gather(*coroutines)
+
+    async def get_candles(self, market, interval='minute1', count=200, to=None):
+        """캔들 원본 데이터 조회 (최신순)"""
+        path = CANDLE_PATHS.get(interval)
+        if path is None:
+            raise ValueError(f"지원하지 않는 캔들 간격: {interval}")
+
+        candles = []
+        while len(candles) < count:
+            params = {'market': market, 'count': min(count - len(candles), MAX_CANDLE_COUNT)}
+            if to:
+                params['to'] = to
+            rows = await self.request('GET', path, params=params)
+            if not rows:
+                break
+            candles.extend(rows)
+            if len(rows) < params['count']:
+                break
+            to = rows[-1]['candle_date_time_utc']
+        return candles
+
+    async def get_ohlcv(self, interval='minute1', count=200, market=None, to=None):
+        """OHLCV 데이터 조회"""
+        try:
+            market = market or self.market
+            candles = await self.get_candles(market, interval=interval, count=count, to=to)
+            if candles:
+                return self.client.candles_to_dataframe(candles)
+            log.log('WA', f"OHLCV 데이터가 비어있습니다: {market}")
+            return None
+        except Exception as e:
+            log.log('WA', f"OHLCV 데이터 조회 실패: {str(e)}")
+            return None
+
+    async def get_current_price(self, market=None):
+        """현재가 조회 (실시간 시세 또는 시세 스냅샷이 유효하면 요청 없이 반환)"""
+        try:
+            market = market or self.market
+            if self.client.market_feed is not None:
+                price = self.client.market_feed.get_price(market)
+                if price is not None:
+                    return price
+            price = self.client.price_snapshot.get_price(market)
+            if price is not None:
+                return price
+            tickers = await self.request('GET', '/v1/ticker', params={'markets': market})
+            self.client.price_snapshot.update(tickers or [])
+            price = tickers[0].get('trade_price') if tickers else None
+            if price is None:
+                log.log('WA', f"현재가 조회 실패: {market}")
+            return price
+        except Exception as e:
+            log.log('WA', f"현재가 조회 중 오류: {str(e)}")
+            return None
+
+    async def get_accounts(self):
+        """전체 계좌 조회"""
+        return await self.request('GET', '/v1/accounts', auth=True)
+
+    async def get_account_snapshot(self, force=False):
+        """계좌 스냅샷 조회 (동기 클라이언트와 같은 캐시 공유)"""
+        cache = self.client.account_cache
+        snapshot = None if force else cache.peek()
+        if snapshot is None:
+            snapshot = cache.update(await self.get_accounts())
+        return snapshot
+
+    async def get_account_value(self, ticker, field):
+        """특정 화폐의 계좌 항목 조회 (없으면 0)"""
+        ticker = ticker or self.coin_ticker
+        try:
+            snapshot = await self.get_account_snapshot()
+            return snapshot.get_value(ticker, field)
+        except Exception as e:
+            log.log('WA', f"{ticker} 계좌 조회 중 오류 ({field}): {str(e)}")
+            return 0
+
+    async def get_balance(self, ticker=None):
+        """잔고 조회 ('all'이면 전체 계좌 목록)"""
+        if isinstance(ticker, str) and ticker.lower() == 'all':
+            try:
+                snapshot = await self.get_account_snapshot()
+                return snapshot.raw or {}
+            except Exception as e:
+                log.log('WA', f"전체 잔고 조회 중 오류: {str(e)}")
+                return {}
+        return await self.get_account_value(ticker, 'balance')
+
+    async def get_avg_buy_price(self, ticker=None):
+        """평균 매수가 조회"""
+        return await self.get_account_value(ticker, 'avg_buy_price')
+
+    async def get_locked(self, ticker=None):
+        """주문 중 묶인 수량 조회"""
+        return await self.get_account_value(ticker, 'locked')
+
+    async def buy_market_order(self, market=None, price=None):
+        """시장가 매수"""
+        market = market or self.market
+        try:
+            if price is None:
+                raise ValueError("매수 금액(price)이 지정되지 않았습니다.")
+            log.log('TR', f"시장가 매수 시도: {market}, {float(price):,.0f}원")
+            result = await self.request('POST', '/v1/orders', params={
+                'market': market,
+                'side': 'bid',
+                'price': str(price),
+                'ord_type': 'price',
+            }, auth=True)
+            self.client.invalidate_account()
+            return result
+        except Exception as e:
+            log.detailed_error(f"시장가 매수 중 오류 (market={market}, price={price})", e)
+            return None
+
+    async def sell_market_order(self, market=None, volume=None):
+        """시장가 매도"""
+        market = market or self.market
+        try:
+            if volume is None:
+                raise ValueError("매도 수량(volume)이 지정되지 않았습니다.")
+            log.log('TR', f"시장가 매도 시도: {market}, {volume}개")
+            result = await self.request('POST', '/v1/orders', params={
+                'market': market,
+                'side': 'ask',
+                'volume': str(volume),
+                'ord_type': 'market',
+            }, auth=True)
+            self.client.invalidate_account()
+            return result
+        except Exception as e:
+            log.detailed_error(f"시장가 매도 중 오류 (market={market}, volume={volume})", e)
+            return None
+
+    async def get_orders(self, market=None, state="wait"):
+        """미체결 주문 조회"""
+        try:
+            market = market or self.market
+            orders = await self.request('GET', '/v1/orders', params={'market': market, 'state': state}, auth=True)
+            return orders or []
+        except Exception as e:
+            log.log('WA', f"미체결 주문 조회 중 오류: {str(e)}")
+            return []
+
+    async def cancel_order(self, uuid):
+        """주문 취소"""
+        try:
+            return await self.request('DELETE', '/v1/order', params={'uuid': uuid}, auth=True)
+        except Exception as e:
+            log.log('WA', f"주문 취소 중 오류: {str(e)}")
+            return None
+
+    async def get_trading_info(self, market=None, ticker=None):
+        """현재가, 현금 잔고, 코인 잔고, 평균 매수가를 동시에 조회
+
+        잔고 3종은 계좌 스냅샷 한 번으로 응답하므로 실제 요청은 시세 1회 + 계좌 1회
+        """
+        ticker = ticker or self.coin_ticker
+        current_price, snapshot = await asyncio.gather(
+            self.get_current_price(market),
+            self.get_account_snapshot(),
+            return_exceptions=True
+        )
+        if isinstance(current_price, Exception):
+            current_price = None
+        if isinstance(snapshot, Exception):
+            log.log('WA', f"계좌 스냅샷 조회 중 오류: {str(snapshot)}")
+            return current_price, None, None, None
+        return (current_price, snapshot.get_balance('KRW'),
+                snapshot.get_balance(ticker), snapshot.get_avg_buy_price(ticker))
+
+    def run(self, coroutine):
+        """동기 코드에서 코루틴 실행"""
+        return asyncio.run(coroutine)
+
+    def close(self):
+        """스레드 풀 종료"""
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,234 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+
+# 프로젝트 루트 경로를 Python 경로에 추가
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+import numpy as np
+
+from config.config import Config
+from utils.logger import log
+from src.api_client import CANDLE_PATHS, MAX_CANDLE_COUNT
+from src.http_session import upbit_session
+from src.candle_store import CANDLE_FIELDS, candles_to_arrays
+from src.candle_archive import CandleArchive
+
+
+def format_cursor(ts):
+    """epoch 초를 to 파라미터 형식(UTC)으로 변환"""
+    return datetime.fromtimestamp(ts, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+
+
+class BackfillCheckpoint:
+    """작업별 진행 상황(to 커서) 저장 파일 (중단 후 이어서 실행)"""
+    def __init__(self, path=None):
+        self.path = path or Config.BACKFILL_CHECKPOINT_FILE
+        self.lock = threading.Lock()
+        self.jobs = {}
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.jobs = json.load(f)
+
+    @staticmethod
+    def get_key(market, interval):
+        return f"{market}/{interval}"
+
+    def get(self, market, interval):
+        """작업 진행 상황 (없으면 빈 dict)"""
+        return dict(self.jobs.get(self.get_key(market, interval), {}))
+
+    def update(self, market, interval, **state):
+        """작업 진행 상황 갱신 후 파일에 저장 (임시 파일 교체)"""
+        with self.lock:
+            key = self.get_key(market, interval)
+            self.jobs.setdefault(key, {}).update(state)
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump(self.jobs, f, ensure_ascii=False, indent=2)
+            os.replace(self.path + '.tmp', self.path)
+
+
+class CandleBackfill:
+    """과거 캔들 병렬 수집기
+
+    (마켓, 간격) 작업마다 to 커서로 과거 방향 페이지 조회를 하고,
+    여러 작업을 스레드 풀에서 동시에 실행한다 (요청 속도는 공용 요청 제한기가 조절).
+    일정 페이지마다 아카이브에 저장하고 커서를 체크포인트에 기록한다.
+    완료된 작업을 다시 실행하면 아카이브 마지막 캔들 이후만 조회하고, 아카이브에 기록된
+    공백 구간(실시간 저장이 오래 중단된 구간 등)도 채운다.
+    """
+    def __init__(self, archive=None, checkpoint=None, session=None, workers=None, flush_pages=None):
+        self.archive = archive or CandleArchive()
+        self.checkpoint = checkpoint or BackfillCheckpoint()
+        self.session = session or upbit_session
+        self.workers = workers or Config.BACKFILL_WORKERS
+        self.flush_pages = flush_pages or Config.BACKFILL_FLUSH_PAGES
+        self.running = True
+        self.request_count = 0
+        self.row_count = 0
+
+    def fetch_page(self, market, interval, to=None):
+        """to 이전 캔들 한 페이지 조회 (과거순 배열)"""
+        params = {'market': market, 'count': MAX_CANDLE_COUNT}
+        if to:
+            params['to'] = to
+        rows = self.session.get(CANDLE_PATHS[interval], params=params)
+        self.request_count += 1
+        return candles_to_arrays(rows or [])
+
+    def flush(self, market, interval, pages, cursor):
+        """모은 페이지를 아카이브에 저장하고 커서 기록"""
+        if pages:
+            arrays = {field: np.concatenate([page[field] for page in pages]) for field in CANDLE_FIELDS}
+            self.archive.write(market, interval, arrays)
+        self.checkpoint.update(market, interval, cursor=cursor)
+
+    def fetch_range(self, market, interval, after, to=None):
+        """to(없으면 현재) 이전부터 after 시각 캔들까지 과거 방향으로 조회, (과거순 배열, 끝까지 조회했는지) 반환
+
+        after 시각 캔들(또는 그 이전 캔들)까지 포함해 기존 데이터와 이어지게 한다.
+        """
+        pages = []
+        cursor = to
+        complete = False
+        while self.running:
+            page = self.fetch_page(market, interval, cursor)
+            if len(page['ts']) == 0:
+                complete = True
+                break
+            pages.append(page)
+            oldest = int(page['ts'][0])
+            cursor = format_cursor(oldest)
+            if oldest <= after or len(page['ts']) < MAX_CANDLE_COUNT:
+                complete = True
+                break
+        if not pages:
+            return {field: np.empty(0, dtype=np.int64 if field == 'ts' else np.float64) for field in CANDLE_FIELDS}, complete
+        return {field: np.concatenate([page[field] for page in reversed(pages)]) for field in CANDLE_FIELDS}, complete
+
+    def top_up(self, market, interval):
+        """아카이브 마지막 캔들 이후 캔들 수집 (완료된 작업 재실행 시), 추가된 캔들 수 반환"""
+        _, last_ts = self.archive.get_range(market, interval)
+        if last_ts is None:
+            return 0
+        arrays, _ = self.fetch_range(market, interval, last_ts)
+        # 마지막 캔들은 형성 중에 저장됐을 수 있으므로 새로 조회한 값으로 교체
+        keep = arrays['ts'] >= last_ts
+        new_rows = int((arrays['ts'] > last_ts).sum())
+        if keep.any():
+            self.archive.write(market, interval, {field: values[keep] for field, values in arrays.items()})
+        log.log('TR', f"{market} {interval} 이미 완료된 작업, 최신 캔들 {new_rows}개 추가")
+        return new_rows
+
+    def fill_gaps(self, market, interval):
+        """아카이브에 기록된 공백 구간 수집, 수집한 캔들 수 반환"""
+        rows = 0
+        for after, before in self.archive.get_gaps(market, interval):
+            arrays, complete = self.fetch_range(market, interval, after, to=format_cursor(before))
+            keep = (arrays['ts'] > after) & (arrays['ts'] < before)
+            if keep.any():
+                self.archive.write(market, interval, {field: values[keep] for field, values in arrays.items()})
+            if not complete:
+                break
+            self.archive.remove_gap(market, interval, (after, before))
+            rows += int(keep.sum())
+            log.log('TR', f"{market} {interval} 공백 구간 {format_cursor(after)} ~ {format_cursor(before)} 수집: {int(keep.sum())}개")
+        return rows
+
+    def run_job(self, market, interval, start_ts):
+        """작업 하나 실행 (start_ts 이전에 도달하거나 상장 시점까지 + 공백 구간), 수집한 캔들 수 반환"""
+        state = self.checkpoint.get(market, interval)
+        if state.get('done') and state.get('start', start_ts) <= start_ts:
+            rows = self.top_up(market, interval)
+        else:
+            rows = self.crawl(market, interval, start_ts, state)
+        rows += self.fill_gaps(market, interval)
+        self.row_count += rows
+        return rows
+
+    def crawl(self, market, interval, start_ts, state):
+        """현재부터 start_ts까지 과거 방향 수집 (저장된 구간은 건너뜀), 수집한 캔들 수 반환"""
+        first_ts, last_ts = self.archive.get_range(market, interval)
+        cursor = state.get('cursor')
+        skipped = False
+        pages = []
+        rows = 0
+        done = False
+
+        while self.running:
+            page = self.fetch_page(market, interval, cursor)
+            if len(page['ts']) == 0:
+                done = True
+                break
+
+            keep = page['ts'] >= start_ts
+            pages.append({field: values[keep] for field, values in page.items()})
+            rows += int(keep.sum())
+            oldest = int(page['ts'][0])
+            cursor = format_cursor(oldest)
+
+            if oldest <= start_ts or len(page['ts']) < MAX_CANDLE_COUNT:
+                done = True
+                break
+
+            # 이미 저장된 구간에 닿으면 저장된 가장 오래된 캔들 이전으로 건너뜀
+            if not skipped and last_ts is not None and oldest <= last_ts and first_ts > start_ts:
+                cursor = format_cursor(min(oldest, first_ts))
+                skipped = True
+
+            if len(pages) >= self.flush_pages:
+                self.flush(market, interval, pages, cursor)
+                pages = []
+
+        self.flush(market, interval, pages, cursor)
+        if done:
+            self.checkpoint.update(market, interval, done=True, start=start_ts, cursor=None)
+        log.log('TR', f"{market} {interval} 수집 {'완료' if done else '중단'}: {rows}개")
+        return rows
+
+    def run(self, markets, intervals, start_ts):
+        """모든 (마켓, 간격) 작업을 동시에 실행"""
+        started = time.monotonic()
+        jobs = [(market, interval) for market in markets for interval in intervals]
+        log.log('TR', f"과거 캔들 수집 시작: {len(jobs)}개 작업, 동시 실행 {self.workers}개, 시작 시점 {format_cursor(start_ts)}")
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(self.run_job, market, interval, start_ts): (market, interval) for market, interval in jobs}
+            try:
+                for future in as_completed(futures):
+                    market, interval = futures[future]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        log.log('WA', f"{market} {interval} 수집 실패: {str(e)}")
+            except KeyboardInterrupt:
+                # 진행 중인 작업은 현재 페이지까지 저장 후 종료
+                self.running = False
+                log.log('WA', "수집 중단 요청, 진행 상황 저장 중...")
+
+        elapsed = time.monotonic() - started
+        log.log('TR', f"과거 캔들 수집 종료: 요청 {self.request_count}회, 캔들 {self.row_count}개, {elapsed:.1f}초")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="업비트 과거 캔들 수집 (중단 후 재실행하면 이어서 수집)")
+    parser.add_argument('--markets', nargs='+', default=[Config.MARKET], help="수집할 마켓 (예: KRW-XRP KRW-BTC)")
+    parser.add_argument('--intervals', nargs='+', default=['minute1'], choices=sorted(CANDLE_PATHS), help="수집할 캔들 간격")
+    parser.add_argument('--days', type=int, default=365, help="수집 기간 (일)")
+    parser.add_argument('--workers', type=int, default=Config.BACKFILL_WORKERS, help="동시 실행 작업 수")
+    parser.add_argument('--archive', default=Config.CANDLE_ARCHIVE_DIR, help="아카이브 디렉토리")
+    parser.add_argument('--checkpoint', default=Config.BACKFILL_CHECKPOINT_FILE, help="체크포인트 파일")
+    args = parser.parse_args()
+
+    start = datetime.now(timezone.utc) - timedelta(days=args.days)
+    backfill = CandleBackfill(CandleArchive(args.archive), BackfillCheckpoint(args.checkpoint), workers=args.workers)
+    backfill.run(args.markets, args.intervals, int(start.timestamp()))
@@ -0,0 +1,300 @@
+import json
+import os
+import struct
+import threading
+
+import numpy as np
+
+from config.config import Config
+from utils.logger import log
+from src.candle_store import CANDLE_FIELDS, INTERVAL_SECONDS, CandleView
+
+# 파일 구조: [헤더 64바이트][ts 컬럼][open 컬럼]...[value 컬럼], 컬럼마다 capacity개의 8바이트 값
+# 행은 컬럼의 [head, head + count) 구간에 있고, head 앞은 과거 캔들을 앞에 붙일 여유 공간
+# (head가 없던 이전 파일은 헤더 여백이 0이므로 head=0으로 읽힘)
+MAGIC = b'UPCANDL1'
+HEADER = struct.Struct('<8sqqq')  # magic, capacity, count(기록 완료된 행 수), head(첫 행 위치)
+HEADER_SIZE = 64
+COLUMN_DTYPES = {field: np.dtype('<i8') if field == 'ts' else np.dtype('<f8') for field in CANDLE_FIELDS}
+MIN_CAPACITY = 1024
+
+
+class ArchiveFile:
+    """캔들 아카이브 파일 하나의 메모리 맵 (컬럼별 배열 뷰)"""
+    def __init__(self, path):
+        self.path = path
+        self.inode = os.stat(path).st_ino
+        self.mmap = np.memmap(path, dtype=np.uint8, mode='r+')
+        magic, self.capacity, _, _ = HEADER.unpack_from(self.mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"캔들 아카이브 파일 형식이 아님: {path}")
+        self.columns = {}
+        for i, (field, dtype) in enumerate(COLUMN_DTYPES.items()):
+            offset = HEADER_SIZE + i * self.capacity * 8
+            self.columns[field] = self.mmap[offset:offset + self.capacity * 8].view(dtype)
+
+    @property
+    def count(self):
+        """기록 완료된 행 수 (헤더에서 매번 읽어 다른 프로세스의 추가도 반영)"""
+        return HEADER.unpack_from(self.mmap, 0)[2]
+
+    def get_bounds(self):
+        """(첫 행 위치, 행 수)를 헤더에서 한 번에 읽음"""
+        _, _, count, head = HEADER.unpack_from(self.mmap, 0)
+        return head, count
+
+    def get_columns(self):
+        """기록 완료된 행의 컬럼 뷰"""
+        head, count = self.get_bounds()
+        return {field: column[head:head + count] for field, column in self.columns.items()}
+
+    def set_count(self, count, head=None):
+        """데이터를 디스크에 반영한 뒤 행 수(와 첫 행 위치) 갱신 (중단되면 이전 값이 유지됨)"""
+        self.mmap.flush()
+        head = self.get_bounds()[0] if head is None else head
+        HEADER.pack_into(self.mmap, 0, MAGIC, self.capacity, count, head)
+        self.mmap.flush()
+
+    def is_current(self):
+        """파일이 교체(확장/병합)되지 않았는지 확인"""
+        try:
+            return os.stat(self.path).st_ino == self.inode
+        except FileNotFoundError:
+            return False
+
+    @staticmethod
+    def create(path, arrays, capacity, head=0):
+        """새 파일을 임시 경로에 만들어 교체 (교체 전 중단되면 기존 파일 유지)"""
+        size = len(arrays['ts'])
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, capacity, size, head).ljust(HEADER_SIZE, b'\0'))
+            for field, dtype in COLUMN_DTYPES.items():
+                column = np.zeros(capacity, dtype=dtype)
+                column[head:head + size] = arrays[field]
+                f.write(column.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+
+class CandleArchive:
+    """마켓/간격별 메모리 맵 캔들 아카이브
+
+    <root>/<market>/<interval>.candles 파일 하나에 필드별 고정 폭 컬럼을 시각 오름차순으로 저장한다.
+    읽기는 메모리 맵 뷰라 전체를 메모리에 올리지 않고, 시간 구간은 ts 컬럼 이진 탐색으로 찾는다.
+    새 캔들 추가는 데이터 기록 후 헤더의 행 수를 갱신해서 중간에 중단되어도 파일이 깨지지 않는다.
+    추가한 캔들이 저장된 마지막 캔들까지 이어지지 않으면(장시간 중단 후 실시간 저장 등) 그 공백을
+    <interval>.gaps 파일에 기록해 과거 캔들 수집기가 채우게 한다.
+    """
+    def __init__(self, root=None):
+        self.root = root or Config.CANDLE_ARCHIVE_DIR
+        self.files = {}
+        self.lock = threading.RLock()
+
+    def get_path(self, market, interval):
+        """마켓/간격별 파일 경로"""
+        return os.path.join(self.root, market, f'{interval}.candles')
+
+    def exists(self, market, interval):
+        """저장된 데이터가 있는지 확인"""
+        return os.path.exists(self.get_path(market, interval))
+
+    def open(self, market, interval):
+        """메모리 맵 파일 (없으면 None, 다른 곳에서 교체되었으면 다시 연다)"""
+        key = (market, interval)
+        archive_file = self.files.get(key)
+        if archive_file is not None and archive_file.is_current():
+            return archive_file
+        if not self.exists(market, interval):
+            self.files.pop(key, None)
+            return None
+        archive_file = ArchiveFile(self.get_path(market, interval))
+        self.files[key] = archive_file
+        return archive_file
+
+    def get_view(self, market, interval, start=None, end=None, count=None):
+        """start <= ts < end 구간의 캔들 뷰 (복사 없음, count가 있으면 구간의 최근 count개)"""
+        archive_file = self.open(market, interval)
+        if archive_file is None:
+            return CandleView({field: np.empty(0, dtype=dtype) for field, dtype in COLUMN_DTYPES.items()})
+
+        columns = archive_file.get_columns()
+        ts = columns['ts']
+        lo = 0 if start is None else int(np.searchsorted(ts, start, side='left'))
+        hi = len(ts) if end is None else int(np.searchsorted(ts, end, side='left'))
+        if count is not None:
+            lo = max(lo, hi - count)
+        return CandleView({field: column[lo:hi] for field, column in columns.items()})
+
+    def read(self, market, interval, start=None, end=None, count=None):
+        """구간 캔들 배열 복사본"""
+        view = self.get_view(market, interval, start, end, count)
+        return {field: np.array(view[field]) for field in CANDLE_FIELDS}
+
+    def get_dataframe(self, market, interval, start=None, end=None, count=None):
+        """구간 캔들 DataFrame (비어 있으면 None)"""
+        view = self.get_view(market, interval, start, end, count)
+        return view.to_dataframe() if len(view) else None
+
+    def get_range(self, market, interval):
+        """저장된 첫/마지막 캔들 시각 (없으면 None, None)"""
+        archive_file = self.open(market, interval)
+        if archive_file is None:
+            return None, None
+        ts = archive_file.get_columns()['ts']
+        if len(ts) == 0:
+            return None, None
+        return int(ts[0]), int(ts[-1])
+
+    def get_gap_path(self, market, interval):
+        """공백 구간 기록 파일 경로"""
+        return os.path.join(self.root, market, f'{interval}.gaps')
+
+    def get_gaps(self, market, interval):
+        """기록된 공백 구간 [(이전 캔들 시각, 다음 캔들 시각), ...] (두 시각 사이 캔들이 빠져 있을 수 있음)"""
+        path = self.get_gap_path(market, interval)
+        if not os.path.exists(path):
+            return []
+        with open(path, 'r', encoding='utf-8') as f:
+            return [tuple(gap) for gap in json.load(f)]
+
+    def save_gaps(self, market, interval, gaps):
+        """공백 구간 목록 저장 (비어 있으면 파일 삭제)"""
+        path = self.get_gap_path(market, interval)
+        with self.lock:
+            if not gaps:
+                if os.path.exists(path):
+                    os.remove(path)
+                return
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump(sorted(set(gaps)), f)
+            os.replace(path + '.tmp', path)
+
+    def add_gap(self, market, interval, after, before):
+        """after와 before 사이 캔들이 빠졌을 수 있음을 기록"""
+        with self.lock:
+            self.save_gaps(market, interval, self.get_gaps(market, interval) + [(int(after), int(before))])
+        log.log('WA', f"{market} {interval} 아카이브 공백 기록: {after} ~ {before}")
+
+    def remove_gap(self, market, interval, gap):
+        """채운 공백 구간 삭제"""
+        with self.lock:
+            self.save_gaps(market, interval, [item for item in self.get_gaps(market, interval) if item != tuple(gap)])
+
+    def append(self, market, interval, arrays, record_gap=True):
+        """마지막 캔들 이후 캔들만 파일 끝에 추가, 추가된 개수 반환
+
+        arrays는 연속 조회 결과여야 한다. 첫 캔들이 저장된 마지막 캔들보다 한 간격 넘게 뒤면
+        그 사이를 조회하지 못한 것이므로 record_gap이면 공백으로 기록한다.
+        """
+        with self.lock:
+            archive_file = self.open(market, interval)
+            ts = np.asarray(arrays['ts'])
+            if archive_file is not None and archive_file.count:
+                last_ts = int(archive_file.get_columns()['ts'][-1])
+                seconds = INTERVAL_SECONDS.get(interval)
+                if record_gap and seconds and len(ts) and int(ts[0]) > last_ts + seconds:
+                    self.add_gap(market, interval, last_ts, int(ts[0]))
+                keep = ts > last_ts
+                arrays = {field: np.asarray(arrays[field])[keep] for field in CANDLE_FIELDS}
+            size = len(arrays['ts'])
+            if size == 0:
+                return 0
+
+            head, count = archive_file.get_bounds() if archive_file is not None else (0, 0)
+            if archive_file is None or head + count + size > archive_file.capacity:
+                existing = self.read(market, interval)
+                merged = {field: np.concatenate((existing[field], arrays[field])) for field in CANDLE_FIELDS}
+                self.rewrite(market, interval, merged, head_room=head)
+                return size
+
+            end = head + count
+            for field, column in archive_file.columns.items():
+                column[end:end + size] = arrays[field]
+            archive_file.set_count(count + size)
+            return size
+
+    def prepend(self, market, interval, arrays):
+        """첫 캔들 이전 캔들을 파일 앞 여유 공간에 추가 (과거순, 모두 첫 캔들보다 이전), 추가된 개수 반환
+
+        과거 방향으로 수집한 페이지를 저장할 때마다 파일 전체를 다시 쓰지 않도록, 여유 공간이
+        부족할 때만 현재 크기만큼 앞 여유 공간을 두고 다시 만든다 (전체 기록량은 선형).
+        """
+        with self.lock:
+            archive_file = self.open(market, interval)
+            size = len(arrays['ts'])
+            if size == 0:
+                return 0
+            head, count = archive_file.get_bounds()
+            if head < size:
+                existing = self.read(market, interval)
+                merged = {field: np.concatenate((arrays[field], existing[field])) for field in CANDLE_FIELDS}
+                self.rewrite(market, interval, merged, head_room=max(len(merged['ts']), MIN_CAPACITY))
+                return size
+
+            for field, column in archive_file.columns.items():
+                column[head - size:head] = arrays[field]
+            archive_file.set_count(count + size, head - size)
+            return size
+
+    def write(self, market, interval, arrays):
+        """캔들 배열 병합 저장 (같은 시각은 새 데이터로 교체), 저장 후 전체 개수 반환
+
+        새 데이터가 마지막 캔들부터 시작하면 마지막 캔들만 제자리에서 교체하고 나머지는 추가하고,
+        모두 첫 캔들 이전이면 앞 여유 공간에 붙인다. 저장된 구간과 겹치면 파일을 다시 만든다.
+        """
+        ts = np.asarray(arrays['ts'])
+        if len(ts) == 0:
+            _, last_ts = self.get_range(market, interval)
+            return 0 if last_ts is None else self.open(market, interval).count
+
+        first_ts, last_ts = self.get_range(market, interval)
+        if first_ts is not None and ts.max() < first_ts:
+            _, index = np.unique(ts, return_index=True)
+            self.prepend(market, interval, {field: np.asarray(arrays[field])[index] for field in CANDLE_FIELDS})
+            return self.open(market, interval).count
+        if last_ts is None or ts.min() >= last_ts:
+            order = np.argsort(ts, kind='stable')
+            arrays = {field: np.asarray(arrays[field])[order] for field in CANDLE_FIELDS}
+            if last_ts is not None and ts.min() == last_ts:
+                with self.lock:
+                    archive_file = self.open(market, interval)
+                    head, count = archive_file.get_bounds()
+                    for field, column in archive_file.columns.items():
+                        column[head + count - 1] = arrays[field][0]
+                    archive_file.set_count(count)
+            self.append(market, interval, arrays, record_gap=False)
+            return self.open(market, interval).count
+
+        with self.lock:
+            existing = self.read(market, interval)
+            merged = {
+                field: np.concatenate((np.asarray(arrays[field], dtype=dtype), existing[field]))
+                for field, dtype in COLUMN_DTYPES.items()
+            }
+            # 새 데이터가 앞에 있으므로 첫 번째로 나온 시각을 남김
+            _, index = np.unique(merged['ts'], return_index=True)
+            # 과거 방향 수집 중이면 이후 페이지를 앞에 붙일 수 있게 앞 여유 공간 유지
+            head_room = len(index) if first_ts is not None and ts.min() < first_ts else 0
+            self.rewrite(market, interval, {field: values[index] for field, values in merged.items()}, head_room=head_room)
+            return len(index)
+
+    def rewrite(self, market, interval, arrays, head_room=0):
+        """파일 전체를 여유 용량(앞 head_room개, 뒤 현재 크기만큼)을 두고 다시 생성 (lock 보유 상태에서 호출)"""
+        path = self.get_path(market, interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        size = len(arrays['ts'])
+        capacity = head_room + max(MIN_CAPACITY, size * 2)
+        # 기존 메모리 맵을 먼저 닫아야 교체 가능한 플랫폼이 있음
+        self.files.pop((market, interval), None)
+        ArchiveFile.create(path, arrays, capacity, head_room)
+        log.log('TR', f"{market} {interval} 아카이브 재작성: {size}개 (용량 {capacity})")
+
+    def get_stats(self):
+        """열려 있는 파일 목록과 행 수"""
+        return {f"{market}/{interval}": archive_file.count for (market, interval), archive_file in self.files.items()}
+
+
+candle_archive = CandleArchive()
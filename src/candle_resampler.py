@@ -0,0 +1,205 @@
+import time
+
+import numpy as np
+
+from config.config import Config
+from utils.logger import log
+from src.candle_store import CANDLE_FIELDS, INTERVAL_SECONDS, CandleBuffer, candles_to_arrays
+
+# 1분봉으로 만들 수 있는 상위 간격
+RESAMPLE_INTERVALS = ('minute3', 'minute5', 'minute10', 'minute15', 'minute30', 'minute60', 'minute240', 'day')
+
+
+def bucket_start(ts, interval):
+    """캔들 시작 시각 (업비트 분/일봉은 모두 UTC epoch 기준 경계에 정렬, 일봉은 KST 09:00 = UTC 00:00)"""
+    seconds = INTERVAL_SECONDS[interval]
+    return ts // seconds * seconds
+
+
+def resample_arrays(arrays, interval):
+    """과거순 1분봉 배열을 상위 간격 캔들 배열로 벡터 집계"""
+    ts = np.asarray(arrays['ts'], dtype=np.int64)
+    if len(ts) == 0:
+        return {field: np.asarray(arrays[field])[:0] for field in CANDLE_FIELDS}
+
+    buckets = bucket_start(ts, interval)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(buckets)) + 1))
+    ends = np.concatenate((starts[1:], [len(ts)]))
+    return {
+        'ts': buckets[starts],
+        'open': np.asarray(arrays['open'])[starts],
+        'high': np.maximum.reduceat(arrays['high'], starts),
+        'low': np.minimum.reduceat(arrays['low'], starts),
+        'close': np.asarray(arrays['close'])[ends - 1],
+        'volume': np.add.reduceat(arrays['volume'], starts),
+        'value': np.add.reduceat(arrays['value'], starts),
+    }
+
+
+def merge_candle(closed, row, ts):
+    """마감된 1분봉 집계와 형성 중인 1분봉을 합친 캔들"""
+    if closed is None:
+        merged = dict(row)
+    else:
+        merged = {
+            'open': closed['open'],
+            'high': max(closed['high'], row['high']),
+            'low': min(closed['low'], row['low']),
+            'close': row['close'],
+            'volume': closed['volume'] + row['volume'],
+            'value': closed['value'] + row['value'],
+        }
+    merged['ts'] = ts
+    return merged
+
+
+class TimeframeState:
+    """간격별 증분 집계 상태"""
+    def __init__(self, interval, capacity):
+        self.interval = interval
+        self.buffer = CandleBuffer(capacity)
+        self.bucket = None   # 현재 형성 중인 캔들 시작 시각
+        self.closed = None   # 현재 캔들에 포함된 마감 1분봉 집계
+
+
+class CandleResampler:
+    """1분봉 스트림으로 상위 간격 캔들을 로컬에서 생성하는 엔진
+
+    1분봉이 갱신될 때마다 간격별 형성 중인 캔들을 O(1)로 갱신하고,
+    새 1분봉이 시작되면 직전 1분봉을 마감 집계에 반영한다.
+    """
+    def __init__(self, intervals=RESAMPLE_INTERVALS, capacity=None):
+        self.capacity = capacity or Config.RESAMPLER_CAPACITY
+        self.states = {interval: TimeframeState(interval, self.capacity) for interval in intervals}
+        self.minute = None     # 형성 중인 1분봉
+        self.minute_ts = None
+
+    def seed(self, interval, arrays):
+        """API로 받은 상위 간격 과거 캔들 적재 (현재 형성 중인 캔들은 1분봉으로 다시 만든다)"""
+        state = self.states[interval]
+        ts = np.asarray(arrays['ts'])
+        current = bucket_start(int(time.time()), interval)
+        keep = ts < current
+        state.buffer.merge({field: np.asarray(arrays[field])[keep] for field in CANDLE_FIELDS})
+
+    def load(self, arrays):
+        """과거순 1분봉 이력 적재 (마지막 1분봉은 형성 중으로 간주)"""
+        if len(arrays['ts']) == 0:
+            return
+        closed = {field: np.asarray(arrays[field])[:-1] for field in CANDLE_FIELDS}
+        for interval, state in self.states.items():
+            resampled = resample_arrays(closed, interval)
+            # 시드된 이력과 겹치는(부분 집계일 수 있는) 캔들은 건너뜀
+            last_ts = state.buffer.last_ts()
+            if last_ts is not None:
+                keep = resampled['ts'] > last_ts
+                resampled = {field: values[keep] for field, values in resampled.items()}
+            state.buffer.merge(resampled)
+            if len(resampled['ts']):
+                state.bucket = int(resampled['ts'][-1])
+                state.closed = {field: resampled[field][-1] for field in CANDLE_FIELDS[1:]}
+
+        self.minute = None
+        self.minute_ts = int(closed['ts'][-1]) if len(closed['ts']) else None
+        self.update({field: arrays[field][-1] for field in CANDLE_FIELDS})
+
+    def update(self, row):
+        """1분봉 하나 반영 (형성 중 갱신 또는 새 1분봉), 마감된 간격 목록 반환"""
+        ts = int(row['ts'])
+        if self.minute_ts is not None and ts < self.minute_ts:
+            return []
+
+        row = {field: float(row[field]) for field in CANDLE_FIELDS[1:]}
+        closed_intervals = []
+        new_minute = self.minute_ts is None or ts > self.minute_ts
+
+        for interval, state in self.states.items():
+            bucket = int(bucket_start(ts, interval))
+
+            # 직전 1분봉이 마감되었으면 해당 캔들 집계에 반영
+            if new_minute and self.minute is not None and state.bucket == bucket_start(self.minute_ts, interval):
+                state.closed = merge_candle(state.closed, self.minute, state.bucket)
+
+            if state.bucket is None or bucket > state.bucket:
+                if state.bucket is not None:
+                    closed_intervals.append(interval)
+                state.bucket = bucket
+                state.closed = None
+                state.buffer.append(merge_candle(None, row, bucket))
+            else:
+                state.buffer.replace_last(merge_candle(state.closed, row, bucket))
+
+        self.minute = row
+        self.minute_ts = ts
+        return closed_intervals
+
+    def update_arrays(self, arrays):
+        """과거순 1분봉 배열을 순서대로 반영"""
+        closed_intervals = set()
+        for i in range(len(arrays['ts'])):
+            closed_intervals.update(self.update({field: arrays[field][i] for field in CANDLE_FIELDS}))
+        return closed_intervals
+
+    def get_view(self, interval, count=None):
+        """간격별 최근 캔들 뷰"""
+        return self.states[interval].buffer.view(count)
+
+
+class LocalTimeframes:
+    """마켓 하나의 다중 시간대 캔들을 1분봉 증분 조회만으로 유지
+
+    시작 시 간격별 과거 캔들과 현재 캔들 구간의 1분봉을 한 번 조회한 뒤에는
+    매 틱 새 1분봉만 조회한다.
+    """
+    def __init__(self, client, market, intervals=RESAMPLE_INTERVALS, capacity=None):
+        self.client = client
+        self.market = market
+        self.resampler = CandleResampler(intervals, capacity)
+        self.initialized = False
+        self.updated_at = 0.0
+
+    def initialize(self):
+        """과거 캔들 시드 및 현재 구간 1분봉 적재"""
+        now = int(time.time())
+        earliest = now
+        for interval in self.resampler.states:
+            candles = self.client.get_candles(self.market, interval=interval, count=self.resampler.capacity)
+            if candles:
+                self.resampler.seed(interval, candles_to_arrays(candles))
+            earliest = min(earliest, bucket_start(now, interval))
+
+        minutes = (now - earliest) // 60 + 1
+        candles = self.client.get_candles(self.market, interval='minute1', count=minutes)
+        self.resampler.load(candles_to_arrays(candles))
+        self.initialized = True
+        self.updated_at = time.monotonic()
+        log.log('TR', f"{self.market} 로컬 캔들 생성 초기화 완료 (1분봉 {len(candles)}개)")
+
+    def refresh(self):
+        """마지막 1분봉 이후 데이터만 조회해 모든 간격 갱신, 마감된 간격 반환"""
+        if not self.initialized:
+            self.initialize()
+            return set()
+        if time.monotonic() - self.updated_at < Config.CANDLE_STORE_MIN_REFRESH:
+            return set()
+
+        count = (int(time.time()) - self.resampler.minute_ts) // 60 + 1
+        candles = self.client.get_candles(self.market, interval='minute1', count=max(count, 1))
+        self.updated_at = time.monotonic()
+        if not candles:
+            return set()
+        return self.resampler.update_arrays(candles_to_arrays(candles))
+
+    def supports(self, interval, count):
+        """로컬 생성으로 제공 가능한 간격/개수인지 확인"""
+        return interval in self.resampler.states and count <= self.resampler.capacity
+
+    def get_view(self, interval, count=None):
+        """간격별 최근 캔들 뷰 (필요하면 1분봉 증분 갱신)"""
+        self.refresh()
+        return self.resampler.get_view(interval, count)
+    
+    def get_dataframe(self, interval, count=None):
+        """간격별 최근 캔들 DataFrame"""
+        view = self.get_view(interval, count)
+        return view.to_dataframe() if len(view) else None
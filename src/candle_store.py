@@ -0,0 +1,272 @@
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from config.config import Config
+from utils.logger import log
+
+CANDLE_FIELDS = ('ts', 'open', 'high', 'low', 'close', 'volume', 'value')
+
+# 캔들 간격별 길이 (초), 업비트 캔들은 UTC 기준 경계에 정렬됨 (일봉은 KST 09:00 = UTC 00:00)
+INTERVAL_SECONDS = {
+    'minute1': 60,
+    'minute3': 180,
+    'minute5': 300,
+    'minute10': 600,
+    'minute15': 900,
+    'minute30': 1800,
+    'minute60': 3600,
+    'minute240': 14400,
+    'day': 86400,
+}
+
+
+def parse_candle_time(value):
+    """candle_date_time_utc 문자열을 epoch 초로 변환"""
+    return int(datetime.fromisoformat(value).replace(tzinfo=timezone.utc).timestamp())
+
+
+def candles_to_arrays(candles):
+    """캔들 원본 데이터(최신순)를 필드별 배열(과거순)로 변환"""
+    candles = list(reversed(candles))
+    return {
+        'ts': np.array([parse_candle_time(row['candle_date_time_utc']) for row in candles], dtype=np.int64),
+        'open': np.array([row['opening_price'] for row in candles], dtype=np.float64),
+        'high': np.array([row['high_price'] for row in candles], dtype=np.float64),
+        'low': np.array([row['low_price'] for row in candles], dtype=np.float64),
+        'close': np.array([row['trade_price'] for row in candles], dtype=np.float64),
+        'volume': np.array([row['candle_acc_trade_volume'] for row in candles], dtype=np.float64),
+        'value': np.array([row['candle_acc_trade_price'] for row in candles], dtype=np.float64),
+    }
+
+
+def arrays_to_dataframe(arrays):
+    """필드별 배열을 OHLCV DataFrame으로 변환 (배열 복사 없음, 인덱스는 KST)"""
+    index = pd.to_datetime(arrays['ts'], unit='s', utc=True).tz_convert('Asia/Seoul').tz_localize(None)
+    return pd.DataFrame({field: arrays[field] for field in CANDLE_FIELDS[1:]}, index=index, copy=False)
+
+
+def dataframe_to_arrays(df):
+    """OHLCV DataFrame(KST 인덱스)을 필드별 배열로 변환"""
+    index = df.index.tz_localize('Asia/Seoul') if df.index.tz is None else df.index
+    arrays = {'ts': index.tz_convert('UTC').tz_localize(None).values.astype('datetime64[s]').astype(np.int64)}
+    for field in CANDLE_FIELDS[1:]:
+        arrays[field] = df[field].to_numpy(dtype=np.float64) if field in df else np.full(len(df), np.nan)
+    return arrays
+
+
+class CandleView:
+    """링 버퍼의 연속 구간에 대한 읽기 전용 뷰 (복사 없음)
+
+    다음 갱신 시 내용이 바뀔 수 있으므로 한 틱 안에서만 사용한다.
+    """
+    def __init__(self, arrays):
+        self.arrays = arrays
+        for field in CANDLE_FIELDS:
+            setattr(self, field, arrays[field])
+
+    def __len__(self):
+        return len(self.ts)
+
+    def __getitem__(self, field):
+        return self.arrays[field]
+
+    def to_dataframe(self):
+        """OHLCV DataFrame으로 변환"""
+        return arrays_to_dataframe(self.arrays)
+
+
+class CandleBuffer:
+    """고정 용량 캔들 링 버퍼
+
+    각 값을 slot과 slot+capacity 두 곳에 기록해 최근 N개가 항상 연속 구간이 되도록 한다.
+    작업자 스레드와 주 스레드(스캐너)가 같은 버퍼를 갱신/조회하므로 조회~병합과 뷰 생성은 lock 안에서 한다.
+    """
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.data = {
+            field: np.zeros(capacity * 2, dtype=np.int64 if field == 'ts' else np.float64)
+            for field in CANDLE_FIELDS
+        }
+        for field in CANDLE_FIELDS[1:]:
+            self.data[field][:] = np.nan
+        self.pos = 0   # 다음에 기록할 slot
+        self.size = 0
+        self.updated_at = 0.0
+        self.lock = threading.RLock()
+
+    def last_ts(self):
+        """마지막(형성 중) 캔들 시각 (비어 있으면 None)"""
+        if self.size == 0:
+            return None
+        return int(self.data['ts'][self.pos - 1 + self.capacity])
+
+    def write(self, slot, row):
+        """slot에 캔들 기록 (양쪽 사본 모두)"""
+        for field in CANDLE_FIELDS:
+            value = row[field]
+            self.data[field][slot] = value
+            self.data[field][slot + self.capacity] = value
+
+    def append(self, row):
+        """새 캔들 추가 (가득 차면 가장 오래된 캔들을 덮어씀)"""
+        self.write(self.pos, row)
+        self.pos = (self.pos + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def replace_last(self, row):
+        """형성 중인 마지막 캔들 갱신"""
+        self.write((self.pos - 1) % self.capacity, row)
+
+    def merge(self, arrays):
+        """과거순 배열 병합 (마지막 시각보다 오래된 캔들은 무시, 같은 시각은 교체)"""
+        with self.lock:
+            last_ts = self.last_ts()
+            appended = 0
+            for i in range(len(arrays['ts'])):
+                row = {field: arrays[field][i] for field in CANDLE_FIELDS}
+                ts = int(row['ts'])
+                if last_ts is not None and ts < last_ts:
+                    continue
+                if last_ts is not None and ts == last_ts:
+                    self.replace_last(row)
+                else:
+                    self.append(row)
+                    appended += 1
+                last_ts = ts
+            self.updated_at = time.monotonic()
+            return appended
+
+    def view(self, count=None, copy=False):
+        """최근 count개 캔들의 연속 뷰 (다른 스레드가 갱신하는 버퍼를 읽을 때는 copy=True로 복사본 사용)"""
+        with self.lock:
+            count = self.size if count is None else min(count, self.size)
+            end = self.pos + self.capacity
+            return CandleView({
+                field: self.data[field][end - count:end].copy() if copy else self.data[field][end - count:end]
+                for field in CANDLE_FIELDS
+            })
+
+
+class CandleStore:
+    """(마켓, 간격)별 캔들 저장소 (마지막 캔들 이후 데이터만 증분 조회)
+
+    아카이브가 있으면 처음 채울 때 저장된 최근 캔들을 먼저 불러오고, 마감된 캔들은 아카이브에 추가한다.
+    """
+    def __init__(self, client, capacity=None, min_refresh=None, archive=None):
+        self.client = client
+        self.archive = archive
+        self.capacity = capacity or Config.CANDLE_STORE_CAPACITY
+        self.min_refresh = Config.CANDLE_STORE_MIN_REFRESH if min_refresh is None else min_refresh
+        self.buffers = {}
+        self.lock = threading.Lock()
+        self.fetched_rows = 0
+        self.request_count = 0
+
+    @staticmethod
+    def supports(interval):
+        """증분 갱신 가능한 간격인지 확인 (주/월봉은 길이가 일정하지 않음)"""
+        return interval in INTERVAL_SECONDS
+
+    def get_buffer(self, market, interval):
+        """마켓/간격별 버퍼 (없으면 생성)"""
+        key = (market, interval)
+        with self.lock:
+            if key not in self.buffers:
+                self.buffers[key] = CandleBuffer(self.capacity)
+            return self.buffers[key]
+
+    def update(self, market, interval, force=False):
+        """새 캔들만 조회해 버퍼 갱신, 추가된 캔들 수 반환
+
+        같은 버퍼를 여러 스레드가 동시에 갱신하면 같은 구간을 두 번 조회해 병합하므로 버퍼 lock을
+        잡고 조회한다. 기다리는 동안 다른 스레드가 갱신했으면 force여도 다시 조회하지 않는다.
+        """
+        buffer = self.get_buffer(market, interval)
+        requested_at = time.monotonic()
+        with buffer.lock:
+            if buffer.size and buffer.updated_at >= requested_at:
+                return 0
+            if not force and buffer.size and requested_at - buffer.updated_at < self.min_refresh:
+                return 0
+            return self.fetch(market, interval, buffer)
+
+    def fetch(self, market, interval, buffer):
+        """마지막 캔들 이후 캔들 조회 후 병합 (buffer.lock 보유 상태에서 호출)"""
+        last_ts = buffer.last_ts()
+        if last_ts is None and self.archive is not None:
+            last_ts = self.load_archive(market, interval, buffer)
+        if last_ts is None:
+            count = self.capacity
+        else:
+            # 마지막(형성 중이던) 캔들부터 현재 형성 중인 캔들까지
+            elapsed = int(time.time()) - last_ts
+            count = elapsed // INTERVAL_SECONDS[interval] + 1
+            if count > self.capacity:
+                count = self.capacity
+
+        candles = self.client.get_candles(market, interval=interval, count=count)
+        self.request_count += 1
+        if not candles:
+            return 0
+        self.fetched_rows += len(candles)
+        arrays = candles_to_arrays(candles)
+        appended = buffer.merge(arrays)
+        if self.archive is not None:
+            self.save_archive(market, interval, arrays)
+        return appended
+    
+    def load_archive(self, market, interval, buffer):
+        """아카이브의 최근 캔들로 빈 버퍼 채우기 (공백이 버퍼 용량보다 크면 사용하지 않음), 마지막 시각 반환"""
+        try:
+            view = self.archive.get_view(market, interval, count=self.capacity)
+            if len(view) == 0:
+                return None
+            gap = (int(time.time()) - int(view.ts[-1])) // INTERVAL_SECONDS[interval]
+            if gap >= self.capacity:
+                return None
+            buffer.merge(view.arrays)
+            return buffer.last_ts()
+        except Exception as e:
+            log.log('WA', f"{market} {interval} 아카이브 읽기 실패: {str(e)}")
+            return None
+    
+    def save_archive(self, market, interval, arrays):
+        """마감된 캔들만 아카이브에 추가"""
+        try:
+            seconds = INTERVAL_SECONDS[interval]
+            closed = arrays['ts'] < int(time.time()) // seconds * seconds
+            self.archive.append(market, interval, {field: values[closed] for field, values in arrays.items()})
+        except Exception as e:
+            log.log('WA', f"{market} {interval} 아카이브 저장 실패: {str(e)}")
+
+    def get_view(self, market, interval, count=None):
+        """최신 캔들 뷰 (필요하면 증분 갱신)"""
+        buffer = self.get_buffer(market, interval)
+        with buffer.lock:
+            self.update(market, interval)
+            return buffer.view(count)
+
+    def get_dataframe(self, market, interval, count=None):
+        """최신 캔들 DataFrame (지원하지 않는 간격은 전체 조회)"""
+        try:
+            if not self.supports(interval):
+                return self.client.get_ohlcv(interval=interval, count=count or Config.CANDLE_STORE_CAPACITY, market=market)
+            view = self.get_view(market, interval, count)
+            if len(view) == 0:
+                return None
+            return view.to_dataframe()
+        except Exception as e:
+            log.log('WA', f"{market} {interval} 캔들 조회 실패: {str(e)}")
+            return None
+
+    def get_stats(self):
+        """증분 조회 통계"""
+        return {
+            'buffers': len(self.buffers),
+            'requests': self.request_count,
+            'fetched_rows': self.fetched_rows,
+        }
@@ -0,0 +1,436 @@
+import math
+import time
+from collections import deque
+
+from config.config import Config
+from utils.logger import log
+from src.rate_limiter import TokenBucket
+from src.fill_simulator import VOLUME_UNIT, walk_book
+from src.order_tracker import get_executed_funds
+from src.upbit_market import get_tick_size, round_to_tick
+
+FINAL_STATES = ('done', 'cancel')
+
+
+class ClientVenue:
+    """UpbitClient로 거래소(또는 UPBIT_SERVER_URL로 지정한 거래소 에뮬레이터)에 주문하는 실행 대상"""
+    def __init__(self, client):
+        self.client = client
+
+    def now(self):
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+    def get_orderbook(self, market):
+        return self.client.get_orderbook(market)
+
+    def place_limit_order(self, market, side, price, volume, time_in_force=None):
+        return self.client.place_limit_order(market, side, price, volume, time_in_force)
+
+    def cancel_order(self, uuid):
+        return self.client.cancel_order(uuid)
+
+    def get_order(self, uuid):
+        return self.client.get_order(uuid)
+
+    def get_orders(self, uuids):
+        """완료(done/cancel)된 주문만 반환 (없는 주문은 아직 대기 중)"""
+        return self.client.get_orders_by_uuids(uuids)
+
+
+class ChildOrder:
+    """부모 주문에서 나온 지정가/IOC 주문 한 건"""
+    def __init__(self, uuid, price, volume, kind, placed_at):
+        self.uuid = uuid
+        self.price = price
+        self.volume = volume
+        self.kind = kind                # 'passive' 최우선 호가 대기, 'ioc' 즉시 체결 후 잔량 취소
+        self.placed_at = placed_at
+        self.cancel_requested = False   # 취소 요청이 접수됨 (실패하면 다시 요청)
+        self.row = None                 # 완료 시 주문 조회 결과
+        self.funds = 0.0                # 체결 금액 (수수료 제외)
+
+
+class ParentOrder:
+    """분할 실행할 부모 주문 (매수는 funds 원, 매도는 volume 수량)"""
+    def __init__(self, market, side, funds=None, volume=None, style=None, duration=None, slices=None):
+        if (funds is None) == (volume is None):
+            raise ValueError("funds(매수 금액)와 volume(매도 수량) 중 하나만 지정해야 합니다")
+        self.market = market
+        self.side = side
+        self.funds = funds
+        self.volume = volume
+        self.style = style or Config.EXECUTION_STYLE
+        self.duration = Config.EXECUTION_DURATION if duration is None else duration
+        self.slices = 1 if self.style == 'peg' else (slices or Config.EXECUTION_SLICES)
+        self.children = []
+        self.working = None             # 대기 중인 자식 주문 (한 번에 하나)
+        self.executed_volume = 0.0
+        self.executed_funds = 0.0
+        self.fee = 0.0
+        self.cancel_count = 0
+        self.reprice_count = 0
+        self.ioc_count = 0
+
+    @property
+    def total(self):
+        """주문 크기 (매수는 금액, 매도는 수량)"""
+        return self.funds if self.funds is not None else self.volume
+
+    @property
+    def executed(self):
+        """체결된 크기 (total과 같은 단위)"""
+        return self.executed_funds if self.funds is not None else self.executed_volume
+
+    @property
+    def remaining(self):
+        return max(self.total - self.executed, 0.0)
+
+    def get_value(self, amount, price):
+        """total 단위 크기의 원화 가치"""
+        return amount if self.funds is not None else amount * price
+
+    def is_complete(self, price):
+        """남은 크기가 최소 주문 금액 미만이면 더 주문할 수 없으므로 완료"""
+        return self.get_value(self.remaining, price) < Config.MIN_ORDER_AMOUNT
+
+    def to_volume(self, amount, price):
+        """total 단위 크기를 price 기준 주문 수량으로 변환 (최소 단위 내림)"""
+        volume = amount / price if self.funds is not None else amount
+        if volume <= 0:
+            return 0.0
+        return math.floor(volume / VOLUME_UNIT + 1e-6) * VOLUME_UNIT
+
+    def apply(self, child, row, funds):
+        """완료된 자식 주문 체결 결과 반영 (funds는 체결 금액)"""
+        child.row = row
+        child.funds = funds
+        self.executed_volume += float(row.get('executed_volume') or 0)
+        self.executed_funds += funds
+        self.fee += float(row.get('paid_fee') or 0)
+
+
+class ExecutionReport:
+    """부모 주문 실행 결과와 실행 비용 (implementation shortfall)
+
+    shortfall은 도착 시점 중간 가격으로 전량 체결했을 때 대비 실제 비용(수수료 포함)에
+    체결하지 못한 수량의 기회 비용(종료 시점 중간 가격 변화)을 더한 값이다.
+    market_cost는 같은 주문을 도착 시점 호가에 시장가로 냈을 때의 비용 추정치다.
+    """
+    def __init__(self, parent, arrival_price, final_price, market_cost, elapsed):
+        self.market = parent.market
+        self.side = parent.side
+        self.style = parent.style
+        self.arrival_price = arrival_price
+        self.final_price = final_price
+        self.executed_volume = parent.executed_volume
+        self.executed_funds = parent.executed_funds
+        self.fee = parent.fee
+        self.children = [child for child in parent.children if child.row is not None]
+        self.open_children = [child for child in parent.children if child.row is None]  # 완료를 확인하지 못한 자식 주문
+        self.child_count = len(parent.children)
+        self.cancel_count = parent.cancel_count
+        self.reprice_count = parent.reprice_count
+        self.ioc_count = parent.ioc_count
+        self.elapsed = elapsed
+        self.market_cost = market_cost
+
+        notional = parent.total if parent.funds is not None else parent.total * arrival_price
+        unfilled = parent.remaining / arrival_price if parent.funds is not None else parent.remaining
+        self.unfilled_volume = unfilled
+        paper = self.executed_volume * arrival_price
+        if self.side == 'bid':
+            self.shortfall = self.executed_funds + self.fee - paper + unfilled * (final_price - arrival_price)
+        else:
+            self.shortfall = paper - (self.executed_funds - self.fee) + unfilled * (arrival_price - final_price)
+        self.notional = notional
+
+    @property
+    def filled_children(self):
+        """체결 수량이 있는 자식 주문"""
+        return [child for child in self.children if float(child.row.get('executed_volume') or 0) > 0]
+
+    @property
+    def price(self):
+        """평균 체결가"""
+        return self.executed_funds / self.executed_volume if self.executed_volume else 0.0
+
+    @property
+    def shortfall_bps(self):
+        return self.shortfall / self.notional * 10000 if self.notional else 0.0
+
+    @property
+    def market_cost_bps(self):
+        return self.market_cost / self.notional * 10000 if self.notional else 0.0
+
+
+class ExecutionEngine:
+    """부모 주문을 지정가/IOC 자식 주문으로 나눠 실행하는 엔진
+
+    TWAP은 실행 시간을 slices개 구간으로 나눠 구간마다 누적 목표량까지 최우선 호가(스프레드가
+    넓으면 한 호가 안쪽)에 지정가로 대기하고, 이전 구간 목표에 못 미친 양은 IOC로 따라잡는다.
+    peg는 전량을 최우선 호가에 대기시킨다. 대기 주문은 호가가 움직이면 취소 확인 후 새 가격으로
+    다시 내므로 자식 주문은 항상 하나만 살아 있고 초과 체결이 생기지 않는다. 주문 생성/취소는
+    EXECUTION_ORDER_RATE 토큰이 있을 때만 보내고 (없으면 다음 확인으로 미룸), 마감 후 남은 양은
+    가격 한도가 있는 IOC로 처리한다. 실행 대상(venue)은 ClientVenue(거래소/에뮬레이터)나
+    기록된 호가를 재생하는 emulator.orderbook_replay.ReplayVenue를 쓸 수 있다.
+    """
+    def __init__(self, venue, order_rate=None, poll_interval=None, reprice_interval=None,
+                 max_slippage=None, sweep_attempts=None, cancel_timeout=None):
+        self.venue = venue
+        order_rate = order_rate or Config.EXECUTION_ORDER_RATE
+        self.order_bucket = TokenBucket(order_rate, capacity=max(order_rate, 1))
+        self.order_bucket.updated = venue.now()
+        self.poll_interval = Config.EXECUTION_POLL_INTERVAL if poll_interval is None else poll_interval
+        self.reprice_interval = Config.EXECUTION_REPRICE_INTERVAL if reprice_interval is None else reprice_interval
+        self.max_slippage = Config.EXECUTION_MAX_SLIPPAGE if max_slippage is None else max_slippage
+        self.sweep_attempts = sweep_attempts or Config.EXECUTION_SWEEP_ATTEMPTS
+        self.cancel_timeout = Config.EXECUTION_CANCEL_TIMEOUT if cancel_timeout is None else cancel_timeout
+        self.reports = deque(maxlen=Config.ORDER_HISTORY)
+        self.deferred_count = 0         # 주문 토큰이 없어 미룬 횟수
+
+    @staticmethod
+    def get_touch(orderbook):
+        """(최우선 매수 호가, 최우선 매도 호가)"""
+        unit = orderbook['orderbook_units'][0]
+        return unit['bid_price'], unit['ask_price']
+
+    @classmethod
+    def get_mid(cls, orderbook):
+        """중간 가격"""
+        bid, ask = cls.get_touch(orderbook)
+        return (bid + ask) / 2
+
+    def get_peg_price(self, parent, orderbook):
+        """대기 주문 가격 (최우선 호가, 스프레드가 두 호가 이상이면 한 호가 안쪽)"""
+        bid, ask = self.get_touch(orderbook)
+        tick = get_tick_size(bid)
+        if parent.side == 'bid':
+            return round(bid + tick, 8) if ask - bid > tick * 1.5 else bid
+        return round(ask - tick, 8) if ask - bid > tick * 1.5 else ask
+
+    def get_ioc_price(self, parent, orderbook):
+        """IOC 가격 한도 (반대편 최우선 호가에서 max_slippage까지)"""
+        bid, ask = self.get_touch(orderbook)
+        if parent.side == 'bid':
+            return round_to_tick(ask * (1 + self.max_slippage), 'down')
+        return round_to_tick(bid * (1 - self.max_slippage), 'up')
+
+    def get_target(self, parent, elapsed):
+        """경과 시간까지의 누적 목표량 (이전 구간 목표량, 현재 구간 목표량)"""
+        if parent.duration <= 0:
+            return parent.total, parent.total
+        current = min(int(elapsed / parent.duration * parent.slices) + 1, parent.slices)
+        return parent.total * (current - 1) / parent.slices, parent.total * current / parent.slices
+
+    def estimate_market_cost(self, parent, orderbook, mid):
+        """도착 시점 호가에 시장가로 냈을 때 중간 가격 대비 비용 (수수료 포함)"""
+        units = orderbook['orderbook_units']
+        if parent.funds is not None:
+            fills, _ = walk_book(units, 'bid', funds=parent.funds)
+        else:
+            fills, _ = walk_book(units, 'ask', volume=parent.volume)
+        volume = sum(fill_volume for _, fill_volume in fills)
+        funds = sum(price * fill_volume for price, fill_volume in fills)
+        fee = funds * Config.FEE_RATE
+        return (funds - volume * mid if parent.side == 'bid' else volume * mid - funds) + fee
+
+    def get_ioc_volume(self, parent, orderbook, amount, price):
+        """IOC 주문 수량 (매수 금액은 가격 한도까지의 호가를 따라 수량으로 환산)"""
+        if parent.funds is None:
+            return parent.to_volume(amount, price)
+        fills, _ = walk_book(orderbook['orderbook_units'], 'bid', funds=amount, limit=price)
+        return parent.to_volume(sum(fill_volume for _, fill_volume in fills), 1.0) if fills else 0.0
+
+    def place(self, parent, price, volume, kind):
+        """자식 주문 생성 (매수는 가격 한도 기준 최대 지출이 남은 금액을 넘지 않게 수량을 줄임)"""
+        if parent.funds is not None:
+            volume = min(volume, parent.to_volume(parent.remaining, price))
+        if volume * price < Config.MIN_ORDER_AMOUNT:
+            return None
+        result = self.venue.place_limit_order(parent.market, parent.side, price, volume,
+                                              'ioc' if kind == 'ioc' else None)
+        if not result or 'uuid' not in result:
+            return None
+        child = ChildOrder(result['uuid'], price, volume, kind, self.venue.now())
+        parent.children.append(child)
+        parent.working = child
+        if kind == 'ioc':
+            parent.ioc_count += 1
+        return child
+
+    def cancel(self, parent, reprice=False):
+        """대기 중인 자식 주문 취소 요청 (완료는 다음 조회에서 확인)"""
+        child = parent.working
+        if child is None or child.cancel_requested:
+            return
+        result = self.venue.cancel_order(child.uuid)
+        if not result or 'uuid' not in result:
+            # 이미 완료된 주문이면 다음 조회에서 확인되고, 아니면 다음 확인 때 다시 취소
+            return
+        child.cancel_requested = True
+        parent.cancel_count += 1
+        if reprice:
+            parent.reprice_count += 1
+
+    def poll(self, parent):
+        """대기 중인 자식 주문이 완료됐으면 체결 결과 반영"""
+        child = parent.working
+        if child is None:
+            return
+        try:
+            rows = self.venue.get_orders([child.uuid])
+        except Exception as e:
+            log.log('WA', f"{parent.market} 자식 주문 조회 실패: {str(e)}")
+            return
+        for row in rows or []:
+            if row.get('uuid') == child.uuid and row.get('state') in FINAL_STATES:
+                parent.apply(child, row, self.get_funds(parent, child, row))
+                parent.working = None
+
+    def get_funds(self, parent, child, row):
+        """완료된 자식 주문의 체결 금액
+
+        목록 응답에 executed_funds가 없으면 개별 주문을 조회하고, 그래도 확인하지 못하면
+        지정가 x 체결 수량으로 잡는다 (매수는 실제 지출의 상한이므로 남은 금액을 넘겨 사지 않음).
+        """
+        volume = float(row.get('executed_volume') or 0)
+        if not volume:
+            return 0.0
+        try:
+            funds = get_executed_funds(row, self.venue.get_order)
+        except Exception as e:
+            log.log('WA', f"{parent.market} 자식 주문 체결 금액 조회 실패 ({child.uuid}): {str(e)}")
+            funds = None
+        if funds is None:
+            funds = volume * child.price
+            log.log('WA', f"{parent.market} 자식 주문 체결 금액을 확인하지 못해 지정가로 계산: {funds:,.0f}원 ({child.uuid})")
+        return funds
+
+    def settle(self, parent, deadline):
+        """대기 중인 자식 주문 취소(실패하면 재요청) 후 완료 확인, deadline(venue 시각)까지 못 하면 False"""
+        while parent.working is not None:
+            if self.venue.now() >= deadline:
+                log.log('WA', (
+                    f"{parent.market} 자식 주문 완료를 {self.cancel_timeout}초 안에 확인하지 못해 포기: "
+                    f"{parent.working.uuid} (남은 주문은 거래소에서 확인 필요)"
+                ))
+                return False
+            if not parent.working.cancel_requested and parent.working.kind == 'passive' and self.take_token():
+                self.cancel(parent)
+            self.venue.sleep(self.poll_interval / 4)
+            self.poll(parent)
+        return True
+
+    def take_token(self):
+        """주문 생성/취소 토큰 획득 (없으면 False)"""
+        if self.order_bucket.try_take(self.venue.now()):
+            return True
+        self.deferred_count += 1
+        return False
+
+    def step(self, parent, orderbook, elapsed):
+        """호가 한 번 확인할 때의 처리 (대기 주문 재호가, 목표량까지 새 주문)"""
+        peg = self.get_peg_price(parent, orderbook)
+        previous_target, target = self.get_target(parent, elapsed)
+        # 최소 주문 금액 미만의 부족분은 다음 구간 목표에 합쳐 처리
+        behind = parent.slices > 1 and parent.get_value(previous_target - parent.executed, peg) >= Config.MIN_ORDER_AMOUNT
+        child = parent.working
+        if child is not None:
+            if child.cancel_requested or child.kind != 'passive':
+                return
+            moved = abs(child.price - peg) >= get_tick_size(peg) * 0.5
+            if (moved or behind) and self.venue.now() - child.placed_at >= self.reprice_interval and self.take_token():
+                self.cancel(parent, reprice=moved)
+            return
+
+        if behind:
+            # 이전 구간 목표에 못 미친 양은 IOC로 따라잡음
+            price = self.get_ioc_price(parent, orderbook)
+            volume = self.get_ioc_volume(parent, orderbook, previous_target - parent.executed, price)
+        else:
+            price = peg
+            volume = parent.to_volume(target - parent.executed, peg)
+        if volume * price >= Config.MIN_ORDER_AMOUNT and self.take_token():
+            self.place(parent, price, volume, 'ioc' if behind else 'passive')
+
+    def sweep(self, parent):
+        """마감 후 남은 양을 가격 한도가 있는 IOC로 처리"""
+        for _ in range(self.sweep_attempts):
+            orderbook = self.venue.get_orderbook(parent.market)
+            if not orderbook or parent.is_complete(self.get_mid(orderbook)):
+                return
+            price = self.get_ioc_price(parent, orderbook)
+            volume = self.get_ioc_volume(parent, orderbook, parent.remaining, price)
+            if volume * price < Config.MIN_ORDER_AMOUNT:
+                return
+            while not self.take_token():
+                self.venue.sleep(1.0 / self.order_bucket.rate)
+            if self.place(parent, price, volume, 'ioc') is None:
+                return
+            if not self.settle(parent, self.venue.now() + self.cancel_timeout):
+                return
+
+    def execute(self, parent):
+        """부모 주문 실행 후 ExecutionReport 반환"""
+        started = self.venue.now()
+        orderbook = self.venue.get_orderbook(parent.market)
+        if not orderbook or not orderbook.get('orderbook_units'):
+            raise ValueError(f"{parent.market} 호가를 조회할 수 없어 분할 실행할 수 없습니다")
+        arrival = self.get_mid(orderbook)
+        market_cost = self.estimate_market_cost(parent, orderbook, arrival)
+
+        try:
+            while self.venue.now() - started < parent.duration:
+                self.poll(parent)
+                if parent.working is None and parent.is_complete(arrival):
+                    break
+                orderbook = self.venue.get_orderbook(parent.market) or orderbook
+                self.step(parent, orderbook, self.venue.now() - started)
+                self.venue.sleep(self.poll_interval)
+
+            # 마감: 대기 주문 취소 확인 후 남은 양 처리 (확인하지 못하면 초과 체결을 막기 위해 처리하지 않음)
+            if self.settle(parent, self.venue.now() + self.cancel_timeout):
+                self.sweep(parent)
+        except Exception as e:
+            log.detailed_error(f"{parent.market} 분할 실행 중 오류", e)
+            if parent.working is not None and not parent.working.cancel_requested:
+                self.cancel(parent)
+
+        orderbook = self.venue.get_orderbook(parent.market) or orderbook
+        report = ExecutionReport(parent, arrival, self.get_mid(orderbook), market_cost, self.venue.now() - started)
+        self.reports.append(report)
+        self.log_report(report)
+        return report
+
+    def log_report(self, report):
+        """부모 주문 실행 결과 로그"""
+        log.log('TR', (
+            f"{report.market} {'매수' if report.side == 'bid' else '매도'} 분할 실행({report.style}): "
+            f"{report.executed_volume:.8f} @ {report.price:,.4f}원 (도착 중간가 {report.arrival_price:,.4f}원), "
+            f"자식 주문 {report.child_count}건 (IOC {report.ioc_count}, 재호가 {report.reprice_count}), "
+            f"미체결 {report.unfilled_volume:.8f}, {report.elapsed:.1f}초, "
+            f"실행 비용 {report.shortfall:+,.0f}원 ({report.shortfall_bps:+.1f}bp, 시장가 추정 {report.market_cost_bps:+.1f}bp)"
+            + (f", 완료 미확인 자식 주문 {len(report.open_children)}건" if report.open_children else "")
+        ))
+
+    def get_stats(self):
+        """실행 통계 (부모 주문 평균 비용, bp)"""
+        reports = list(self.reports)
+        return {
+            'orders': len(reports),
+            'children': sum(report.child_count for report in reports),
+            'deferred': self.deferred_count,
+            'avg_shortfall_bps': sum(r.shortfall_bps for r in reports) / len(reports) if reports else 0.0,
+            'avg_market_cost_bps': sum(r.market_cost_bps for r in reports) / len(reports) if reports else 0.0,
+        }
+
+    def log_stats(self):
+        """실행 통계 로그"""
+        stats = self.get_stats()
+        log.log('TR', (
+            f"분할 실행: 부모 주문 {stats['orders']}건, 자식 주문 {stats['children']}건 (토큰 대기 {stats['deferred']}회), "
+            f"평균 실행 비용 {stats['avg_shortfall_bps']:+.1f}bp (시장가 추정 {stats['avg_market_cost_bps']:+.1f}bp)"
+        ))
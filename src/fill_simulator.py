@@ -0,0 +1,168 @@
+import threading
+from collections import deque
+
+from config.config import Config
+from utils.logger import log
+
+VOLUME_UNIT = 1e-8  # 업비트 주문 수량 최소 단위
+
+
+def walk_book(units, side, funds=None, volume=None, limit=None):
+    """호가를 최우선 단계부터 따라가며 체결, ([(가격, 수량), ...], 남은 금액 또는 수량) 반환
+
+    side='bid'는 매도 호가를, 'ask'는 매수 호가를 소진한다. funds(원)나 volume(수량) 중 하나로
+    주문 크기를 주고, limit이 있으면 그 가격을 넘는 단계에서 멈춘다. 남은 값은 호가가 부족하거나
+    limit에 막혀 체결하지 못한 부분이다 (전부 체결되면 0). 호가 단계가 15개 안팎이고
+    대부분 첫 단계에서 끝나므로 배열로 바꾸지 않고 원본 호가 목록을 앞에서부터 순회한다.
+    """
+    price_key, size_key = ('ask_price', 'ask_size') if side == 'bid' else ('bid_price', 'bid_size')
+    remaining = funds if funds is not None else volume
+    fills = []
+    done = False
+    for unit in units:
+        price = unit[price_key]
+        if limit is not None and (price > limit if side == 'bid' else price < limit):
+            break
+        size = unit[size_key]
+        if funds is not None:
+            # 금액 기준 주문은 수량을 최소 단위로 내림
+            take = min(size, int(remaining / price / VOLUME_UNIT) * VOLUME_UNIT)
+            remaining -= take * price
+            done = remaining < price * VOLUME_UNIT
+        else:
+            take = min(size, remaining)
+            remaining -= take
+            done = remaining < VOLUME_UNIT
+        if take > 0:
+            fills.append((price, take))
+        if done:
+            break
+    return fills, 0.0 if done else max(remaining, 0.0)
+
+
+class SimulatedFill:
+    """시뮬레이션 주문 한 건의 체결 결과 (rejected가 있으면 체결되지 않음)"""
+    def __init__(self, market, side, best_price, mid_price):
+        self.market = market
+        self.side = side
+        self.best_price = best_price    # 주문 시점 최우선 호가
+        self.mid_price = mid_price      # 주문 시점 중간 가격
+        self.volume = 0.0
+        self.funds = 0.0                # 체결 금액 (수수료 제외)
+        self.fee = 0.0
+        self.levels = 0                 # 소진한 호가 단계 수
+        self.unfilled = 0.0             # 호가가 부족해 남은 금액(매수) 또는 수량(매도)
+        self.rejected = None            # 거절 사유
+
+    @property
+    def filled(self):
+        return self.rejected is None and self.volume > 0
+
+    @property
+    def price(self):
+        """평균 체결가"""
+        return self.funds / self.volume if self.volume else 0.0
+
+    @property
+    def slippage(self):
+        """최우선 호가 대비 불리하게 체결된 비율 (0 이상)"""
+        if not self.volume or not self.best_price:
+            return 0.0
+        if self.side == 'bid':
+            return self.price / self.best_price - 1
+        return 1 - self.price / self.best_price
+
+    @property
+    def cost(self):
+        """중간 가격 대비 비용 (스프레드 + 슬리피지 + 수수료, 원)"""
+        if not self.volume or not self.mid_price:
+            return self.fee
+        if self.side == 'bid':
+            return self.funds - self.volume * self.mid_price + self.fee
+        return self.volume * self.mid_price - self.funds + self.fee
+
+
+class FillSimulator:
+    """호가 스냅샷으로 시장가 주문 체결을 흉내 내는 시뮬레이터
+
+    호가 단계별로 수량을 소진해 평균 체결가를 구하고, 업비트 수수료와 최소 주문 금액을 적용한다.
+    체결마다 최우선 호가 대비 슬리피지와 중간 가격 대비 비용을 기록해 시뮬레이션 손익이
+    실제 주문보다 낙관적으로 나오지 않게 한다. 호가가 없으면 현재가 한 단계로 체결한다.
+    """
+    def __init__(self, fee_rate=None, min_order=None, history=None):
+        self.fee_rate = Config.FEE_RATE if fee_rate is None else fee_rate
+        self.min_order = Config.MIN_ORDER_AMOUNT if min_order is None else min_order
+        self.fills = deque(maxlen=history or Config.ORDER_HISTORY)
+        self.lock = threading.Lock()
+        self.fill_count = 0
+        self.rejected_count = 0
+        self.no_orderbook_count = 0
+        self.total_fee = 0.0
+        self.total_cost = 0.0
+
+    def simulate(self, market, side, orderbook=None, funds=None, volume=None, price=None):
+        """시장가 주문 체결 (매수는 funds 원, 매도는 volume 수량), SimulatedFill 반환"""
+        units = orderbook.get('orderbook_units') if orderbook else None
+        if not units:
+            if not price:
+                fill = SimulatedFill(market, side, None, None)
+                fill.rejected = 'no_price'
+                return self.record(fill)
+            # 호가가 없으면 현재가에 무한 잔량이 있는 것으로 간주
+            self.no_orderbook_count += 1
+            units = [{'ask_price': price, 'bid_price': price, 'ask_size': float('inf'), 'bid_size': float('inf')}]
+
+        best_ask, best_bid = units[0]['ask_price'], units[0]['bid_price']
+        fill = SimulatedFill(market, side, best_ask if side == 'bid' else best_bid, (best_ask + best_bid) / 2)
+        order_value = funds if side == 'bid' else (volume or 0.0) * best_bid
+        if not order_value or order_value < self.min_order:
+            fill.rejected = 'under_min_total'
+            return self.record(fill)
+
+        trades, fill.unfilled = walk_book(units, side, funds=funds if side == 'bid' else None,
+                                          volume=volume if side == 'ask' else None)
+        for trade_price, trade_volume in trades:
+            fill.volume += trade_volume
+            fill.funds += trade_price * trade_volume
+        fill.levels = len(trades)
+        fill.fee = fill.funds * self.fee_rate
+        if not fill.volume:
+            fill.rejected = 'no_liquidity'
+        return self.record(fill)
+
+    def record(self, fill):
+        """체결 결과 기록"""
+        with self.lock:
+            if fill.filled:
+                self.fill_count += 1
+                self.total_fee += fill.fee
+                self.total_cost += fill.cost
+                self.fills.append(fill)
+            else:
+                self.rejected_count += 1
+        return fill
+
+    def get_stats(self):
+        """시뮬레이션 체결 통계"""
+        with self.lock:
+            fills = list(self.fills)
+        slippages = [fill.slippage for fill in fills]
+        return {
+            'fills': self.fill_count,
+            'rejected': self.rejected_count,
+            'no_orderbook': self.no_orderbook_count,
+            'fee': self.total_fee,
+            'cost': self.total_cost,
+            'avg_slippage': sum(slippages) / len(slippages) if slippages else 0.0,
+            'max_slippage': max(slippages) if slippages else 0.0,
+            'multi_level': sum(1 for fill in fills if fill.levels > 1),
+        }
+
+    def log_stats(self):
+        """시뮬레이션 체결 통계 로그"""
+        stats = self.get_stats()
+        log.log('TR', (
+            f"시뮬레이션 체결: {stats['fills']}건 (거절 {stats['rejected']}건, 호가 없음 {stats['no_orderbook']}건), "
+            f"슬리피지 평균 {stats['avg_slippage'] * 10000:.1f}bp / 최대 {stats['max_slippage'] * 10000:.1f}bp, "
+            f"여러 호가 체결 {stats['multi_level']}건, 수수료 {stats['fee']:,.0f}원, 중간가 대비 비용 {stats['cost']:,.0f}원"
+        ))
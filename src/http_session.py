@@ -0,0 +1,160 @@
+import hashlib
+import threading
+import uuid
+from urllib.parse import urlencode, unquote
+
+import jwt
+import requests
+from requests.adapters import HTTPAdapter
+
+from config.config import Config
+from utils.logger import log
+from src.rate_limiter import rate_limiter as shared_rate_limiter
+
+
+class UpbitAPIError(Exception):
+    """업비트 API 오류 응답"""
+    def __init__(self, status_code, name=None, message=None):
+        self.status_code = status_code
+        self.name = name
+        self.message = message
+        super().__init__(f"[{status_code}] {name}: {message}")
+
+
+class UpbitSession:
+    """업비트 REST API 공용 HTTP 세션 (keep-alive 커넥션 풀)"""
+    def __init__(self, access_key=None, secret_key=None, server_url=None,
+                 pool_connections=None, pool_maxsize=None, pool_block=None, timeout=None,
+                 rate_limiter=None):
+        self.access_key = access_key if access_key is not None else Config.UPBIT_ACCESS_KEY
+        self.secret_key = secret_key if secret_key is not None else Config.UPBIT_SECRET_KEY
+        self.server_url = (server_url or Config.UPBIT_SERVER_URL).rstrip('/')
+        self.timeout = timeout or Config.HTTP_TIMEOUT
+        self.rate_limiter = rate_limiter or shared_rate_limiter
+
+        # 호스트별 커넥션 풀 설정
+        # pool_connections: 캐시할 호스트 풀 개수, pool_maxsize: 호스트당 최대 커넥션 수
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_connections or Config.HTTP_POOL_CONNECTIONS,
+            pool_maxsize=pool_maxsize or Config.HTTP_POOL_MAXSIZE,
+            pool_block=Config.HTTP_POOL_BLOCK if pool_block is None else pool_block,
+            max_retries=0
+        )
+        self.session = requests.Session()
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+        self.session.headers.update({'Accept': 'application/json'})
+
+        self.lock = threading.Lock()
+        self.request_count = 0
+        self.error_count = 0
+
+    def create_auth_headers(self, params=None):
+        """JWT 인증 헤더 생성"""
+        payload = {
+            'access_key': self.access_key,
+            'nonce': str(uuid.uuid4()),
+        }
+
+        # 파라미터가 있으면 query_hash 추가
+        if params:
+            query_string = unquote(urlencode(params, doseq=True)).encode('utf-8')
+            payload['query_hash'] = hashlib.sha512(query_string).hexdigest()
+            payload['query_hash_alg'] = 'SHA512'
+
+        jwt_token = jwt.encode(payload, self.secret_key, algorithm='HS256')
+        return {'Authorization': f'Bearer {jwt_token}'}
+
+    def request(self, method, path, params=None, auth=False, limit=True):
+        """API 요청 후 JSON 응답 반환 (실패 시 UpbitAPIError 발생)
+
+        limit=False면 호출자가 이미 요청 제한 토큰을 획득한 것으로 간주
+        """
+        url = self.server_url + path
+        group = self.rate_limiter.group_for(method, path, auth)
+
+        for attempt in range(Config.RATE_LIMIT_RETRIES + 1):
+            if limit or attempt > 0:
+                self.rate_limiter.acquire(group)
+
+            # 인증 토큰은 nonce가 매번 달라야 하므로 요청마다 생성
+            headers = self.create_auth_headers(params) if auth else None
+
+            # GET/DELETE는 쿼리스트링, POST는 JSON 바디로 전송
+            if method in ('GET', 'DELETE'):
+                response = self.session.request(method, url, params=params, headers=headers, timeout=self.timeout)
+            else:
+                response = self.session.request(method, url, json=params, headers=headers, timeout=self.timeout)
+
+            with self.lock:
+                self.request_count += 1
+                if response.status_code >= 400:
+                    self.error_count += 1
+
+            # 서버가 알려준 남은 요청 수로 버킷 재동기화
+            self.rate_limiter.update_from_header(response.headers.get('Remaining-Req'), group)
+
+            if response.status_code != 429:
+                break
+            self.rate_limiter.throttle(group)
+
+        if response.status_code >= 400:
+            name, message = None, response.text
+            try:
+                error = response.json().get('error', {})
+                name, message = error.get('name'), error.get('message')
+            except (ValueError, AttributeError):
+                pass
+            raise UpbitAPIError(response.status_code, name, message)
+
+        return response.json()
+
+    def get(self, path, params=None, auth=False, limit=True):
+        """GET 요청"""
+        return self.request('GET', path, params=params, auth=auth, limit=limit)
+
+    def post(self, path, params=None, auth=True, limit=True):
+        """POST 요청"""
+        return self.request('POST', path, params=params, auth=auth, limit=limit)
+
+    def delete(self, path, params=None, auth=True, limit=True):
+        """DELETE 요청"""
+        return self.request('DELETE', path, params=params, auth=auth, limit=limit)
+
+    def get_stats(self):
+        """커넥션 재사용 통계"""
+        connections = 0
+        pool_requests = 0
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            connections += pool.num_connections
+            pool_requests += pool.num_requests
+
+        reused = max(pool_requests - connections, 0)
+        return {
+            'requests': self.request_count,
+            'errors': self.error_count,
+            'connections': connections,
+            'reused': reused,
+            'reuse_rate': reused / pool_requests if pool_requests else 0.0,
+        }
+
+    def log_stats(self):
+        """커넥션 재사용 및 요청 제한 통계 로깅"""
+        stats = self.get_stats()
+        log.log('TR', f"HTTP 요청: {stats['requests']}회, 신규 연결: {stats['connections']}회, "
+                      f"재사용: {stats['reused']}회 ({stats['reuse_rate']*100:.1f}%)")
+        limit_stats = self.rate_limiter.get_stats()
+        log.log('TR', f"요청 제한 대기: {limit_stats['waits']}회 ({limit_stats['wait_time']:.1f}초), "
+                      f"429 응답: {limit_stats['throttled']}회")
+
+    def close(self):
+        """세션 종료"""
+        self.session.close()
+
+
+# 전역 세션 인스턴스 생성 (모든 클라이언트가 공유)
+upbit_session = UpbitSession()
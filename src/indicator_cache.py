@@ -0,0 +1,133 @@
+import pickle
+import threading
+from collections import OrderedDict
+
+from config.config import Config
+from utils.logger import log
+from src.candle_store import CANDLE_FIELDS
+
+
+class IndicatorEntry:
+    """마감 캔들까지 반영된 지표 계산기와 마지막 형성 중 캔들 결과"""
+    def __init__(self, engine, size):
+        self.engine = engine
+        self.size = size
+        self.forming = None   # 마지막으로 계산한 형성 중 캔들 (시각, OHLCV)
+        self.values = None
+
+
+class IndicatorCache:
+    """(마켓, 간격, 마지막 마감 캔들 시각, 파라미터)별 지표 결과 LRU 캐시
+
+    마감 캔들이 그대로면 저장된 계산기에 형성 중인 캔들만 O(1)로 다시 반영하고,
+    형성 중인 캔들도 같으면 저장된 결과를 그대로 돌려준다.
+    새 캔들이 마감되면 직전 항목의 계산기를 새 캔들만큼 진행시켜 재사용한다.
+    항목 수와 메모리 사용량(계산기 직렬화 크기 기준)을 넘으면 오래 안 쓴 항목부터 제거한다.
+    """
+    def __init__(self, max_entries=None, max_bytes=None):
+        self.max_entries = max_entries or Config.INDICATOR_CACHE_MAX_ENTRIES
+        self.max_bytes = max_bytes or Config.INDICATOR_CACHE_MAX_BYTES
+        self.entries = OrderedDict()
+        self.latest = {}  # (마켓, 간격, 파라미터) -> 가장 최근 키
+        self.bytes = 0
+        self.lock = threading.Lock()
+        self.hit_count = 0
+        self.miss_count = 0
+        self.advance_count = 0    # 직전 마감 상태에서 이어서 계산한 횟수
+        self.value_hit_count = 0  # 형성 중 캔들까지 같아 계산 없이 반환한 횟수
+        self.eviction_count = 0
+
+    @staticmethod
+    def estimate_size(engine):
+        """계산기 메모리 사용량 추정 (직렬화 크기)"""
+        return len(pickle.dumps(engine, pickle.HIGHEST_PROTOCOL))
+
+    def get_indicators(self, market, interval, params, arrays, build_engine):
+        """과거순 캔들 배열(마지막은 형성 중)로 최신 지표 계산
+
+        params는 계산기 구성을 나타내는 해시 가능한 값, build_engine은 새 계산기 생성 함수.
+        """
+        ts = arrays['ts']
+        if len(ts) == 0:
+            return {}
+        closed_ts = int(ts[-2]) if len(ts) > 1 else None
+        forming = tuple(arrays[field][-1].item() for field in CANDLE_FIELDS)
+        key = (market, interval, closed_ts, params)
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hit_count += 1
+                if entry.forming == forming:
+                    self.value_hit_count += 1
+                    return dict(entry.values)
+            else:
+                self.miss_count += 1
+                entry = self.create_entry(key, build_engine)
+
+            entry.values = entry.engine.sync(arrays)
+            entry.forming = forming
+            return dict(entry.values)
+
+    def create_entry(self, key, build_engine):
+        """새 마감 시각 항목 생성 (직전 항목이 있으면 그 계산기를 넘겨받음)"""
+        market, interval, _, params = key
+        series = (market, interval, params)
+        previous = self.entries.pop(self.latest.get(series), None)
+        if previous is not None:
+            self.bytes -= previous.size
+            engine = previous.engine
+            self.advance_count += 1
+        else:
+            engine = build_engine()
+
+        entry = IndicatorEntry(engine, self.estimate_size(engine))
+        self.entries[key] = entry
+        self.latest[series] = key
+        self.bytes += entry.size
+        self.evict()
+        return entry
+
+    def evict(self):
+        """항목 수/메모리 한도를 넘으면 오래 안 쓴 항목부터 제거"""
+        while self.entries and (len(self.entries) > self.max_entries or self.bytes > self.max_bytes):
+            key, entry = self.entries.popitem(last=False)
+            self.bytes -= entry.size
+            market, interval, _, params = key
+            if self.latest.get((market, interval, params)) == key:
+                del self.latest[(market, interval, params)]
+            self.eviction_count += 1
+
+    def invalidate(self, market=None):
+        """항목 제거 (market이 없으면 전체)"""
+        with self.lock:
+            for key in [key for key in self.entries if market is None or key[0] == market]:
+                self.bytes -= self.entries.pop(key).size
+                self.latest.pop((key[0], key[1], key[3]), None)
+
+    def get_stats(self):
+        """캐시 통계"""
+        lookups = self.hit_count + self.miss_count
+        return {
+            'entries': len(self.entries),
+            'bytes': self.bytes,
+            'hits': self.hit_count,
+            'misses': self.miss_count,
+            'value_hits': self.value_hit_count,
+            'advanced': self.advance_count,
+            'evictions': self.eviction_count,
+            'hit_rate': self.hit_count / lookups if lookups else 0.0,
+        }
+
+    def log_stats(self):
+        """캐시 통계 로그"""
+        stats = self.get_stats()
+        log.log('TR', (
+            f"지표 캐시: 항목 {stats['entries']}개 ({stats['bytes'] / 1024:.1f}KB), "
+            f"적중 {stats['hits']}회 (계산 생략 {stats['value_hits']}회), 미적중 {stats['misses']}회, "
+            f"이어서 계산 {stats['advanced']}회, 제거 {stats['evictions']}회, 적중률 {stats['hit_rate']:.1%}"
+        ))
+
+
+indicator_cache = IndicatorCache()
@@ -0,0 +1,209 @@
+from functools import lru_cache
+
+import numpy as np
+
+from src.candle_store import CANDLE_FIELDS
+
+# 모든 함수는 (마켓 수 × 캔들 수) 2차원 float 배열을 받아 같은 모양의 배열을 반환한다.
+# 캔들은 과거순이고, 이력이 짧은 마켓은 왼쪽을 nan으로 채운다 (stack_candles).
+# 창이 다 차지 않은 구간은 nan이며 값은 기존 pandas 계산(rolling/ewm)과 같다.
+
+SCAN_BLOCK = 64  # 감쇠 누적(decay_scan) 블록 크기, 블록 내부만 행렬 곱으로 계산
+
+
+def stack_candles(views, count=None):
+    """마켓별 캔들 뷰(과거순 배열)를 오른쪽 정렬된 2차원 배열로 합침 (짧은 이력은 왼쪽 nan)"""
+    views = list(views)
+    if count is None:
+        count = max((len(view['ts']) for view in views), default=0)
+    stacked = {}
+    for field in CANDLE_FIELDS:
+        dtype = np.int64 if field == 'ts' else np.float64
+        fill = 0 if field == 'ts' else np.nan
+        stacked[field] = np.full((len(views), count), fill, dtype=dtype)
+    for i, view in enumerate(views):
+        size = min(len(view['ts']), count)
+        if size == 0:
+            continue
+        for field in CANDLE_FIELDS:
+            stacked[field][i, count - size:] = view[field][-size:]
+    return stacked
+
+
+def shift(values, periods=1):
+    """시간 축으로 periods만큼 뒤로 민 배열 (앞은 nan)"""
+    shifted = np.full_like(values, np.nan)
+    shifted[:, periods:] = values[:, :-periods]
+    return shifted
+
+
+def window_sum(values, period):
+    """길이 period 창의 합 (누적합 차분), 창에 nan이 있거나 창이 차지 않았으면 nan"""
+    missing = np.isnan(values)
+    filled = np.where(missing, 0.0, values)
+    total = np.cumsum(filled, axis=1)
+    gaps = np.cumsum(missing, axis=1)
+    total[:, period:] -= total[:, :-period].copy()
+    gaps[:, period:] -= gaps[:, :-period].copy()
+    total[gaps > 0] = np.nan
+    total[:, :period - 1] = np.nan
+    return total
+
+
+def sma(values, period):
+    """단순 이동평균"""
+    return window_sum(values, period) / period
+
+
+def rolling_std(values, period, ddof=1):
+    """이동 표준편차 (pandas rolling().std()와 같은 ddof=1)
+
+    제곱합 차분의 자릿수 손실을 줄이기 위해 마켓별 평균을 뺀 값으로 계산한다.
+    (이력이 없는 마켓은 모두 nan이므로 nanmean 대신 직접 나눠 경고 없이 nan으로 둔다)
+    """
+    counts = np.sum(~np.isnan(values), axis=1, keepdims=True)
+    totals = np.nansum(values, axis=1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        centered = values - totals / counts
+    total = window_sum(centered, period)
+    squares = window_sum(centered * centered, period)
+    variance = (squares - total * total / period) / (period - ddof)
+    return np.sqrt(np.maximum(variance, 0.0))
+
+
+@lru_cache(maxsize=8)
+def block_weights(size, decay):
+    """블록 내 감쇠 가중치 행렬 W[i, t] = decay^(t-i) (i <= t), 그 외 0 (같은 크기/감쇠는 재사용)"""
+    lags = np.arange(size)[:, None] - np.arange(size)[None, :]
+    weights = np.where(lags >= 0, decay ** np.maximum(lags, 0), 0.0).T.copy()
+    weights.flags.writeable = False
+    return weights
+
+
+def decay_scan(values, decay, block=SCAN_BLOCK):
+    """감쇠 누적 y[t] = decay * y[t-1] + values[t] (y[-1] = 0)
+
+    캔들 수 n에 대해 n×n 행렬 대신 block 길이 구간마다 block×block 행렬 곱으로 계산하고
+    이전 구간의 마지막 값을 감쇠시켜 더한다 (모든 마켓 동시, 계산량은 n에 선형).
+    """
+    weights = block_weights(block, decay)
+    result = np.empty(values.shape, dtype=np.float64)
+    carry = np.zeros(values.shape[0])
+    for start in range(0, values.shape[1], block):
+        chunk = values[:, start:start + block]
+        width = chunk.shape[1]
+        scanned = chunk @ weights[:width, :width] + carry[:, None] * decay ** np.arange(1, width + 1)
+        result[:, start:start + width] = scanned
+        carry = scanned[:, -1]
+    return result
+
+
+def ema(values, span):
+    """지수 이동평균 (pandas ewm(span=n) 기본값 adjust=True), 가중합과 가중치 합을 감쇠 누적으로 계산"""
+    decay = 1 - 2 / (span + 1)
+    valid = ~np.isnan(values)
+    numerator = decay_scan(np.where(valid, values, 0.0), decay)
+    denominator = decay_scan(valid.astype(np.float64), decay)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result = numerator / denominator
+    result[denominator == 0] = np.nan
+    return result
+
+
+def wilder(values, period):
+    """Wilder 평활 (마켓별 첫 유효값부터 period개 단순 평균 후 (이전*(n-1) + 값) / n)
+
+    시드 위치에 단순 평균, 이후에 값/n을 두고 감쇠 누적으로 계산한다 (캔들별 루프 없음).
+    """
+    valid = ~np.isnan(values)
+    seen = np.cumsum(valid, axis=1)  # 마켓별 지금까지 유효값 개수
+    seeded = seen == period
+    seeded &= np.cumsum(seeded, axis=1) == 1  # 시드 위치 (마켓당 하나)
+    after = (seen > period) & ~seeded
+    started = np.cumsum(seeded, axis=1) > 0
+
+    inputs = np.where(seeded, sma(values, period), 0.0)
+    inputs = np.where(after & valid, values / period, inputs)
+    inputs[np.isnan(inputs)] = 0.0
+    result = decay_scan(inputs, 1 - 1 / period)
+
+    # 시드 이후 nan이 나오면 그 뒤는 nan (재귀 계산과 동일)
+    broken = np.cumsum(started & ~valid, axis=1) > 0
+    result[~started | broken] = np.nan
+    return result
+
+
+def average(values, period, use_wilder=False):
+    """단순 이동평균 또는 Wilder 평활"""
+    return wilder(values, period) if use_wilder else sma(values, period)
+
+
+def rsi(close, period=14, use_wilder=False):
+    """RSI (use_wilder=False면 기존 전략과 같은 단순 이동평균 방식)"""
+    delta = close - shift(close)
+    # 첫 캔들은 pandas diff().where()와 같이 상승/하락폭 0
+    first = np.isnan(delta) & ~np.isnan(close)
+    delta[first] = 0.0
+    gain = np.where(delta > 0, delta, np.where(np.isnan(delta), np.nan, 0.0))
+    loss = np.where(delta < 0, -delta, np.where(np.isnan(delta), np.nan, 0.0))
+    avg_gain = average(gain, period, use_wilder)
+    avg_loss = average(loss, period, use_wilder)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+def bollinger(close, period=20, width=2.0):
+    """볼린저 밴드 (중앙, 상단, 하단, 표준편차)"""
+    mid = sma(close, period)
+    std = rolling_std(close, period)
+    return mid, mid + std * width, mid - std * width, std
+
+
+def macd(close, fast=12, slow=26, signal=9):
+    """MACD와 시그널선"""
+    line = ema(close, fast) - ema(close, slow)
+    return line, ema(line, signal)
+
+
+def true_range(high, low, close):
+    """True Range (직전 종가가 없으면 고가-저가)"""
+    prev_close = shift(close)
+    ranges = np.fmax(np.abs(high - prev_close), np.abs(low - prev_close))
+    return np.fmax(high - low, ranges)
+
+
+def atr(high, low, close, period=14, use_wilder=False):
+    """Average True Range"""
+    return average(true_range(high, low, close), period, use_wilder)
+
+
+def directional_index(high, low, close, period=14, use_wilder=False):
+    """DI+, DI-, ADX (직전 캔들이 없는 첫 캔들은 제외)"""
+    up = high - shift(high)
+    down = shift(low) - low
+    dm_plus = np.where((up > 0) & (up >= down), up, 0.0)
+    dm_minus = np.where((down > 0) & (down >= up), down, 0.0)
+    missing = np.isnan(up)
+    dm_plus[missing] = np.nan
+    dm_minus[missing] = np.nan
+    tr = true_range(high, low, close)
+    tr[missing] = np.nan
+
+    smoothed_tr = average(tr, period, use_wilder)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        di_plus = 100 * average(dm_plus, period, use_wilder) / smoothed_tr
+        di_minus = 100 * average(dm_minus, period, use_wilder) / smoothed_tr
+        dx = 100 * np.abs(di_plus - di_minus) / (di_plus + di_minus)
+    return di_plus, di_minus, average(dx, period, use_wilder)
+
+
+def rate_of_change(close, period=12):
+    """변화율 (%)"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (close / shift(close, period) - 1) * 100
+
+
+def volume_change(volume):
+    """직전 캔들 대비 거래량 변화율"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return volume / shift(volume) - 1
@@ -0,0 +1,55 @@
+from utils.logger import log
+
+
+class MarketDataContext:
+    """한 틱 동안 (마켓, 간격)별 캔들을 한 번만 조회해 여러 분석 메서드가 나눠 쓰는 컨텍스트
+
+    require()로 필요한 개수를 미리 선언하면 가장 큰 개수로 한 번 조회하고,
+    get()은 그 중 최근 count개만 잘라서 돌려준다.
+    """
+    def __init__(self, fetch_func):
+        self.fetch_func = fetch_func  # (market, interval, count) -> DataFrame
+        self.requirements = {}
+        self.frames = {}
+        self.fetched = {}  # (마켓, 간격)별 조회한 개수
+        self.fetch_count = 0
+        self.hit_count = 0
+
+    def require(self, market, interval, count):
+        """필요한 캔들 개수 선언 (같은 간격은 최대 개수로 병합)"""
+        key = (market, interval)
+        self.requirements[key] = max(self.requirements.get(key, 0), count)
+
+    def fetch(self, market, interval, count):
+        """캔들 조회 후 저장"""
+        key = (market, interval)
+        count = max(count, self.requirements.get(key, 0))
+        df = self.fetch_func(market, interval, count)
+        self.frames[key] = df
+        self.fetched[key] = count
+        self.fetch_count += 1
+        return df
+
+    def prefetch(self):
+        """선언된 모든 캔들을 미리 조회"""
+        for (market, interval), count in self.requirements.items():
+            if (market, interval) not in self.fetched:
+                try:
+                    self.fetch(market, interval, count)
+                except Exception as e:
+                    log.log('WA', f"{market} {interval} 캔들 선조회 실패: {str(e)}")
+
+    def get(self, market, interval, count):
+        """최근 count개 캔들 (이미 조회한 데이터가 충분하면 재사용)
+
+        분석 메서드가 보조 컬럼을 추가하므로 잘라낸 구간은 복사해서 넘긴다.
+        """
+        key = (market, interval)
+        if count > self.fetched.get(key, 0):
+            df = self.fetch(market, interval, count)
+        else:
+            df = self.frames.get(key)
+            self.hit_count += 1
+        if df is None:
+            return None
+        return df.iloc[-count:].copy()
@@ -0,0 +1,222 @@
+import asyncio
+import json
+import threading
+import time
+import uuid
+from collections import deque
+
+import websockets
+
+from config.config import Config
+from utils.logger import log
+
+FEED_TYPES = ('ticker', 'trade', 'orderbook')
+
+
+class MarketDataStore:
+    """웹소켓으로 수신한 마켓별 최신 시세/체결/호가 저장소 (조회 시 네트워크 비용 없음)"""
+    def __init__(self, trade_history=None):
+        self.trade_history = trade_history or Config.FEED_TRADE_HISTORY
+        self.tickers = {}
+        self.orderbooks = {}
+        self.trades = {}
+        self.updated = {}
+        self.lock = threading.Lock()
+        self.message_count = 0
+
+    def handle_message(self, message):
+        """수신 메시지(JSON bytes/str)를 파싱해 최신 상태 갱신"""
+        if isinstance(message, bytes):
+            message = message.decode('utf-8')
+        data = json.loads(message)
+        if not isinstance(data, dict):
+            return
+
+        data_type = data.get('type')
+        market = data.get('code')
+        if market is None or data_type not in FEED_TYPES:
+            return
+
+        with self.lock:
+            if data_type == 'ticker':
+                self.tickers[market] = data
+            elif data_type == 'orderbook':
+                self.orderbooks[market] = data
+            else:
+                if market not in self.trades:
+                    self.trades[market] = deque(maxlen=self.trade_history)
+                self.trades[market].append(data)
+            self.updated[(market, data_type)] = time.monotonic()
+            self.message_count += 1
+
+    def get_ticker(self, market):
+        """최신 시세"""
+        return self.tickers.get(market)
+
+    def get_price(self, market):
+        """최신 체결가 (수신 전이면 None)"""
+        ticker = self.tickers.get(market)
+        return ticker.get('trade_price') if ticker else None
+
+    def get_orderbook(self, market):
+        """최신 호가"""
+        return self.orderbooks.get(market)
+
+    def get_trades(self, market):
+        """최근 체결 목록 (과거순)"""
+        with self.lock:
+            return list(self.trades.get(market, ()))
+
+    def get_age(self, market, data_type='ticker'):
+        """마지막 수신 후 경과 시간 (초, 수신 전이면 None)"""
+        updated = self.updated.get((market, data_type))
+        return None if updated is None else time.monotonic() - updated
+
+    def clear(self):
+        """저장된 상태 초기화"""
+        with self.lock:
+            self.tickers.clear()
+            self.orderbooks.clear()
+            self.trades.clear()
+            self.updated.clear()
+
+
+class MarketFeed:
+    """업비트 웹소켓 실시간 시세 수신기 (자동 재연결 및 재구독)"""
+    def __init__(self, markets=None, url=None, store=None, types=FEED_TYPES, price_max_age=None, orderbook_max_age=None):
+        self.url = url or Config.UPBIT_WEBSOCKET_URL
+        self.price_max_age = Config.FEED_PRICE_MAX_AGE if price_max_age is None else price_max_age
+        self.orderbook_max_age = Config.FEED_ORDERBOOK_MAX_AGE if orderbook_max_age is None else orderbook_max_age
+        self.store = store or MarketDataStore()
+        self.markets = set(markets or [])
+        self.types = tuple(types)
+        self.loop = None
+        self.thread = None
+        self.websocket = None
+        self.running = False
+        self.connected = threading.Event()
+        self.connect_count = 0
+        self.reconnect_count = 0
+        self.stale_count = 0
+
+    def start(self):
+        """백그라운드 스레드에서 수신 시작"""
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self.run_loop, name='market-feed', daemon=True)
+        self.thread.start()
+        log.log('TR', f"실시간 시세 수신 시작: {len(self.markets)}개 마켓 ({self.url})")
+
+    def stop(self, timeout=5):
+        """수신 중지 및 연결 종료"""
+        self.running = False
+        if self.loop is not None and self.websocket is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(self.websocket.close(), self.loop)
+            except RuntimeError:
+                pass
+        if self.thread is not None:
+            self.thread.join(timeout)
+        self.connected.clear()
+        log.log('TR', (
+            f"실시간 시세 수신 종료 (수신 메시지: {self.store.message_count}개, 재연결: {self.reconnect_count}회, "
+            f"오래된 시세로 REST 조회: {self.stale_count}회)"
+        ))
+
+    def wait_connected(self, timeout=None):
+        """연결될 때까지 대기"""
+        return self.connected.wait(timeout)
+
+    def is_connected(self):
+        """현재 연결 상태"""
+        return self.connected.is_set()
+
+    def subscribe(self, markets):
+        """구독 마켓 추가 (연결 중이면 즉시 재구독)"""
+        new_markets = set(markets) - self.markets
+        if not new_markets:
+            return
+        self.markets |= new_markets
+        if self.loop is not None and self.is_connected():
+            asyncio.run_coroutine_threadsafe(self.send_subscription(), self.loop)
+
+    def is_fresh(self, market, data_type, max_age):
+        """연결이 살아있고 구독 중인 마켓의 data_type을 max_age초 안에 수신했는지 확인
+
+        연결이 유지돼도 구독이 조용히 끊기거나 거래가 없으면 마지막 값이 그대로 남으므로
+        오래된 값은 쓰지 않고 호출 측이 REST로 조회하게 한다.
+        """
+        if market not in self.markets or not self.is_connected():
+            return False
+        age = self.store.get_age(market, data_type)
+        if age is None:
+            return False
+        if age > max_age:
+            self.stale_count += 1
+            return False
+        return True
+
+    def get_price(self, market):
+        """최근 FEED_PRICE_MAX_AGE초 안에 수신한 최신 체결가 (아니면 None)"""
+        if not self.is_fresh(market, 'ticker', self.price_max_age):
+            return None
+        return self.store.get_price(market)
+
+    def get_orderbook(self, market):
+        """최근 FEED_ORDERBOOK_MAX_AGE초 안에 수신한 최신 호가 (아니면 None)"""
+        if not self.is_fresh(market, 'orderbook', self.orderbook_max_age):
+            return None
+        return self.store.get_orderbook(market)
+
+    def build_subscription(self):
+        """구독 요청 메시지 생성"""
+        codes = sorted(self.markets)
+        request = [{'ticket': str(uuid.uuid4())}]
+        request.extend({'type': data_type, 'codes': codes} for data_type in self.types)
+        return json.dumps(request)
+
+    async def send_subscription(self):
+        """현재 구독 목록 전송"""
+        if self.websocket is not None and self.markets:
+            await self.websocket.send(self.build_subscription())
+
+    def run_loop(self):
+        """스레드 진입점"""
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self.run())
+        finally:
+            self.loop.close()
+
+    async def run(self):
+        """연결 유지 루프 (끊기면 지수 백오프 후 재연결)"""
+        delay = Config.FEED_RECONNECT_MIN_DELAY
+        while self.running:
+            try:
+                async with websockets.connect(self.url, ping_interval=Config.FEED_PING_INTERVAL) as websocket:
+                    self.websocket = websocket
+                    await self.send_subscription()
+                    self.connected.set()
+                    self.connect_count += 1
+                    delay = Config.FEED_RECONNECT_MIN_DELAY
+                    log.log('TR', f"웹소켓 연결 완료 ({self.connect_count}번째)")
+
+                    async for message in websocket:
+                        try:
+                            self.store.handle_message(message)
+                        except (ValueError, TypeError) as e:
+                            log.log('WA', f"웹소켓 메시지 처리 실패: {str(e)}")
+            except Exception as e:
+                if self.running:
+                    log.log('WA', f"웹소켓 연결 끊김: {str(e)}")
+            finally:
+                self.connected.clear()
+                self.websocket = None
+
+            if self.running:
+                self.reconnect_count += 1
+                log.log('TR', f"웹소켓 재연결 대기: {delay:.1f}초")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, Config.FEED_RECONNECT_MAX_DELAY)
@@ -0,0 +1,129 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from config.config import Config
+from utils.logger import log
+from src.scheduler import next_boundary, to_monotonic
+
+
+class MarketWorker:
+    """마켓 하나의 실행 주기와 지연 기록 (실행 시각은 interval초 경계 + SCHEDULE_OFFSET)"""
+    def __init__(self, key, interval):
+        self.key = key
+        self.interval = interval
+        self.next_run = to_monotonic(next_boundary(interval, Config.SCHEDULE_OFFSET))
+        self.running = False
+        self.waiting = False     # 작업자가 모두 사용 중이라 대기 중
+        self.run_count = 0
+        self.error_count = 0
+        self.overrun_count = 0   # 이전 실행이 끝나지 않아 건너뛴 주기 수
+        self.deferred_count = 0  # 작업자가 모두 사용 중이라 늦게 시작한 횟수
+        self.latencies = deque(maxlen=Config.MARKET_WORKER_LATENCY_WINDOW)
+        self.jitters = deque(maxlen=Config.MARKET_WORKER_LATENCY_WINDOW)  # 예정 시각 대비 시작 지연
+
+    def get_stats(self):
+        """실행 지연 통계 (초)"""
+        latencies = np.asarray(self.latencies, dtype=float)
+        jitters = np.asarray(self.jitters, dtype=float)
+        return {
+            'runs': self.run_count,
+            'errors': self.error_count,
+            'overruns': self.overrun_count,
+            'deferred': self.deferred_count,
+            'avg': float(latencies.mean()) if len(latencies) else 0.0,
+            'p95': float(np.percentile(latencies, 95)) if len(latencies) else 0.0,
+            'max': float(latencies.max()) if len(latencies) else 0.0,
+            'jitter_avg': float(jitters.mean()) if len(jitters) else 0.0,
+            'jitter_max': float(jitters.max()) if len(jitters) else 0.0,
+        }
+
+
+class MarketWorkerPool:
+    """마켓별로 각자의 주기에 따라 작업을 실행하는 작업자 풀
+
+    동시에 실행하는 마켓 수는 max_workers로 제한하고, 실행 중인 마켓의 다음 주기가 오면
+    쌓아 두지 않고 건너뛴다. 작업자가 모두 사용 중이면 가장 오래 기다린 마켓부터 시작한다.
+    API 요청 속도는 공용 세션의 요청 제한기가 맞추므로 요청이 몰리면 작업자가 그만큼 대기한다.
+    """
+    def __init__(self, run_market, max_workers=None):
+        self.run_market = run_market
+        self.max_workers = max_workers or Config.MARKET_WORKERS
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='market-worker')
+        self.workers = {}
+        self.lock = threading.Lock()
+        self.active = 0
+
+    def add(self, key, interval=None):
+        """마켓 추가 (interval초마다 실행)"""
+        self.workers[key] = MarketWorker(key, interval or Config.TRADE_INTERVAL)
+
+    def run(self, worker, scheduled):
+        """마켓 작업 실행 후 지연 기록"""
+        started = time.monotonic()
+        worker.jitters.append(started - scheduled)
+        try:
+            self.run_market(worker.key)
+        except Exception as e:
+            worker.error_count += 1
+            log.detailed_error(f"{worker.key} 작업 중 오류", e)
+        finally:
+            worker.latencies.append(time.monotonic() - started)
+            worker.run_count += 1
+            with self.lock:
+                worker.running = False
+                self.active -= 1
+
+    def dispatch(self):
+        """실행할 때가 된 마켓을 작업자에 배정, 다음 배정까지 남은 시간(초) 반환"""
+        now = time.monotonic()
+        due = sorted((w for w in self.workers.values() if w.next_run <= now), key=lambda w: w.next_run)
+        for i, worker in enumerate(due):
+            with self.lock:
+                if worker.running:
+                    # 이전 실행이 아직 끝나지 않음: 이번 주기는 건너뜀
+                    worker.overrun_count += 1
+                    worker.next_run += (int((now - worker.next_run) // worker.interval) + 1) * worker.interval
+                    continue
+                if self.active >= self.max_workers:
+                    for waiting in due[i:]:
+                        waiting.waiting = True
+                    break
+                worker.running = True
+                self.active += 1
+            if worker.waiting:
+                worker.deferred_count += 1
+                worker.waiting = False
+            # 늦게 시작해도 다음 실행은 원래 주기 기준 (밀린 주기는 몰아서 실행하지 않음)
+            scheduled = worker.next_run
+            missed = int((now - scheduled) // worker.interval)
+            worker.next_run = scheduled + (missed + 1) * worker.interval
+            self.executor.submit(self.run, worker, scheduled)
+
+        if not self.workers:
+            return Config.TRADE_INTERVAL
+        # 작업자를 기다리는 마켓이 있으면 짧은 간격으로 다시 확인
+        if any(w.waiting for w in self.workers.values()):
+            return Config.MARKET_WORKER_POLL
+        return max(min(w.next_run for w in self.workers.values()) - time.monotonic(), 0.0)
+
+    def get_stats(self):
+        """마켓별 지연 통계"""
+        return {key: worker.get_stats() for key, worker in self.workers.items()}
+
+    def log_stats(self):
+        """마켓별 지연 통계 로그"""
+        for key, stats in self.get_stats().items():
+            log.log('TR', (
+                f"{key} 작업: {stats['runs']}회, 지연 평균 {stats['avg'] * 1000:.0f}ms / "
+                f"p95 {stats['p95'] * 1000:.0f}ms / 최대 {stats['max'] * 1000:.0f}ms, "
+                f"시작 지연 평균 {stats['jitter_avg'] * 1000:.1f}ms / 최대 {stats['jitter_max'] * 1000:.1f}ms, "
+                f"건너뜀 {stats['overruns']}회, 대기 {stats['deferred']}회, 오류 {stats['errors']}회"
+            ))
+
+    def close(self, wait=True):
+        """작업자 종료"""
+        self.executor.shutdown(wait=wait)
@@ -0,0 +1,142 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config.config import Config
+from utils.logger import log
+
+
+class OrderReconciler:
+    """여러 마켓의 미체결 주문 취소와 보유 코인 청산을 동시에 실행하고 계좌 상태를 확인
+
+    미체결 주문은 마켓 구분 없이 한 번에 조회하고, 취소/매도 요청은 작업자 여러 개로 동시에 보낸다.
+    실제 요청 속도는 공용 세션의 주문 요청 제한이 맞추므로 마켓이 늘어도 전체 시간은
+    요청 수 / 초당 주문 한도에 가깝게 유지된다. 마지막에 계좌를 새로 조회해 결과를 확인한다.
+    """
+    def __init__(self, client, order_tracker=None, workers=None):
+        self.client = client
+        self.order_tracker = order_tracker
+        self.workers = workers or Config.RECONCILE_WORKERS
+
+    def get_open_orders(self, markets=None):
+        """미체결 주문 목록 (markets가 있으면 해당 마켓만)"""
+        orders = []
+        page = 1
+        while True:
+            rows = self.client.session.get('/v1/orders', params={
+                'state': 'wait', 'page': page, 'limit': Config.RECONCILE_PAGE_SIZE,
+            }, auth=True) or []
+            orders.extend(rows)
+            if len(rows) < Config.RECONCILE_PAGE_SIZE:
+                break
+            page += 1
+        if markets is not None:
+            markets = set(markets)
+            orders = [order for order in orders if order.get('market') in markets]
+        return orders
+
+    def run_concurrently(self, func, items):
+        """items마다 func 실행, (성공 결과 목록, 실패 항목 목록) 반환"""
+        results, failed = [], []
+        if not items:
+            return results, failed
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='reconcile') as executor:
+            for item, result in zip(items, executor.map(self.call_safely(func), items)):
+                if result is None:
+                    failed.append(item)
+                else:
+                    results.append(result)
+        return results, failed
+
+    @staticmethod
+    def call_safely(func):
+        """예외를 None으로 바꾸는 래퍼 (실패 집계용)"""
+        def wrapper(item):
+            try:
+                return func(item)
+            except Exception as e:
+                log.log('WA', f"일괄 처리 중 오류 ({item}): {str(e)}")
+                return None
+        return wrapper
+
+    def cancel_all(self, markets=None):
+        """미체결 주문 동시 취소, (취소 수, 실패 수) 반환"""
+        orders = self.get_open_orders(markets)
+        if not orders:
+            log.log('TR', "취소할 미체결 주문이 없습니다")
+            return 0, 0
+        cancelled, failed = self.run_concurrently(
+            lambda order: self.client.cancel_order(order['uuid']), orders
+        )
+        self.client.invalidate_account()
+        log.log('TR', f"미체결 주문 {len(orders)}건 중 {len(cancelled)}건 취소" + (f", {len(failed)}건 실패" if failed else ""))
+        return len(cancelled), len(failed)
+
+    def liquidate(self, markets):
+        """마켓별 보유 코인 동시 시장가 매도, (매도 주문 수, 실패 수) 반환
+
+        최소 주문 금액보다 평가액이 작은 잔량은 매도할 수 없으므로 건너뛴다.
+        """
+        snapshot = self.client.get_account_snapshot(force=True)
+        prices = self.client.refresh_prices(markets)
+        targets = []
+        for market in markets:
+            ticker = market.split('-')[1]
+            volume = snapshot.get_balance(ticker)
+            if volume <= 0:
+                continue
+            price = prices.get(market)
+            if price and volume * price < Config.MIN_ORDER_AMOUNT:
+                log.log('TR', f"{market} 잔량 {volume} (약 {volume * price:,.0f}원)은 최소 주문 금액 미만이라 매도하지 않음")
+                continue
+            targets.append((market, volume))
+        if not targets:
+            return 0, 0
+
+        def sell(target):
+            market, volume = target
+            result = self.client.sell_market_order(market, volume)
+            if result and self.order_tracker is not None:
+                self.order_tracker.track(result, market, 'ask')
+            return result
+
+        sold, failed = self.run_concurrently(sell, targets)
+        if self.order_tracker is not None:
+            for order in list(self.order_tracker.open_orders.values()):
+                self.order_tracker.wait(order)
+        log.log('TR', f"보유 코인 {len(targets)}개 마켓 중 {len(sold)}개 매도 주문" + (f", {len(failed)}개 실패" if failed else ""))
+        return len(sold), len(failed)
+
+    def verify(self, markets, liquidated=False):
+        """새 계좌 스냅샷과 미체결 주문으로 결과 확인, 남은 항목 목록 반환"""
+        snapshot = self.client.get_account_snapshot(force=True)
+        remaining_orders = self.get_open_orders(markets)
+        issues = [f"{order['market']} 미체결 주문 {order['uuid']}" for order in remaining_orders]
+        for market in markets:
+            ticker = market.split('-')[1]
+            if snapshot.get_locked(ticker) > 0:
+                issues.append(f"{market} 주문 중 묶인 수량 {snapshot.get_locked(ticker)}")
+            if liquidated and snapshot.get_balance(ticker) > 0:
+                price = self.client.get_current_price(market)
+                if not price or snapshot.get_balance(ticker) * price >= Config.MIN_ORDER_AMOUNT:
+                    issues.append(f"{market} 남은 잔고 {snapshot.get_balance(ticker)}")
+        return issues
+
+    def reconcile(self, markets, liquidate=False):
+        """미체결 주문 취소 (+ liquidate면 보유 코인 매도) 후 계좌 상태 확인, 남은 항목 목록 반환"""
+        started = time.monotonic()
+        markets = list(markets)
+        try:
+            self.cancel_all(markets)
+            if liquidate:
+                self.liquidate(markets)
+            issues = self.verify(markets, liquidated=liquidate)
+        except Exception as e:
+            log.detailed_error("주문 정리 중 오류", e)
+            return [str(e)]
+
+        elapsed = time.monotonic() - started
+        if issues:
+            log.log('WA', f"주문 정리 후 확인 필요 ({elapsed:.2f}초): " + ', '.join(issues))
+        else:
+            log.log('TR', f"주문 정리 완료: {len(markets)}개 마켓 ({elapsed:.2f}초)")
+        return issues
@@ -0,0 +1,241 @@
+import threading
+import time
+from collections import deque
+
+from config.config import Config
+from utils.logger import log
+
+FINAL_STATES = ('done', 'cancel')
+
+
+def get_executed_funds(row, fetch_order):
+    """주문의 체결 금액 (응답에 executed_funds가 없으면 fetch_order(uuid)로 조회한 체결 내역 합계)
+
+    /v1/orders 목록 응답에는 체결 내역이 없으므로 개별 주문(/v1/order)을 조회한다.
+    개별 주문도 확인하지 못하면 None을 반환한다.
+    """
+    if row.get('executed_funds') is not None:
+        return float(row['executed_funds'])
+    detail = fetch_order(row['uuid'])
+    if not detail:
+        return None
+    if detail.get('executed_funds') is not None:
+        return float(detail['executed_funds'])
+    return sum(float(trade.get('funds') or 0) for trade in detail.get('trades', []))
+
+
+class TrackedOrder:
+    """추적 중인 주문과 체결 결과"""
+    def __init__(self, uuid, market, side, ord_type=None, placed_at=None):
+        self.uuid = uuid
+        self.market = market
+        self.side = side            # 'bid' 매수, 'ask' 매도
+        self.ord_type = ord_type
+        self.placed_at = time.monotonic() if placed_at is None else placed_at
+        self.state = 'wait'
+        self.volume = 0.0           # 체결 수량
+        self.funds = 0.0            # 체결 금액 (수수료 제외)
+        self.fee = 0.0
+        self.confirmed_at = None
+        self.realized_pnl = None    # 매도 체결 시 실현 손익 (수수료 반영)
+
+    @property
+    def ticker(self):
+        return self.market.split('-')[1]
+
+    @property
+    def quote(self):
+        return self.market.split('-')[0]
+
+    @property
+    def price(self):
+        """평균 체결가"""
+        return self.funds / self.volume if self.volume else 0.0
+
+    @property
+    def filled(self):
+        return self.volume > 0
+
+
+class OrderTracker:
+    """주문 uuid를 기록하고 미완료 주문을 묶어서 조회해 실제 체결가/수량/수수료를 확인
+
+    미완료 주문은 ORDER_POLL_BATCH개씩 한 요청으로 완료(done/cancel) 여부를 조회하고,
+    완료된 주문만 체결 금액을 계산한다 (응답에 executed_funds가 없으면 개별 주문 체결 내역 조회).
+    확인된 체결은 계좌 캐시에 반영하고 등록된 콜백(전략 포지션 갱신 등)에 전달한다.
+    """
+    def __init__(self, client, batch_size=None):
+        self.client = client
+        self.batch_size = batch_size or Config.ORDER_POLL_BATCH
+        self.open_orders = {}
+        self.completed = deque(maxlen=Config.ORDER_HISTORY)
+        self.listeners = []
+        self.positions = {}     # 마켓 -> (보유 수량, 매수 원가 합계), 실현 손익 계산용
+        self.realized_pnl = {}  # 마켓 -> 누적 실현 손익
+        self.lock = threading.RLock()
+        self.poll_count = 0
+        self.request_count = 0
+        self.detail_count = 0
+        self.confirm_latencies = deque(maxlen=Config.ORDER_HISTORY)
+
+    def add_listener(self, callback):
+        """주문 완료 콜백 등록 (callback(order))"""
+        self.listeners.append(callback)
+
+    def track(self, result, market=None, side=None, placed_at=None):
+        """주문 응답으로 추적 시작 (uuid가 없으면 None, placed_at은 주문 시각(단조 시계), 없으면 지금)"""
+        if not isinstance(result, dict) or 'uuid' not in result:
+            return None
+        order = TrackedOrder(
+            result['uuid'], result.get('market') or market,
+            result.get('side') or side, result.get('ord_type'), placed_at,
+        )
+        with self.lock:
+            self.open_orders[order.uuid] = order
+        return order
+
+    def has_open_orders(self):
+        return bool(self.open_orders)
+
+    def has_open_order(self, market, side=None):
+        """market(side가 있으면 해당 방향)의 완료를 확인하지 못한 주문이 있는지 확인"""
+        with self.lock:
+            return any(
+                order.market == market and (side is None or order.side == side)
+                for order in self.open_orders.values()
+            )
+
+    def poll(self):
+        """미완료 주문을 묶어서 조회해 완료된 주문 처리, 이번에 완료된 주문 목록 반환"""
+        with self.lock:
+            pending = list(self.open_orders.values())
+        if not pending:
+            return []
+
+        self.poll_count += 1
+        completed = []
+        for i in range(0, len(pending), self.batch_size):
+            batch = {order.uuid: order for order in pending[i:i + self.batch_size]}
+            try:
+                rows = self.client.get_orders_by_uuids(list(batch))
+                self.request_count += 1
+            except Exception as e:
+                log.log('WA', f"주문 상태 일괄 조회 실패: {str(e)}")
+                continue
+            for row in rows:
+                order = batch.get(row.get('uuid'))
+                if order is not None and row.get('state') in FINAL_STATES:
+                    try:
+                        if self.complete(order, row):
+                            completed.append(order)
+                    except Exception as e:
+                        log.log('WA', f"{order.market} 주문 완료 처리 실패 ({order.uuid}): {str(e)}")
+        return completed
+
+    def wait(self, order, timeout=None):
+        """주문이 완료될 때까지 조회 (시장가 주문 직후 확인용), 완료되면 True"""
+        timeout = Config.ORDER_CONFIRM_TIMEOUT if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while order.uuid in self.open_orders:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(Config.ORDER_POLL_INTERVAL)
+            self.poll()
+        return True
+
+    def get_funds(self, row):
+        """주문의 체결 금액 (응답에 없으면 개별 주문 체결 내역 합계)"""
+        if row.get('executed_funds') is None:
+            self.detail_count += 1
+        return get_executed_funds(row, self.client.get_order) or 0.0
+
+    def complete(self, order, row):
+        """완료된 주문의 체결 결과 기록 후 계좌 캐시/콜백에 반영 (이번 호출이 처리했으면 True)
+
+        여러 스레드(작업자 wait, 주 스레드 poll)가 같은 주문을 동시에 완료 처리할 수 있으므로
+        미완료 목록에서 먼저 꺼낸 스레드만 반영한다.
+        """
+        with self.lock:
+            if self.open_orders.pop(order.uuid, None) is None:
+                return False
+        try:
+            volume = float(row.get('executed_volume') or 0)
+            funds = self.get_funds(row) if volume else 0.0
+        except Exception:
+            # 체결 금액을 확인하지 못하면 다음 조회에서 다시 처리
+            with self.lock:
+                self.open_orders[order.uuid] = order
+            raise
+        order.state = row['state']
+        order.volume = volume
+        order.fee = float(row.get('paid_fee') or 0)
+        order.funds = funds
+        order.confirmed_at = time.monotonic()
+
+        with self.lock:
+            self.completed.append(order)
+            self.confirm_latencies.append(order.confirmed_at - order.placed_at)
+            if order.filled:
+                self.update_position(order)
+            others_open = bool(self.open_orders)
+
+        if order.filled:
+            log.log('TR', (
+                f"{order.market} {'매수' if order.side == 'bid' else '매도'} 체결 확인: "
+                f"{order.volume:.8f} @ {order.price:,.4f}원, 수수료 {order.fee:,.2f}원"
+                + (f", 실현 손익 {order.realized_pnl:+,.0f}원" if order.realized_pnl is not None else "")
+            ))
+            # 다른 미완료 주문이 있으면 주문 전 스냅샷 기준이 맞지 않으므로 다음 조회로 넘김
+            if others_open:
+                self.client.account_cache.clear()
+            else:
+                self.client.account_cache.apply_fill(
+                    order.placed_at, order.ticker, order.quote, order.side, order.volume, order.funds, order.fee
+                )
+        else:
+            log.log('TR', f"{order.market} 주문 미체결 종료 ({order.state}): {order.uuid}")
+
+        for callback in self.listeners:
+            try:
+                callback(order)
+            except Exception as e:
+                log.log('WA', f"{order.market} 체결 콜백 처리 중 오류: {str(e)}")
+        return True
+
+    def update_position(self, order):
+        """마켓별 보유 수량/원가 갱신, 매도 시 실현 손익 계산 (수수료 포함)"""
+        volume, cost = self.positions.get(order.market, (0.0, 0.0))
+        if order.side == 'bid':
+            self.positions[order.market] = (volume + order.volume, cost + order.funds + order.fee)
+            return
+        if volume <= 0:
+            return  # 추적 전에 보유하던 수량은 원가를 알 수 없음
+        sold = min(order.volume, volume)
+        sold_cost = cost * sold / volume
+        order.realized_pnl = order.funds * sold / order.volume - order.fee - sold_cost
+        self.realized_pnl[order.market] = self.realized_pnl.get(order.market, 0.0) + order.realized_pnl
+        self.positions[order.market] = (volume - sold, cost - sold_cost)
+
+    def get_stats(self):
+        """주문 추적 통계"""
+        latencies = list(self.confirm_latencies)
+        return {
+            'open': len(self.open_orders),
+            'completed': len(self.completed),
+            'polls': self.poll_count,
+            'requests': self.request_count,
+            'detail_requests': self.detail_count,
+            'avg_confirm': sum(latencies) / len(latencies) if latencies else 0.0,
+            'realized_pnl': sum(self.realized_pnl.values()),
+        }
+
+    def log_stats(self):
+        """주문 추적 통계 로그"""
+        stats = self.get_stats()
+        log.log('TR', (
+            f"주문 추적: 완료 {stats['completed']}건, 미완료 {stats['open']}건, 조회 {stats['polls']}회 "
+            f"(요청 {stats['requests']}회, 개별 조회 {stats['detail_requests']}회), "
+            f"평균 확인 {stats['avg_confirm']:.2f}초, 실현 손익 {stats['realized_pnl']:+,.0f}원"
+        ))
+        for market, pnl in self.realized_pnl.items():
+            log.log('TR', f"{market} 실현 손익: {pnl:+,.0f}원")
@@ -0,0 +1,67 @@
+import threading
+import time
+
+from config.config import Config
+
+
+class PriceSnapshot:
+    """틱 단위 현재가 스냅샷 (배치 시세 조회 결과를 전략/트레이더가 공유)"""
+    def __init__(self, ttl=None):
+        self.ttl = Config.PRICE_SNAPSHOT_TTL if ttl is None else ttl
+        self.tickers = {}
+        self.updated = {}
+        self.lock = threading.Lock()
+        self.hit_count = 0
+        self.miss_count = 0
+
+    def update(self, tickers):
+        """/v1/ticker 응답으로 스냅샷 갱신"""
+        now = time.monotonic()
+        with self.lock:
+            for row in tickers:
+                market = row.get('market')
+                if market:
+                    self.tickers[market] = row
+                    self.updated[market] = now
+
+    def is_fresh(self, market):
+        """TTL 이내에 갱신된 시세인지 확인"""
+        updated = self.updated.get(market)
+        return updated is not None and time.monotonic() - updated < self.ttl
+
+    def get_ticker(self, market):
+        """유효한 시세 원본 데이터 (없으면 None)"""
+        if self.is_fresh(market):
+            return self.tickers.get(market)
+        return None
+
+    def get_price(self, market):
+        """유효한 현재가 (없으면 None)"""
+        ticker = self.get_ticker(market)
+        if ticker is None:
+            self.miss_count += 1
+            return None
+        self.hit_count += 1
+        return ticker.get('trade_price')
+
+    def get_prices(self, markets=None):
+        """여러 마켓의 유효한 현재가 딕셔너리"""
+        markets = self.tickers.keys() if markets is None else markets
+        prices = {}
+        for market in list(markets):
+            ticker = self.get_ticker(market)
+            if ticker is not None:
+                prices[market] = ticker.get('trade_price')
+        return prices
+
+    def invalidate(self, market=None):
+        """스냅샷 무효화 (market이 없으면 전체)"""
+        with self.lock:
+            if market is None:
+                self.updated.clear()
+            else:
+                self.updated.pop(market, None)
+
+
+# 전역 시세 스냅샷 인스턴스 생성 (모든 클라이언트가 공유)
+price_snapshot = PriceSnapshot()
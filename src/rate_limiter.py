@@ -0,0 +1,138 @@
+import asyncio
+import threading
+import time
+
+from config.config import Config
+from utils.logger import log
+
+# Remaining-Req 헤더의 group 값 → 내부 버킷 그룹
+HEADER_GROUPS = {
+    'order': 'order',
+    'default': 'account',
+}
+
+
+class TokenBucket:
+    """초당 요청 수를 제한하는 토큰 버킷 (토큰이 음수면 예약된 대기열)"""
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now):
+        """경과 시간만큼 토큰 충전"""
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+    def reserve(self, now):
+        """토큰 1개를 예약하고 사용 가능할 때까지의 대기 시간(초) 반환"""
+        self.refill(now)
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+    def try_take(self, now):
+        """토큰이 있으면 1개 사용하고 True (없으면 대기하지 않고 False)"""
+        self.refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def sync(self, remaining, now):
+        """서버가 알려준 남은 요청 수로 토큰 보정"""
+        self.refill(now)
+        self.tokens = min(self.tokens, float(remaining))
+
+    def penalize(self, seconds, now):
+        """429 응답 시 지정 시간 동안 요청 차단"""
+        self.refill(now)
+        self.tokens = min(self.tokens, 0.0) - seconds * self.rate
+
+
+class RateLimiter:
+    """API 그룹별(quotation, account, order) 공용 요청 제한기"""
+    def __init__(self, limits=None):
+        limits = limits or {
+            'quotation': Config.RATE_LIMIT_QUOTATION,
+            'account': Config.RATE_LIMIT_ACCOUNT,
+            'order': Config.RATE_LIMIT_ORDER,
+        }
+        self.buckets = {group: TokenBucket(rate) for group, rate in limits.items()}
+        self.lock = threading.Lock()
+        self.wait_count = 0
+        self.wait_time = 0.0
+        self.throttled_count = 0
+
+    @staticmethod
+    def group_for(method, path, auth=False):
+        """요청 경로로 버킷 그룹 결정"""
+        if path.startswith('/v1/order') and method in ('POST', 'DELETE'):
+            return 'order'
+        if auth:
+            return 'account'
+        return 'quotation'
+
+    def reserve(self, group):
+        """토큰 예약 후 대기 시간 반환"""
+        with self.lock:
+            wait = self.buckets[group].reserve(time.monotonic())
+            if wait > 0:
+                self.wait_count += 1
+                self.wait_time += wait
+            return wait
+
+    def acquire(self, group):
+        """요청 가능할 때까지 호출한 스레드만 대기"""
+        wait = self.reserve(group)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, group):
+        """요청 가능할 때까지 이벤트 루프를 막지 않고 대기"""
+        wait = self.reserve(group)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def update_from_header(self, header, group=None):
+        """Remaining-Req 헤더로 버킷 재동기화 (예: group=default; min=1799; sec=29)"""
+        if not header:
+            return
+        try:
+            fields = dict(
+                item.strip().split('=', 1) for item in header.split(';') if '=' in item
+            )
+            header_group = fields.get('group')
+            group = HEADER_GROUPS.get(header_group, group or 'quotation')
+            remaining = fields.get('sec')
+            if remaining is None or group not in self.buckets:
+                return
+            with self.lock:
+                self.buckets[group].sync(int(remaining), time.monotonic())
+        except (ValueError, TypeError) as e:
+            log.log('WA', f"Remaining-Req 헤더 해석 실패: {header} ({str(e)})")
+
+    def throttle(self, group, seconds=None):
+        """429 응답을 받은 그룹의 요청 일시 차단"""
+        seconds = Config.RATE_LIMIT_BACKOFF if seconds is None else seconds
+        with self.lock:
+            self.buckets[group].penalize(seconds, time.monotonic())
+            self.throttled_count += 1
+        log.log('WA', f"API 요청 제한 초과(429): {group} 그룹 {seconds:.1f}초 대기")
+
+    def get_stats(self):
+        """대기 통계 조회"""
+        with self.lock:
+            return {
+                'waits': self.wait_count,
+                'wait_time': self.wait_time,
+                'throttled': self.throttled_count,
+            }
+
+
+# 전역 요청 제한기 인스턴스 생성 (모든 클라이언트가 공유)
+rate_limiter = RateLimiter()
@@ -0,0 +1,116 @@
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from config.config import Config
+from utils.logger import log
+
+
+def next_boundary(period, offset=0.0, now=None):
+    """now(벽시계) 이후 첫 실행 시각 (epoch 기준 period초 경계 + offset)"""
+    now = time.time() if now is None else now
+    return ((now - offset) // period + 1) * period + offset
+
+
+def to_monotonic(wall_time):
+    """벽시계 시각을 단조 시계 시각으로 변환"""
+    return time.monotonic() + (wall_time - time.time())
+
+
+def daily_offset(hhmm):
+    """현지 시각 'HH:MM'을 일 단위 실행의 UTC 자정 기준 offset(초)으로 변환"""
+    hour, minute = map(int, hhmm.split(':'))
+    return (hour * 3600 + minute * 60 - time.localtime().tm_gmtoff) % 86400
+
+
+class AlignedScheduler:
+    """period초 경계(+offset)에 맞춰 실행하는 단조 시계 기반 스케줄러
+
+    마감 시각은 작업 시간과 무관하게 경계 기준으로 정하므로 주기가 밀리지 않는다.
+    작업이 길어져 다음 경계를 지나쳤거나 late_tolerance 이상 늦게 깨어난 주기는
+    몰아서 실행하지 않고 버린 뒤 다음 경계에 맞춘다.
+    """
+    def __init__(self, period, offset=0.0, late_tolerance=None, name="스케줄러"):
+        self.period = period
+        self.offset = offset
+        self.late_tolerance = Config.SCHEDULER_LATE_TOLERANCE if late_tolerance is None else late_tolerance
+        self.name = name
+        self.stop_event = threading.Event()
+        self.deadline = None          # 다음 실행 단조 시계 시각
+        self.last_deadline = None     # 마지막으로 실행(또는 버린) 주기의 마감 시각
+        self.cycle_count = 0
+        self.dropped_count = 0        # 늦어서 버린 주기 수
+        self.overrun_count = 0        # 작업이 주기보다 길었던 횟수
+        self.jitters = deque(maxlen=Config.SCHEDULER_STATS_WINDOW)
+        self.durations = deque(maxlen=Config.SCHEDULER_STATS_WINDOW)
+
+    def schedule_next(self):
+        """다음 경계로 마감 시각 설정 (지나간 경계는 버린 주기로 기록)"""
+        target = to_monotonic(next_boundary(self.period, self.offset))
+        if self.last_deadline is not None:
+            skipped = int(round((target - self.last_deadline) / self.period)) - 1
+            if skipped > 0:
+                self.dropped_count += skipped
+        self.deadline = target
+
+    def wait_next(self):
+        """다음 실행 시각까지 대기 (중지되면 False)"""
+        while not self.stop_event.is_set():
+            if self.deadline is None:
+                self.schedule_next()
+            remaining = self.deadline - time.monotonic()
+            if remaining > 0:
+                self.stop_event.wait(remaining)
+                continue
+            self.last_deadline, self.deadline = self.deadline, None
+            if -remaining > self.late_tolerance:
+                # 너무 늦게 깨어남 (시스템 정지 등): 이번 주기는 버림
+                self.dropped_count += 1
+                continue
+            self.jitters.append(-remaining)
+            return True
+        return False
+
+    def run(self, func):
+        """stop()이 호출될 때까지 경계마다 func() 실행"""
+        while self.wait_next():
+            started = time.monotonic()
+            try:
+                func()
+            except Exception as e:
+                log.detailed_error(f"{self.name} 작업 중 오류", e)
+            duration = time.monotonic() - started
+            self.durations.append(duration)
+            self.cycle_count += 1
+            if duration > self.period:
+                self.overrun_count += 1
+
+    def stop(self):
+        """대기 중인 스케줄러 중지"""
+        self.stop_event.set()
+
+    def get_stats(self):
+        """실행 통계 (초)"""
+        jitters = np.asarray(self.jitters, dtype=float)
+        durations = np.asarray(self.durations, dtype=float)
+        return {
+            'cycles': self.cycle_count,
+            'dropped': self.dropped_count,
+            'overruns': self.overrun_count,
+            'jitter_avg': float(jitters.mean()) if len(jitters) else 0.0,
+            'jitter_p95': float(np.percentile(jitters, 95)) if len(jitters) else 0.0,
+            'jitter_max': float(jitters.max()) if len(jitters) else 0.0,
+            'duration_avg': float(durations.mean()) if len(durations) else 0.0,
+            'duration_max': float(durations.max()) if len(durations) else 0.0,
+        }
+
+    def log_stats(self):
+        """실행 통계 로그"""
+        stats = self.get_stats()
+        log.log('TR', (
+            f"{self.name}: {stats['cycles']}회 실행, 버린 주기 {stats['dropped']}회, 주기 초과 {stats['overruns']}회, "
+            f"지연 평균 {stats['jitter_avg'] * 1000:.1f}ms / p95 {stats['jitter_p95'] * 1000:.1f}ms / "
+            f"최대 {stats['jitter_max'] * 1000:.1f}ms, 작업 평균 {stats['duration_avg'] * 1000:.0f}ms"
+        ))
@@ -0,0 +1,179 @@
+import time
+
+import numpy as np
+
+from config.config import Config
+from utils.logger import log
+from src import indicator_kernels as kernels
+from src.candle_store import CANDLE_FIELDS, INTERVAL_SECONDS
+
+DAY_SECONDS = INTERVAL_SECONDS['day']
+
+
+class MarketScreener:
+    """전체 마켓에 전략 매수 조건(RSI, 볼린저 하단, 거래량 증가)을 벡터 연산으로 평가하는 스크리너
+
+    형성 중인 일봉은 시세 배치 조회 한 번으로 모든 마켓에 대해 만들고,
+    마감된 일봉 이력은 캔들 저장소에서 하루 한 번만 갱신한다.
+    이력 갱신은 틱마다 지연 예산 안에서만 하고, 남은 마켓은 다음 틱으로 넘긴다.
+    """
+    def __init__(self, client, strategy, quote=None, budget=None, history=None, top=None):
+        self.client = client
+        self.strategy = strategy
+        self.config = strategy.config
+        self.quote = quote or Config.CURRENCY
+        self.budget = budget or Config.SCREENER_BUDGET
+        self.history = history or Config.SCREENER_HISTORY
+        self.top = top or Config.SCREENER_TOP_N
+        self.markets = []
+        self.markets_updated_at = 0.0
+        self.loaded_day = {}     # 마켓 -> 마감 일봉 이력을 갱신한 UTC 일 시작 시각
+        self.candidates = []
+        self.scan_count = 0
+        self.over_budget_count = 0
+        self.history_request_count = 0
+        self.evaluated_count = 0  # 지표를 평가한 마켓 수 (누적)
+        self.skipped_count = 0    # 이력이 준비되지 않아 건너뛴 마켓 수 (누적)
+        self.total_latency = 0.0
+        self.last_latency = 0.0
+
+    def get_markets(self):
+        """대상 마켓 목록 (SCREENER_MARKET_REFRESH 초마다 갱신)"""
+        if not self.markets or time.monotonic() - self.markets_updated_at >= Config.SCREENER_MARKET_REFRESH:
+            markets = self.client.get_markets(self.quote)
+            if markets:
+                self.markets = markets
+                self.markets_updated_at = time.monotonic()
+        return self.markets
+
+    def load_history(self, markets, today, deadline):
+        """오늘 마감 이력이 없는 마켓의 일봉 갱신 (마감 시각까지), 이력이 준비된 마켓 반환"""
+        ready = []
+        for market in markets:
+            if self.loaded_day.get(market) != today:
+                if time.monotonic() >= deadline:
+                    continue
+                try:
+                    self.client.candle_store.update(market, 'day', force=True)
+                    self.history_request_count += 1
+                    self.loaded_day[market] = today
+                except Exception as e:
+                    log.log('WA', f"{market} 일봉 이력 조회 실패: {str(e)}")
+                    continue
+            ready.append(market)
+        return ready
+
+    def build_candles(self, markets, tickers, today):
+        """마감 일봉 이력 + 시세로 만든 형성 중 일봉을 (마켓 × 캔들) 배열로 합침"""
+        views = []
+        for market in markets:
+            # 작업자 스레드가 갱신 중일 수 있으므로 복사본으로 읽음
+            view = self.client.candle_store.get_buffer(market, 'day').view(copy=True)
+            closed = int(np.searchsorted(view['ts'], today))
+            start = max(closed - (self.history - 1), 0)
+            ticker = tickers[market]
+            forming = {
+                'ts': today,
+                'open': ticker['opening_price'],
+                'high': ticker['high_price'],
+                'low': ticker['low_price'],
+                'close': ticker['trade_price'],
+                'volume': ticker['acc_trade_volume'],
+                'value': ticker['acc_trade_price'],
+            }
+            views.append({
+                field: np.append(view[field][start:closed], forming[field])
+                for field in CANDLE_FIELDS
+            })
+        return kernels.stack_candles(views, self.history)
+
+    def evaluate(self, markets, candles):
+        """매수 조건을 모든 마켓에 대해 한 번에 평가해 점수순 후보 목록 반환"""
+        columns = self.strategy.compute_indicator_arrays(candles)
+        price = candles['close'][:, -1]
+        rsi = columns['RSI'][:, -1]
+        bb_lower = columns['BB_LOWER'][:, -1]
+        vol_change = columns['VOL_CHANGE'][:, -1]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            matched = (rsi <= self.config.RSI_BUY) & (price <= bb_lower) & (vol_change > 0)
+            # RSI 기준 대비 여유(포인트) + 볼린저 하단 아래 깊이(%)
+            score = (self.config.RSI_BUY - rsi) + (bb_lower - price) / bb_lower * 100
+
+        indices = np.flatnonzero(matched)
+        indices = indices[np.argsort(-score[indices], kind='stable')][:self.top]
+        return [
+            {
+                'market': markets[i],
+                'price': float(price[i]),
+                'RSI': float(rsi[i]),
+                'BB_LOWER': float(bb_lower[i]),
+                'VOL_CHANGE': float(vol_change[i]),
+                'score': float(score[i]),
+            }
+            for i in indices
+        ]
+
+    def scan(self):
+        """전체 마켓 스캔 후 매수 후보 목록 반환 (점수 높은 순)"""
+        started = time.monotonic()
+        deadline = started + self.budget
+        try:
+            markets = self.get_markets()
+            if not markets:
+                return []
+            tickers = {row['market']: row for row in self.client.get_tickers(markets)}
+            today = int(time.time()) // DAY_SECONDS * DAY_SECONDS
+
+            # 마감 이력 갱신은 지표 계산 몫을 남기고 예산의 나머지 시간 안에서만
+            ready = self.load_history([market for market in markets if market in tickers], today,
+                                      deadline - self.budget * Config.SCREENER_EVAL_RESERVE)
+            self.skipped_count += len(markets) - len(ready)
+            self.evaluated_count += len(ready)
+            if ready:
+                self.candidates = self.evaluate(ready, self.build_candles(ready, tickers, today))
+            else:
+                self.candidates = []
+            return self.candidates
+        except Exception as e:
+            log.log('WA', f"마켓 스캔 중 오류: {str(e)}")
+            return []
+        finally:
+            self.last_latency = time.monotonic() - started
+            self.total_latency += self.last_latency
+            self.scan_count += 1
+            if self.last_latency > self.budget:
+                self.over_budget_count += 1
+
+    def log_candidates(self):
+        """마지막 스캔 결과 로그"""
+        if not self.candidates:
+            log.log('TR', f"매수 후보 없음 ({self.last_latency * 1000:.0f}ms)")
+            return
+        summary = ', '.join(
+            f"{row['market']}(RSI {row['RSI']:.1f}, 하단 대비 {row['price'] / row['BB_LOWER'] - 1:+.2%})"
+            for row in self.candidates
+        )
+        log.log('TR', f"매수 후보 {len(self.candidates)}개 ({self.last_latency * 1000:.0f}ms): {summary}")
+
+    def get_stats(self):
+        """스캔 통계"""
+        return {
+            'scans': self.scan_count,
+            'markets': len(self.markets),
+            'evaluated': self.evaluated_count,
+            'skipped': self.skipped_count,
+            'history_requests': self.history_request_count,
+            'over_budget': self.over_budget_count,
+            'avg_latency': self.total_latency / self.scan_count if self.scan_count else 0.0,
+            'last_latency': self.last_latency,
+        }
+
+    def log_stats(self):
+        """스캔 통계 로그"""
+        stats = self.get_stats()
+        log.log('TR', (
+            f"마켓 스캔: {stats['scans']}회, 대상 {stats['markets']}개, 평가 {stats['evaluated']}회, "
+            f"건너뜀 {stats['skipped']}회, 이력 조회 {stats['history_requests']}회, "
+            f"평균 {stats['avg_latency'] * 1000:.0f}ms, 예산 초과 {stats['over_budget']}회"
+        ))
@@ -0,0 +1,104 @@
+import time
+
+from config.config import Config
+from utils.logger import log
+from src.candle_store import INTERVAL_SECONDS
+
+# 재평가 사유
+REASONS = ('first', 'position', 'candle_close', 'price', 'max_age', 'disabled')
+
+
+class SignalState:
+    """마지막으로 신호를 평가했을 때의 입력과 결과"""
+    def __init__(self, price, position, buckets, signal, evaluated_at):
+        self.price = price
+        self.position = position
+        self.buckets = buckets
+        self.signal = signal
+        self.evaluated_at = evaluated_at
+
+
+class SignalGate:
+    """마켓별 마지막 평가 상태와 비교해 매매 신호 재평가 여부를 판단
+
+    현재가가 price_threshold 이상 움직였거나, 관련 간격의 캔들이 마감됐거나,
+    포지션이 바뀌었거나, 마지막 평가 후 max_age 초가 지났을 때만 다시 평가하고
+    그 외에는 이전 신호를 재사용한다.
+    """
+    def __init__(self, enabled=None, price_threshold=None, max_age=None):
+        self.enabled = Config.USE_SIGNAL_GATE if enabled is None else enabled
+        self.price_threshold = Config.SIGNAL_PRICE_THRESHOLD if price_threshold is None else price_threshold
+        self.max_age = Config.SIGNAL_MAX_AGE if max_age is None else max_age
+        self.states = {}
+        self.evaluated_count = 0
+        self.skipped_count = 0
+        self.reason_counts = {reason: 0 for reason in REASONS}
+
+    @staticmethod
+    def get_buckets(intervals, now):
+        """간격별 현재 캔들 시작 시각"""
+        return {
+            interval: int(now) // INTERVAL_SECONDS[interval] * INTERVAL_SECONDS[interval]
+            for interval in intervals
+        }
+
+    def check(self, market, price, position, buckets, now):
+        """재평가 사유 반환 (재사용 가능하면 None)"""
+        if not self.enabled:
+            return 'disabled'
+        state = self.states.get(market)
+        if state is None:
+            return 'first'
+        if position != state.position:
+            return 'position'
+        if buckets != state.buckets:
+            return 'candle_close'
+        if price is not None and (not state.price or abs(price / state.price - 1) >= self.price_threshold):
+            return 'price'
+        if now - state.evaluated_at >= self.max_age:
+            return 'max_age'
+        return None
+
+    def evaluate(self, market, price, position, intervals, evaluate_func):
+        """필요할 때만 evaluate_func()로 신호를 평가하고, 아니면 이전 신호 반환
+
+        position은 평가 전 값을 기록하므로 평가 중 포지션이 바뀌면 다음 틱에 다시 평가한다.
+        """
+        now = time.time()
+        buckets = self.get_buckets(intervals, now)
+        reason = self.check(market, price, position, buckets, now)
+        if reason is None:
+            self.skipped_count += 1
+            return self.states[market].signal
+
+        signal = evaluate_func()
+        self.states[market] = SignalState(price, position, buckets, signal, now)
+        self.evaluated_count += 1
+        self.reason_counts[reason] += 1
+        return signal
+
+    def invalidate(self, market=None):
+        """저장된 상태 제거 (market이 없으면 전체), 다음 틱에 다시 평가"""
+        if market is None:
+            self.states.clear()
+        else:
+            self.states.pop(market, None)
+
+    def get_stats(self):
+        """평가/재사용 통계"""
+        total = self.evaluated_count + self.skipped_count
+        return {
+            'evaluated': self.evaluated_count,
+            'skipped': self.skipped_count,
+            'skip_rate': self.skipped_count / total if total else 0.0,
+            'reasons': dict(self.reason_counts),
+        }
+
+    def log_stats(self, name="매매 신호"):
+        """평가/재사용 통계 로그"""
+        stats = self.get_stats()
+        reasons = ', '.join(f"{reason} {count}" for reason, count in stats['reasons'].items() if count)
+        log.log('TR', (
+            f"{name}: 평가 {stats['evaluated']}회, 재사용 {stats['skipped']}회 ({stats['skip_rate']:.1%})"
+            + (f", 평가 사유: {reasons}" if reasons else "")
+        ))
@@ -1,4 +1,8 @@
 class BaseStrategy:
+    # 엔진에서 받을 이벤트 ('tick', 'candle_close', 'fill')와 신호에 쓰는 캔들 간격 (마감 시 재평가)
+    SUBSCRIPTIONS = ()
+    CANDLE_INTERVALS = ()
+    
     def __init__(self):
         self.position = None
         self.entry_price = None
@@ -8,12 +12,12 @@ class BaseStrategy:
         """API 클라이언트 설정"""
         self.client = client
         
-    def get_ohlcv(self, market):
-        """기본 OHLCV 데이터 조회"""
+    def get_ohlcv(self, market, interval='day', count=200):
+        """기본 OHLCV 데이터 조회 (캔들 저장소에서 새 캔들만 증분 조회)"""
         try:
             if self.client is None:
                 raise Exception("API client not initialized")
-            return self.client.get_ohlcv(market)
+            return self.client.candle_store.get_dataframe(market, interval, count)
         except Exception as e:
             return None
     
@@ -34,6 +38,21 @@ class BaseStrategy:
         """기본 매매 신호 생성 (오버라이드 필요)"""
         raise NotImplementedError
     
+    def on_tick(self, event):
+        """현재가 변경 이벤트 처리, 매매 신호 반환 (오버라이드 필요)"""
+        return 'HOLD'
+    
+    def on_candle_close(self, event):
+        """캔들 마감 이벤트 처리, 매매 신호 반환 (오버라이드 필요)"""
+        return 'HOLD'
+    
+    def on_fill(self, event):
+        """체결 이벤트 처리 (기본: 포지션 반영)"""
+        if event.side == 'bid':
+            self.enter_position(event.price)
+        else:
+            self.exit_position()
+    
     def check_position(self, current_price):
         """포지션 상태 확인"""
         if self.position and self.entry_price:
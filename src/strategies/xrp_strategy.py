@@ -1,13 +1,21 @@
+import numpy as np
 from src.strategies.base_strategy import BaseStrategy
 from config.coins.xrp_config import XRPConfig
 from config.config import Config
 from utils.logger import log
+from src import indicator_kernels as kernels
+from src.indicator_cache import indicator_cache
+from src.streaming_indicators import IndicatorEngine, TargetPrice, VolumeTrend, MovingAverage, Bollinger, RSI
 from datetime import datetime
 
 class XRPStrategy(BaseStrategy):
-    def __init__(self):
+    DEFAULT_CONFIG = XRPConfig
+    SUBSCRIPTIONS = ('tick', 'fill')
+    CANDLE_INTERVALS = ('day',)
+    
+    def __init__(self, config=None):
         super().__init__()
-        self.config = XRPConfig
+        self.config = config or self.DEFAULT_CONFIG
         self.balance = 0  # 보유 현금
         self.coin_balance = 0  # 보유 코인
         self.position = False  # 포지션 상태
@@ -37,57 +45,120 @@ class XRPStrategy(BaseStrategy):
             return 0
         return ((current_price - self.position_price) / self.position_price) * 100
     
-    def calculate_rsi(self, df, period=14):
-        """RSI 계산 함수"""
+    def compute_indicator_arrays(self, candles):
+        """(마켓 × 캔들) 배열로 XRP 전략 지표를 모든 마켓에 대해 한 번에 계산"""
+        close, volume = candles['close'], candles['volume']
+        columns = {field: candles[field] for field in ('open', 'high', 'low', 'close', 'volume')}
+        
+        columns['RANGE'] = candles['high'] - candles['low']
+        columns['TARGET'] = candles['open'] + kernels.shift(columns['RANGE']) * self.config.VOLATILITY_FACTOR
+        
+        # 거래량 분석 (5일 이동평균 및 전일 대비 증감)
+        columns['VOL_MA5'] = kernels.sma(volume, 5)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            columns['VOL_RATIO'] = volume / columns['VOL_MA5']
+        columns['VOL_CHANGE'] = kernels.volume_change(volume)
+        
+        for period in self.config.MA_PERIODS:
+            columns[f'MA{period}'] = kernels.sma(close, period)
+        
+        mid, upper, lower, std = kernels.bollinger(close, self.config.BB_PERIOD, self.config.BB_WIDTH)
+        columns.update(BB_MID=mid, BB_UPPER=upper, BB_LOWER=lower, BB_STD=std)
+        columns['RSI'] = kernels.rsi(close, self.config.RSI_PERIOD)
+        return columns
+    
+    def get_indicator_params(self):
+        """지표 구성 파라미터 (자동 조정되면 캐시 키가 바뀌어 새로 계산)"""
+        return (
+            'xrp', self.config.VOLATILITY_FACTOR, tuple(self.config.MA_PERIODS),
+            self.config.BB_PERIOD, self.config.BB_WIDTH, self.config.RSI_PERIOD,
+        )
+    
+    def build_engine(self):
+        """증분 지표 계산기 생성"""
+        indicators = [
+            TargetPrice(self.config.VOLATILITY_FACTOR),
+            VolumeTrend(5),  # 5일 거래량 이동평균 및 전일 대비 증감
+        ]
+        indicators += [MovingAverage(period) for period in self.config.MA_PERIODS]
+        indicators += [
+            Bollinger(self.config.BB_PERIOD, self.config.BB_WIDTH),
+            RSI(self.config.RSI_PERIOD),
+        ]
+        return IndicatorEngine(indicators)
+    
+    def calculate_indicators(self, market):
+        """XRP 특화 지표 (마감 캔들 상태는 캐시에서 재사용하고 형성 중인 캔들만 반영)"""
         try:
-            delta = df['close'].diff()
-            gain = delta.where(delta > 0, 0)
-            loss = -delta.where(delta < 0, 0)
+            if self.client is None:
+                raise Exception("API client not initialized")
+            view = self.client.candle_store.get_view(market, 'day')
+            if len(view) == 0:
+                return None
             
-            avg_gain = gain.rolling(window=period).mean()
-            avg_loss = loss.rolling(window=period).mean()
+            return indicator_cache.get_indicators(
+                market, 'day', self.get_indicator_params(), view.arrays, self.build_engine
+            )
             
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-            return rsi
         except Exception as e:
-            log.log('WA', f"RSI 계산 중 오류: {str(e)}")
+            log.log('WA', f"지표 계산 중 오류: {str(e)}")
             return None
     
-    def calculate_indicators(self, market):
-        """XRP 특화 지표"""
-        try:
-            df = self.get_ohlcv(market)
-            if df is None or df.empty:
-                return None
+    def evaluate_signal(self, current_price, indicators):
+        """현재가와 지표로 매매 조건 평가 (포지션은 변경하지 않음)"""
+        # 매수 신호
+        if not self.position:
+            # RSI 조건
+            rsi_buy_condition = indicators['RSI'] <= self.config.RSI_BUY
             
-            # XRP 특화 지표 계산
-            df['RANGE'] = df['high'] - df['low']
-            df['TARGET'] = df['open'] + df['RANGE'].shift(1) * self.config.VOLATILITY_FACTOR
+            # 볼린저 밴드 하단 조건
+            bb_lower_condition = current_price <= indicators['BB_LOWER']
             
-            # 거래량 분석 (5일 이동평균 및 전일 대비 증감)
-            df['VOL_MA5'] = df['volume'].rolling(window=5).mean()
-            df['VOL_RATIO'] = df['volume'] / df['VOL_MA5']
-            df['VOL_CHANGE'] = df['volume'].pct_change()  # 전일 대비 거래량 변화율
+            # 거래량 증가 조건
+            volume_increase_condition = indicators['VOL_CHANGE'] > 0
             
-            # 이동평균선
-            for period in self.config.MA_PERIODS:
-                df[f'MA{period}'] = df['close'].rolling(window=period).mean()
+            # 매수 조건 로깅
+            log.system_log('INFO', f"=== 매수 조건 검토 ===")
+            log.system_log('INFO', f"RSI: {indicators['RSI']:.2f} (기준: {self.config.RSI_BUY} 이하) - {rsi_buy_condition}")
+            log.system_log('INFO', f"볼린저 밴드 하단: {indicators['BB_LOWER']:.2f} (현재가: {current_price:.2f}) - {bb_lower_condition}")
+            log.system_log('INFO', f"거래량 증가 여부: {volume_increase_condition} (변화율: {indicators['VOL_CHANGE']*100:.2f}%)")
             
-            # 볼린저 밴드
-            df['BB_MID'] = df['close'].rolling(window=self.config.BB_PERIOD).mean()
-            df['BB_STD'] = df['close'].rolling(window=self.config.BB_PERIOD).std()
-            df['BB_UPPER'] = df['BB_MID'] + df['BB_STD'] * self.config.BB_WIDTH
-            df['BB_LOWER'] = df['BB_MID'] - df['BB_STD'] * self.config.BB_WIDTH
+            # 모든 조건 충족 시 매수
+            if rsi_buy_condition and bb_lower_condition and volume_increase_condition:
+                log.system_log('INFO', "✅ 모든 매수 조건 충족!")
+                return 'BUY'
             
-            # RSI 지표 계산 추가
-            df['RSI'] = self.calculate_rsi(df)
+        # 매도 신호
+        else:
+            profit_rate = self.check_position(current_price)
             
-            return df.iloc[-1]
+            # RSI 조건
+            rsi_sell_condition = indicators['RSI'] >= self.config.RSI_SELL
             
-        except Exception as e:
-            log.log('WA', f"지표 계산 중 오류: {str(e)}")
-            return None
+            # 볼린저 밴드 상단 조건
+            bb_upper_condition = current_price >= indicators['BB_UPPER']
+            
+            # 거래량 증가 조건
+            volume_increase_condition = indicators['VOL_CHANGE'] > 0
+            
+            # 매도 조건 로깅
+            log.system_log('INFO', f"=== 매도 조건 검토 ===")
+            log.system_log('INFO', f"수익률: {profit_rate:.2f}%")
+            log.system_log('INFO', f"RSI: {indicators['RSI']:.2f} (기준: {self.config.RSI_SELL} 이상) - {rsi_sell_condition}")
+            log.system_log('INFO', f"볼린저 밴드 상단: {indicators['BB_UPPER']:.2f} (현재가: {current_price:.2f}) - {bb_upper_condition}")
+            log.system_log('INFO', f"거래량 증가 여부: {volume_increase_condition} (변화율: {indicators['VOL_CHANGE']*100:.2f}%)")
+            
+            # 익절/손절 (기존 조건 유지)
+            if profit_rate >= self.config.PROFIT_RATE or profit_rate <= -self.config.LOSS_RATE:
+                log.system_log('INFO', f"익절/손절 조건 충족 (수익률: {profit_rate:.2f}%)")
+                return 'SELL'
+            
+            # 모든 조건 충족 시 매도
+            if rsi_sell_condition and bb_upper_condition and volume_increase_condition:
+                log.system_log('INFO', "✅ 모든 매도 조건 충족!")
+                return 'SELL'
+            
+        return 'HOLD'
     
     def get_trading_signal(self, market):
         """매매 신호 생성"""
@@ -100,67 +171,28 @@ class XRPStrategy(BaseStrategy):
             if indicators is None:
                 return 'HOLD'
             
-            # 매수 신호
-            if not self.position:
-                # RSI 조건
-                rsi_buy_condition = indicators['RSI'] <= 25
-                
-                # 볼린저 밴드 하단 조건
-                bb_lower_condition = current_price <= indicators['BB_LOWER']
-                
-                # 거래량 증가 조건
-                volume_increase_condition = indicators['VOL_CHANGE'] > 0
-                
-                # 매수 조건 로깅
-                log.system_log('INFO', f"=== 매수 조건 검토 ===")
-                log.system_log('INFO', f"RSI: {indicators['RSI']:.2f} (기준: 25 이하) - {rsi_buy_condition}")
-                log.system_log('INFO', f"볼린저 밴드 하단: {indicators['BB_LOWER']:.2f} (현재가: {current_price:.2f}) - {bb_lower_condition}")
-                log.system_log('INFO', f"거래량 증가 여부: {volume_increase_condition} (변화율: {indicators['VOL_CHANGE']*100:.2f}%)")
-                
-                # 모든 조건 충족 시 매수
-                if rsi_buy_condition and bb_lower_condition and volume_increase_condition:
-                    log.system_log('INFO', "✅ 모든 매수 조건 충족!")
-                    self.enter_position(current_price)
-                    return 'BUY'
-            
-            # 매도 신호
-            else:
-                profit_rate = self.check_position(current_price)
-                
-                # RSI 조건
-                rsi_sell_condition = indicators['RSI'] >= 75
-                
-                # 볼린저 밴드 상단 조건
-                bb_upper_condition = current_price >= indicators['BB_UPPER']
-                
-                # 거래량 증가 조건
-                volume_increase_condition = indicators['VOL_CHANGE'] > 0
-                
-                # 매도 조건 로깅
-                log.system_log('INFO', f"=== 매도 조건 검토 ===")
-                log.system_log('INFO', f"수익률: {profit_rate:.2f}%")
-                log.system_log('INFO', f"RSI: {indicators['RSI']:.2f} (기준: 75 이상) - {rsi_sell_condition}")
-                log.system_log('INFO', f"볼린저 밴드 상단: {indicators['BB_UPPER']:.2f} (현재가: {current_price:.2f}) - {bb_upper_condition}")
-                log.system_log('INFO', f"거래량 증가 여부: {volume_increase_condition} (변화율: {indicators['VOL_CHANGE']*100:.2f}%)")
-                
-                # 익절/손절 (기존 조건 유지)
-                if profit_rate >= self.config.PROFIT_RATE or profit_rate <= -self.config.LOSS_RATE:
-                    log.system_log('INFO', f"익절/손절 조건 충족 (수익률: {profit_rate:.2f}%)")
-                    self.exit_position()
-                    return 'SELL'
-                
-                # 모든 조건 충족 시 매도
-                if rsi_sell_condition and bb_upper_condition and volume_increase_condition:
-                    log.system_log('INFO', "✅ 모든 매도 조건 충족!")
-                    self.exit_position()
-                    return 'SELL'
-            
-            return 'HOLD'
+            signal = self.evaluate_signal(current_price, indicators)
+            if signal == 'BUY':
+                self.enter_position(current_price)
+            elif signal == 'SELL':
+                self.exit_position()
+            return signal
             
         except Exception as e:
             log.log('WA', f"매매 신호 생성 중 오류: {str(e)}")
             return 'HOLD'
     
+    def on_tick(self, event):
+        """현재가 변경 시 매매 조건 평가 (포지션은 체결 이벤트로 반영)"""
+        try:
+            indicators = self.calculate_indicators(event.market)
+            if indicators is None:
+                return 'HOLD'
+            return self.evaluate_signal(event.price, indicators)
+        except Exception as e:
+            log.log('WA', f"{event.market} 틱 이벤트 처리 중 오류: {str(e)}")
+            return 'HOLD'
+    
     def check_ma_trend(self, indicators):
         """이동평균선 정배열 확인"""
         try:
@@ -1,13 +1,31 @@
 import pyupbit
-import pandas as pd
-import numpy as np
 from utils.logger import log
 from config.config import Config
+from src.market_context import MarketDataContext
+from src.candle_resampler import LocalTimeframes
+from src.candle_store import dataframe_to_arrays
+from src.indicator_cache import indicator_cache
+from src.streaming_indicators import (
+    IndicatorEngine, MovingAverage, VolumeTrend, MACD, RSI, Bollinger, ATR, ADX, RateOfChange,
+)
+
+# 신호 1회 계산에 필요한 (간격, 캔들 수) - 같은 간격은 한 번만 조회해 잘라 쓴다
+DATA_REQUIREMENTS = [
+    ('day', 40),       # 지표(period*2), 변동성/거래량/추세 강도(20), 일봉 추세(40)
+    ('minute60', 40),  # 1시간봉 추세
+    ('minute10', 40),  # 10분봉 추세
+]
+
+# build_engine() 지표 구성 (지표 캐시 키): MA, 거래량 MA, MACD, RSI, 볼린저, ATR, ADX, ROC
+INDICATOR_PARAMS = ('trading', (5, 10, 20), (5, 20), (12, 26, 9), 14, (20, 2.0), 20, 20, 12)
 
 class TradingStrategy:
     def __init__(self):
         self.position = None
         self.entry_price = None
+        self.client = None
+        self.context = None  # 틱 단위 캔들 공유 컨텍스트
+        self.timeframes = {}  # 마켓별 로컬 다중 시간대 캔들 (1분봉으로 생성)
         # 추가할 속성들
         self.trade_count = 0          # 거래 횟수
         self.win_count = 0            # 수익 거래 수
@@ -16,49 +34,102 @@ class TradingStrategy:
         self.max_loss = 0             # 최대 손실률
         self.consecutive_losses = 0    # 연속 손실 횟수
         
+    def set_client(self, client):
+        """API 클라이언트 설정"""
+        self.client = client
+    
+    def get_timeframes(self, market):
+        """마켓별 로컬 다중 시간대 캔들 (없으면 생성)"""
+        if market not in self.timeframes:
+            intervals = tuple(interval for interval, _ in DATA_REQUIREMENTS)
+            self.timeframes[market] = LocalTimeframes(self.client, market, intervals)
+        return self.timeframes[market]
+    
+    def fetch_ohlcv(self, market, interval, count):
+        """캔들 조회 (로컬 생성 가능하면 1분봉 증분 조회만 사용, 클라이언트가 없으면 pyupbit 사용)"""
+        if self.client is not None:
+            if Config.USE_LOCAL_RESAMPLING:
+                timeframes = self.get_timeframes(market)
+                if timeframes.supports(interval, count):
+                    return timeframes.get_dataframe(interval, count)
+            return self.client.get_ohlcv(interval=interval, count=count, market=market)
+        return pyupbit.get_ohlcv(market, interval=interval, count=count)
+    
+    def get_ohlcv(self, market, interval, count):
+        """캔들 조회 (틱 컨텍스트가 있으면 공유 데이터에서 최근 count개 사용)"""
+        if self.context is not None:
+            return self.context.get(market, interval, count)
+        return self.fetch_ohlcv(market, interval, count)
+    
+    def get_current_price(self, market):
+        """현재가 조회"""
+        if self.client is not None:
+            return self.client.get_current_price(market)
+        return pyupbit.get_current_price(market)
+    
+    def build_engine(self):
+        """간격별 증분 지표 계산기 생성"""
+        return IndicatorEngine([
+            MovingAverage(5), MovingAverage(10), MovingAverage(20),
+            MovingAverage(5, field='volume', name='VMA5'),
+            VolumeTrend(20, names=('VMA20', 'Volume_Ratio', 'Volume_Change')),
+            MACD(12, 26, 9),
+            RSI(14, wilder=True),
+            Bollinger(20, 2.0, names=('Middle', 'Upper', 'Lower', 'BB_STD')),
+            ATR(20),
+            ADX(20),
+            RateOfChange(12),
+        ])
+    
+    def get_indicators(self, market, interval="day", count=40):
+        """(마켓, 간격)별 지표 (마감 캔들 상태는 캐시에서 재사용하고 형성 중인 캔들만 반영)
+
+        계산기는 처음 받은 캔들로 초기화되므로 틱에서 조회하는 최대 개수 이상으로 조회한다.
+        """
+        market = market or Config.MARKET
+        count = max(count, dict(DATA_REQUIREMENTS).get(interval, count))
+        df = self.get_ohlcv(market, interval, count)
+        if df is None or df.empty:
+            return None
+        return indicator_cache.get_indicators(
+            market, interval, INDICATOR_PARAMS, dataframe_to_arrays(df), self.build_engine
+        )
+    
     def calculate_indicators(self, market, period=20):
-        """기존 지표에 추가할 지표들"""
+        """일봉 추세/거래량/변동성/모멘텀 지표"""
         try:
-            df = pyupbit.get_ohlcv(market, interval="day", count=period*2)
-            
-            # 1. 추세 지표
-            df['EMA12'] = df['close'].ewm(span=12).mean()
-            df['EMA26'] = df['close'].ewm(span=26).mean()
-            df['MACD'] = df['EMA12'] - df['EMA26']
-            df['Signal'] = df['MACD'].ewm(span=9).mean()
-            
-            # 2. 거래량 지표
-            df['VMA20'] = df['volume'].rolling(window=20).mean()
-            df['Volume_Ratio'] = df['volume'] / df['VMA20']
-            
-            # 3. 변동성 지표
-            df['ATR'] = self.calculate_atr(df)
-            
-            # 4. 모멘텀 지표
-            df['ROC'] = df['close'].pct_change(periods=12) * 100
-            
-            return df.iloc[-1]
-            
+            return self.get_indicators(market, "day", period*2)
         except Exception as e:
             log.log('WA', f"지표 계산 중 오류: {str(e)}")
             return None
             
     def get_trading_signal(self, market):
-        """매매 신호 생성"""
+        """매매 신호 생성 (간격별 캔들은 틱마다 한 번만 조회)"""
+        self.context = MarketDataContext(self.fetch_ohlcv)
+        try:
+            for interval, count in DATA_REQUIREMENTS:
+                self.context.require(market, interval, count)
+            self.context.prefetch()
+            return self.evaluate_signal(market)
+        finally:
+            self.context = None
+    
+    def evaluate_signal(self, market):
+        """매매 신호 계산"""
         try:
             # 1. 시장 상황 분석
-            market_condition = self.analyze_market_condition()
+            market_condition = self.analyze_market_condition(market)
             if market_condition == 'HIGH_RISK':
                 return 'HOLD'
             
             # 2. 다중 시간대 분석
-            daily_trend = self.analyze_trend("day")
-            hourly_trend = self.analyze_trend("minute60")
-            minute10_trend = self.analyze_trend("minute10")
+            daily_trend = self.analyze_trend("day", market)
+            hourly_trend = self.analyze_trend("minute60", market)
+            minute10_trend = self.analyze_trend("minute10", market)
             
             # 3. 지표 계산
             indicators = self.calculate_indicators(market)
-            current_price = pyupbit.get_current_price(market)
+            current_price = self.get_current_price(market)
             
             # 매수 신호 강화
             buy_signals = 0  # 매수 신호 카운트
@@ -128,21 +199,21 @@ class TradingStrategy:
             log.log('WA', f"신호 생성 중 오류: {str(e)}")
             return 'HOLD'
     
-    def analyze_market_condition(self):
+    def analyze_market_condition(self, market=None):
         """시장 상황 분석"""
         try:
             # 1. 변동성 체크
-            volatility = self.calculate_volatility()
+            volatility = self.calculate_volatility(market=market)
             if volatility > Config.MAX_VOLATILITY:
                 return 'HIGH_RISK'
             
             # 2. 거래량 체크
-            volume_trend = self.analyze_volume_trend()
+            volume_trend = self.analyze_volume_trend(market=market)
             if volume_trend == 'DECREASING':
                 return 'LOW_VOLUME'
             
             # 3. 추세 강도 체크
-            trend_strength = self.calculate_trend_strength()
+            trend_strength = self.calculate_trend_strength(market=market)
             if trend_strength < Config.MIN_TREND_STRENGTH:
                 return 'WEAK_TREND'
             
@@ -164,24 +235,14 @@ class TradingStrategy:
             self.consecutive_losses += 1
             self.max_loss = min(self.max_loss, profit_rate)
     
-    def calculate_volatility(self, period=20):
-        """변동성 계산"""
+    def calculate_volatility(self, period=20, market=None):
+        """변동성 계산 (ATR / 현재가)"""
         try:
-            df = pyupbit.get_ohlcv(Config.MARKET, interval="day", count=period)
-            if df is None:
+            indicators = self.get_indicators(market, "day", period)
+            if indicators is None:
                 return float('inf')
             
-            # True Range 계산
-            df['H-L'] = df['high'] - df['low']
-            df['H-PC'] = abs(df['high'] - df['close'].shift(1))
-            df['L-PC'] = abs(df['low'] - df['close'].shift(1))
-            df['TR'] = df[['H-L', 'H-PC', 'L-PC']].max(axis=1)
-            
-            # ATR (Average True Range) 계산
-            df['ATR'] = df['TR'].rolling(window=period).mean()
-            
-            # 현재 변동성 (ATR / 현재가)
-            current_volatility = df['ATR'].iloc[-1] / df['close'].iloc[-1]
+            current_volatility = indicators['ATR'] / indicators['close']
             
             log.log('TR', f"현재 변동성: {current_volatility:.4f}")
             return current_volatility
@@ -190,21 +251,17 @@ class TradingStrategy:
             log.log('WA', f"변동성 계산 중 오류: {str(e)}")
             return float('inf')
     
-    def analyze_volume_trend(self, period=20):
+    def analyze_volume_trend(self, period=20, market=None):
         """거래량 추세 분석"""
         try:
-            df = pyupbit.get_ohlcv(Config.MARKET, interval="day", count=period)
-            if df is None:
+            indicators = self.get_indicators(market, "day", period)
+            if indicators is None:
                 return 'DECREASING'
             
-            # 거래량 이동평균
-            df['VMA5'] = df['volume'].rolling(window=5).mean()
-            df['VMA20'] = df['volume'].rolling(window=20).mean()
-            
             # 거래량 추세 판단
-            current_volume = df['volume'].iloc[-1]
-            vma5 = df['VMA5'].iloc[-1]
-            vma20 = df['VMA20'].iloc[-1]
+            current_volume = indicators['volume']
+            vma5 = indicators['VMA5']
+            vma20 = indicators['VMA20']
             
             if current_volume > vma5 and vma5 > vma20:
                 return 'INCREASING'
@@ -217,34 +274,14 @@ class TradingStrategy:
             log.log('WA', f"거래량 분석 중 오류: {str(e)}")
             return 'DECREASING'
     
-    def calculate_trend_strength(self, period=20):
-        """추세 강도 계산"""
+    def calculate_trend_strength(self, period=20, market=None):
+        """추세 강도 계산 (ADX)"""
         try:
-            df = pyupbit.get_ohlcv(Config.MARKET, interval="day", count=period)
-            if df is None:
+            indicators = self.get_indicators(market, "day", period)
+            if indicators is None:
                 return 0
             
-            # ADX (Average Directional Index) 계산
-            df['TR'] = self.calculate_true_range(df)
-            df['DM+'] = self.calculate_directional_movement(df, direction='plus')
-            df['DM-'] = self.calculate_directional_movement(df, direction='minus')
-            
-            # Smoothed ATR
-            df['ATR'] = df['TR'].rolling(window=period).mean()
-            
-            # Smoothed DM
-            df['DM+_smooth'] = df['DM+'].rolling(window=period).mean()
-            df['DM-_smooth'] = df['DM-'].rolling(window=period).mean()
-            
-            # Directional Indicators
-            df['DI+'] = 100 * (df['DM+_smooth'] / df['ATR'])
-            df['DI-'] = 100 * (df['DM-_smooth'] / df['ATR'])
-            
-            # ADX
-            df['DX'] = 100 * abs(df['DI+'] - df['DI-']) / (df['DI+'] + df['DI-'])
-            df['ADX'] = df['DX'].rolling(window=period).mean()
-            
-            trend_strength = df['ADX'].iloc[-1] / 100  # 0~1 사이 값으로 정규화
+            trend_strength = indicators['ADX'] / 100  # 0~1 사이 값으로 정규화
             
             log.log('TR', f"추세 강도: {trend_strength:.4f}")
             return trend_strength
@@ -253,55 +290,21 @@ class TradingStrategy:
             log.log('WA', f"추세 강도 계산 중 오류: {str(e)}")
             return 0
     
-    def calculate_true_range(self, df):
-        """True Range 계산"""
-        high = df['high']
-        low = df['low']
-        close = df['close'].shift(1)
-        
-        ranges = [high - low, 
-                 abs(high - close),
-                 abs(low - close)]
-        
-        return pd.concat(ranges, axis=1).max(axis=1)
-    
-    def calculate_directional_movement(self, df, direction='plus'):
-        """Directional Movement 계산"""
-        high = df['high']
-        low = df['low']
-        
-        if direction == 'plus':
-            dm = high - high.shift(1)
-            dm[dm < 0] = 0
-            dm[(low.shift(1) - low) > (high - high.shift(1))] = 0
-        else:
-            dm = low.shift(1) - low
-            dm[dm < 0] = 0
-            dm[(high - high.shift(1)) > (low.shift(1) - low)] = 0
-            
-        return dm
-    
-    def analyze_trend(self, interval="day"):
+    def analyze_trend(self, interval="day", market=None):
         """다중 시간대 추세 분석"""
         try:
-            df = pyupbit.get_ohlcv(Config.MARKET, interval=interval, count=40)
-            if df is None:
+            indicators = self.get_indicators(market, interval, 40)
+            if indicators is None:
                 return 'UNKNOWN'
             
-            # 1. 이동평균선 배열
-            df['MA5'] = df['close'].rolling(window=5).mean()
-            df['MA10'] = df['close'].rolling(window=10).mean()
-            df['MA20'] = df['close'].rolling(window=20).mean()
-            
-            # 2. 이동평균선 정배열/역배열 확인
-            last_idx = -1
-            ma_trend = (df['MA5'].iloc[last_idx] > df['MA10'].iloc[last_idx] > df['MA20'].iloc[last_idx])
-            ma_reverse = (df['MA5'].iloc[last_idx] < df['MA10'].iloc[last_idx] < df['MA20'].iloc[last_idx])
+            # 1. 이동평균선 정배열/역배열 확인
+            ma_trend = (indicators['MA5'] > indicators['MA10'] > indicators['MA20'])
+            ma_reverse = (indicators['MA5'] < indicators['MA10'] < indicators['MA20'])
             
-            # 3. 캔들 패턴 분석
-            candle_pattern = self.analyze_candle_pattern(df.iloc[last_idx])
+            # 2. 캔들 패턴 분석
+            candle_pattern = self.analyze_candle_pattern(indicators)
             
-            # 4. 추세 판단
+            # 3. 추세 판단
             if ma_trend and candle_pattern == 'BULLISH':
                 return 'STRONG_UP'
             elif ma_trend:
@@ -0,0 +1,150 @@
+import time
+
+from utils.logger import log
+from src.candle_store import INTERVAL_SECONDS
+from src.signal_gate import SignalGate
+
+EVENT_TYPES = ('tick', 'candle_close', 'fill')
+
+
+class TickEvent:
+    """현재가 변경 이벤트"""
+    def __init__(self, market, price, previous_price=None):
+        self.market = market
+        self.price = price
+        self.previous_price = previous_price
+        self.time = time.time()
+
+
+class CandleCloseEvent:
+    """캔들 마감 이벤트 (candles는 마감 캔들과 새로 형성 중인 캔들까지 포함한 과거순 뷰)"""
+    def __init__(self, market, interval, closed_ts, candles):
+        self.market = market
+        self.interval = interval
+        self.closed_ts = closed_ts
+        self.candles = candles
+
+
+class FillEvent:
+    """주문 체결 이벤트 (side: 'bid' 매수, 'ask' 매도)"""
+    def __init__(self, market, side, price, volume, fee=0.0, uuid=None):
+        self.market = market
+        self.side = side
+        self.price = price
+        self.volume = volume
+        self.fee = fee
+        self.uuid = uuid
+
+
+class StrategyEventEngine:
+    """마켓별 전략에 틱/캔들 마감/체결 이벤트를 전달하는 엔진
+
+    전략은 SUBSCRIPTIONS로 받을 이벤트를, CANDLE_INTERVALS로 마감 이벤트를 받을 간격을 선언한다.
+    틱 이벤트는 신호 게이트가 재평가가 필요하다고 판단한 마켓에만 보내고 (그 외에는 이전 신호 재사용),
+    캔들 마감 이벤트는 간격 경계를 넘은 마켓에만 보내므로 입력이 그대로인 전략은 평가하지 않는다.
+    """
+    def __init__(self, client, gate=None):
+        self.client = client
+        self.gate = gate or SignalGate()
+        self.strategies = {}       # 마켓 -> 전략
+        self.last_prices = {}      # 마켓 -> 마지막으로 전달한 현재가
+        self.last_buckets = {}     # (마켓, 간격) -> 마지막으로 확인한 캔들 시작 시각
+        self.dispatch_count = {event_type: 0 for event_type in EVENT_TYPES}
+
+    @staticmethod
+    def subscribes(strategy, event_type):
+        """전략이 이벤트를 구독하는지 확인"""
+        return event_type in getattr(strategy, 'SUBSCRIPTIONS', ())
+
+    def register(self, market, strategy):
+        """마켓 전략 등록"""
+        self.strategies[market] = strategy
+
+    def dispatch(self, event_type, strategy, event):
+        """전략 콜백 호출, 매매 신호 반환 (오류 시 HOLD)"""
+        self.dispatch_count[event_type] += 1
+        try:
+            return getattr(strategy, f'on_{event_type}')(event) or 'HOLD'
+        except Exception as e:
+            log.log('WA', f"{event.market} {event_type} 이벤트 처리 중 오류: {str(e)}")
+            return 'HOLD'
+
+    def check_candle_close(self, market, strategy, now):
+        """구독 간격의 캔들이 마감됐으면 마감 이벤트 전달, 매매 신호 반환"""
+        signal = 'HOLD'
+        for interval in getattr(strategy, 'CANDLE_INTERVALS', ()):
+            seconds = INTERVAL_SECONDS[interval]
+            bucket = int(now) // seconds * seconds
+            previous = self.last_buckets.get((market, interval))
+            self.last_buckets[(market, interval)] = bucket
+            if previous is None or bucket == previous:
+                continue
+            buffer = self.client.candle_store.get_buffer(market, interval)
+            with buffer.lock:
+                self.client.candle_store.update(market, interval, force=True)
+                candles = buffer.view()
+            result = self.dispatch('candle_close', strategy, CandleCloseEvent(market, interval, previous, candles))
+            if result != 'HOLD':
+                signal = result
+        return signal
+
+    def process_market(self, market, price):
+        """마켓 하나의 틱 처리, 매매 신호 반환"""
+        strategy = self.strategies.get(market)
+        if strategy is None:
+            return 'HOLD'
+        signal = 'HOLD'
+        if self.subscribes(strategy, 'candle_close'):
+            signal = self.check_candle_close(market, strategy, time.time())
+
+        if price is not None and self.subscribes(strategy, 'tick'):
+            result = self.gate.evaluate(
+                market, price, getattr(strategy, 'position', None),
+                getattr(strategy, 'CANDLE_INTERVALS', ()),
+                lambda: self.dispatch_tick(market, strategy, price),
+            )
+            if result != 'HOLD':
+                signal = result
+        return signal
+
+    def process_tick(self, prices):
+        """틱 처리 ({마켓: 현재가}), 이벤트를 받은 전략의 매매 신호 반환 ({마켓: 신호}, HOLD 제외)"""
+        signals = {}
+        for market in self.strategies:
+            signal = self.process_market(market, prices.get(market))
+            if signal != 'HOLD':
+                signals[market] = signal
+        return signals
+
+    def dispatch_tick(self, market, strategy, price):
+        """틱 이벤트 전달"""
+        previous = self.last_prices.get(market)
+        self.last_prices[market] = price
+        return self.dispatch('tick', strategy, TickEvent(market, price, previous))
+
+    def publish_fill(self, fill):
+        """체결 이벤트 전달"""
+        strategy = self.strategies.get(fill.market)
+        if strategy is not None and self.subscribes(strategy, 'fill'):
+            self.dispatch('fill', strategy, fill)
+        # 포지션이 바뀌었으니 다음 틱은 현재가가 같아도 다시 평가
+        self.gate.invalidate(fill.market)
+
+    def get_stats(self):
+        """이벤트 전달 통계"""
+        return {
+            'markets': len(self.strategies),
+            'ticks': self.dispatch_count['tick'],
+            'candle_closes': self.dispatch_count['candle_close'],
+            'fills': self.dispatch_count['fill'],
+            'skipped_ticks': self.gate.skipped_count,
+        }
+
+    def log_stats(self):
+        """이벤트 전달 통계 로그"""
+        stats = self.get_stats()
+        log.log('TR', (
+            f"전략 이벤트: 마켓 {stats['markets']}개, 틱 {stats['ticks']}회 (재사용 {stats['skipped_ticks']}회), "
+            f"캔들 마감 {stats['candle_closes']}회, 체결 {stats['fills']}회"
+        ))
+        self.gate.log_stats()
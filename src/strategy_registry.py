@@ -0,0 +1,84 @@
+from config.config import Config
+from config.coins.xrp_config import XRPConfig
+from config.coins.btc_config import BTCConfig
+from utils.logger import log
+from src.strategies.xrp_strategy import XRPStrategy
+
+# 설정의 strategy 이름 -> 전략 클래스
+STRATEGIES = {
+    'xrp': XRPStrategy,
+}
+
+# 설정의 config 이름 -> 코인 설정 클래스
+COIN_CONFIGS = {
+    'XRPConfig': XRPConfig,
+    'BTCConfig': BTCConfig,
+}
+
+
+def register_strategy(name, strategy_class):
+    """전략 클래스 등록"""
+    STRATEGIES[name] = strategy_class
+
+
+def register_config(name, config_class):
+    """코인 설정 클래스 등록"""
+    COIN_CONFIGS[name] = config_class
+
+
+class StrategyRegistry:
+    """설정의 마켓 목록(코인 티커 -> 전략/설정/파라미터)으로 마켓별 트레이더 생성
+
+    모든 트레이더는 하나의 클라이언트(커넥션 풀, 요청 제한, 계좌/시세 스냅샷, 캔들 저장소)를 공유하고,
+    마켓마다 늘어나는 것은 전략 객체와 설정 클래스뿐이다.
+    """
+    def __init__(self, markets=None):
+        self.markets = Config.TRADING_MARKETS if markets is None else markets
+
+    @staticmethod
+    def build_config(ticker, spec, strategy_class):
+        """마켓 설정 클래스 생성 (파라미터 > 코인 설정 > 전략 기본 설정 순으로 적용)"""
+        bases = []
+        if spec.get('config'):
+            if spec['config'] not in COIN_CONFIGS:
+                raise ValueError(f"알 수 없는 코인 설정: {spec['config']}")
+            bases.append(COIN_CONFIGS[spec['config']])
+        if strategy_class.DEFAULT_CONFIG not in bases:
+            bases.append(strategy_class.DEFAULT_CONFIG)
+        attrs = {
+            'COIN_TICKER': ticker,
+            'MARKET': f'{Config.CURRENCY}-{ticker}',
+        }
+        attrs.update(spec.get('params', {}))
+        return type(f'{ticker}Config', tuple(bases), attrs)
+
+    def create_trader(self, ticker, spec, client):
+        """마켓 하나의 트레이더 생성"""
+        name = spec.get('strategy', 'xrp')
+        if name not in STRATEGIES:
+            raise ValueError(f"알 수 없는 전략: {name}")
+        strategy_class = STRATEGIES[name]
+        config = self.build_config(ticker, spec, strategy_class)
+
+        strategy = strategy_class(config)
+        strategy.set_client(client)
+        return {
+            'strategy': strategy,
+            'config': config,
+            'client': client,
+            'simulation_balance': {
+                'KRW': Config.SIMULATION_CASH,
+                config.COIN_TICKER: 0
+            },
+            'simulation_entry_price': 0
+        }
+
+    def build_traders(self, client):
+        """설정된 모든 마켓의 트레이더 생성 ({코인 티커: 트레이더}), 실패한 마켓은 건너뜀"""
+        traders = {}
+        for ticker, spec in self.markets.items():
+            try:
+                traders[ticker] = self.create_trader(ticker, spec or {}, client)
+            except Exception as e:
+                log.log('WA', f"{ticker} 트레이더 생성 실패: {str(e)}")
+        return traders
@@ -0,0 +1,388 @@
+import math
+
+import numpy as np
+
+NAN = float('nan')
+RESYNC_INTERVAL = 1000  # 누적 합 오차 보정을 위해 창 전체를 다시 합산하는 갱신 주기
+
+
+class RollingWindow:
+    """고정 길이 창의 합/제곱합을 갱신마다 O(1)로 유지
+
+    new=False면 마지막 값을 교체한다 (형성 중인 캔들 수정).
+    """
+    def __init__(self, period):
+        self.period = period
+        self.values = [0.0] * period
+        self.pos = 0      # 다음에 기록할 위치
+        self.count = 0
+        self.sum = 0.0
+        self.sumsq = 0.0
+        self.updates = 0
+
+    def update(self, value, new=True):
+        if new or self.count == 0:
+            slot = self.pos
+            if self.count == self.period:
+                old = self.values[slot]
+                self.sum -= old
+                self.sumsq -= old * old
+            else:
+                self.count += 1
+            self.pos = (self.pos + 1) % self.period
+        else:
+            slot = (self.pos - 1) % self.period
+            old = self.values[slot]
+            self.sum -= old
+            self.sumsq -= old * old
+
+        self.values[slot] = value
+        self.sum += value
+        self.sumsq += value * value
+
+        self.updates += 1
+        if self.updates % RESYNC_INTERVAL == 0:
+            window = self.values if self.count == self.period else self.values[:self.count]
+            self.sum = math.fsum(window)
+            self.sumsq = math.fsum(v * v for v in window)
+
+    def is_ready(self):
+        return self.count == self.period
+
+    @property
+    def mean(self):
+        return self.sum / self.period if self.is_ready() else NAN
+
+    def std(self, ddof=1):
+        """표본 표준편차 (pandas rolling().std()와 같은 ddof=1)"""
+        if not self.is_ready() or self.period <= ddof:
+            return NAN
+        variance = (self.sumsq - self.sum * self.sum / self.period) / (self.period - ddof)
+        return math.sqrt(max(variance, 0.0))
+
+    @property
+    def oldest(self):
+        """창에서 가장 오래된 값 (창이 차기 전이면 nan)"""
+        return self.values[self.pos] if self.is_ready() else NAN
+
+
+class Recurrence:
+    """직전 캔들까지의 상태를 보관해 형성 중 캔들 수정 시 되돌린 뒤 다시 적용하는 점화식"""
+    def __init__(self):
+        self.saved = None
+
+    def update(self, value, new=True):
+        if new or self.saved is None:
+            self.saved = self.get_state()
+        else:
+            self.set_state(self.saved)
+        self.apply(value)
+
+    def get_state(self):
+        return dict(self.__dict__, saved=None)
+
+    def set_state(self, state):
+        saved = self.saved
+        self.__dict__.update(state)
+        self.saved = saved
+
+    def apply(self, value):
+        raise NotImplementedError
+
+
+class EMA(Recurrence):
+    """지수 이동평균 (pandas ewm(span=n) 기본값 adjust=True와 같은 가중치)"""
+    def __init__(self, span):
+        super().__init__()
+        self.decay = 1 - 2 / (span + 1)
+        self.numerator = 0.0
+        self.denominator = 0.0
+        self.value = NAN
+
+    def apply(self, value):
+        self.numerator = value + self.decay * self.numerator
+        self.denominator = 1 + self.decay * self.denominator
+        self.value = self.numerator / self.denominator
+
+
+class Wilder(Recurrence):
+    """Wilder 평활 (처음 period개 단순 평균 후 (이전*(n-1) + 값) / n)"""
+    def __init__(self, period):
+        super().__init__()
+        self.period = period
+        self.count = 0
+        self.total = 0.0
+        self.value = NAN
+
+    def apply(self, value):
+        self.count += 1
+        if self.count < self.period:
+            self.total += value
+        elif self.count == self.period:
+            self.value = (self.total + value) / self.period
+        else:
+            self.value = (self.value * (self.period - 1) + value) / self.period
+
+
+class Average:
+    """단순 이동평균 또는 Wilder 평활 선택"""
+    def __init__(self, period, wilder=False):
+        self.smoother = Wilder(period) if wilder else RollingWindow(period)
+        self.wilder = wilder
+
+    def update(self, value, new=True):
+        self.smoother.update(value, new)
+
+    @property
+    def value(self):
+        return self.smoother.value if self.wilder else self.smoother.mean
+
+
+class CandleIndicator:
+    """캔들 단위 지표 (직전 캔들 값을 보관해 수정 시에도 같은 직전 값 사용)"""
+    def __init__(self):
+        self.prev = None   # 직전(마감된) 캔들
+        self.last = None   # 마지막(형성 중일 수 있는) 캔들
+
+    def update(self, candle, new=True):
+        if new or self.last is None:
+            self.prev = self.last
+        self.last = candle
+        self.apply(candle, self.prev, new)
+
+    def apply(self, candle, prev, new):
+        raise NotImplementedError
+
+    def values(self):
+        raise NotImplementedError
+
+
+class MovingAverage(CandleIndicator):
+    def __init__(self, period, field='close', name=None):
+        super().__init__()
+        self.field = field
+        self.name = name or f'MA{period}'
+        self.window = RollingWindow(period)
+
+    def apply(self, candle, prev, new):
+        self.window.update(candle[self.field], new)
+
+    def values(self):
+        return {self.name: self.window.mean}
+
+
+class Bollinger(CandleIndicator):
+    def __init__(self, period=20, width=2.0, names=('BB_MID', 'BB_UPPER', 'BB_LOWER', 'BB_STD')):
+        super().__init__()
+        self.width = width
+        self.names = names
+        self.window = RollingWindow(period)
+
+    def apply(self, candle, prev, new):
+        self.window.update(candle['close'], new)
+
+    def values(self):
+        mid = self.window.mean
+        std = self.window.std()
+        return dict(zip(self.names, (mid, mid + std * self.width, mid - std * self.width, std)))
+
+
+class RSI(CandleIndicator):
+    """RSI (wilder=False면 기존 전략과 같은 단순 이동평균 방식)"""
+    def __init__(self, period=14, wilder=False, name='RSI'):
+        super().__init__()
+        self.name = name
+        self.gain = Average(period, wilder)
+        self.loss = Average(period, wilder)
+
+    def apply(self, candle, prev, new):
+        # 첫 캔들은 pandas diff().where()와 같이 상승/하락폭 0으로 처리
+        delta = 0.0 if prev is None else candle['close'] - prev['close']
+        self.gain.update(max(delta, 0.0), new)
+        self.loss.update(max(-delta, 0.0), new)
+
+    def values(self):
+        gain, loss = self.gain.value, self.loss.value
+        if math.isnan(gain) or math.isnan(loss):
+            return {self.name: NAN}
+        if loss == 0:
+            return {self.name: 100.0 if gain > 0 else NAN}
+        return {self.name: 100 - 100 / (1 + gain / loss)}
+
+
+class MACD(CandleIndicator):
+    def __init__(self, fast=12, slow=26, signal=9, names=('MACD', 'Signal')):
+        super().__init__()
+        self.names = names
+        self.fast = EMA(fast)
+        self.slow = EMA(slow)
+        self.signal = EMA(signal)
+
+    def apply(self, candle, prev, new):
+        self.fast.update(candle['close'], new)
+        self.slow.update(candle['close'], new)
+        self.signal.update(self.fast.value - self.slow.value, new)
+
+    def values(self):
+        return dict(zip(self.names, (self.fast.value - self.slow.value, self.signal.value)))
+
+
+def true_range(candle, prev):
+    """True Range (첫 캔들은 고가-저가)"""
+    high_low = candle['high'] - candle['low']
+    if prev is None:
+        return high_low
+    return max(high_low, abs(candle['high'] - prev['close']), abs(candle['low'] - prev['close']))
+
+
+class ATR(CandleIndicator):
+    def __init__(self, period=14, wilder=False, name='ATR'):
+        super().__init__()
+        self.name = name
+        self.average = Average(period, wilder)
+
+    def apply(self, candle, prev, new):
+        self.average.update(true_range(candle, prev), new)
+
+    def values(self):
+        return {self.name: self.average.value}
+
+
+class ADX(CandleIndicator):
+    """DI+/DI-/ADX (wilder=False면 기존 전략과 같은 단순 이동평균 방식)"""
+    def __init__(self, period=14, wilder=False, names=('DI+', 'DI-', 'ADX')):
+        super().__init__()
+        self.names = names
+        self.tr = Average(period, wilder)
+        self.dm_plus = Average(period, wilder)
+        self.dm_minus = Average(period, wilder)
+        self.dx = Average(period, wilder)
+        self.dx_started = False
+
+    def apply(self, candle, prev, new):
+        if prev is None:
+            return
+        up = candle['high'] - prev['high']
+        down = prev['low'] - candle['low']
+        self.tr.update(true_range(candle, prev), new)
+        self.dm_plus.update(up if up > 0 and up >= down else 0.0, new)
+        self.dm_minus.update(down if down > 0 and down >= up else 0.0, new)
+
+        dx = self.get_dx()
+        if not math.isnan(dx):
+            self.dx.update(dx, new or not self.dx_started)
+            self.dx_started = True
+
+    def get_di(self):
+        tr = self.tr.value
+        if math.isnan(tr) or tr == 0:
+            return NAN, NAN
+        return 100 * self.dm_plus.value / tr, 100 * self.dm_minus.value / tr
+
+    def get_dx(self):
+        di_plus, di_minus = self.get_di()
+        total = di_plus + di_minus
+        if math.isnan(total) or total == 0:
+            return NAN
+        return 100 * abs(di_plus - di_minus) / total
+
+    def values(self):
+        di_plus, di_minus = self.get_di()
+        return dict(zip(self.names, (di_plus, di_minus, self.dx.value)))
+
+
+class VolumeTrend(CandleIndicator):
+    """거래량 이동평균 대비 비율과 직전 캔들 대비 변화율"""
+    def __init__(self, period=5, names=None):
+        super().__init__()
+        self.names = names or (f'VOL_MA{period}', 'VOL_RATIO', 'VOL_CHANGE')
+        self.window = RollingWindow(period)
+        self.volume = NAN
+        self.change = NAN
+
+    def apply(self, candle, prev, new):
+        self.window.update(candle['volume'], new)
+        self.volume = candle['volume']
+        self.change = NAN if prev is None or prev['volume'] == 0 else candle['volume'] / prev['volume'] - 1
+
+    def values(self):
+        average = self.window.mean
+        ratio = self.volume / average if average else NAN
+        return dict(zip(self.names, (average, ratio, self.change)))
+
+
+class RateOfChange(CandleIndicator):
+    def __init__(self, period=12, name='ROC'):
+        super().__init__()
+        self.name = name
+        self.window = RollingWindow(period + 1)
+
+    def apply(self, candle, prev, new):
+        self.window.update(candle['close'], new)
+
+    def values(self):
+        base = self.window.oldest
+        return {self.name: (self.last['close'] / base - 1) * 100 if base else NAN}
+
+
+class TargetPrice(CandleIndicator):
+    """변동성 돌파 목표가 (시가 + 직전 캔들 변동폭 * factor)"""
+    def __init__(self, factor, names=('RANGE', 'TARGET')):
+        super().__init__()
+        self.factor = factor
+        self.names = names
+        self.target = NAN
+
+    def apply(self, candle, prev, new):
+        prev_range = NAN if prev is None else prev['high'] - prev['low']
+        self.target = candle['open'] + prev_range * self.factor
+
+    def values(self):
+        return dict(zip(self.names, (self.last['high'] - self.last['low'], self.target)))
+
+
+class IndicatorEngine:
+    """캔들 스트림 하나(마켓, 간격)에 대한 증분 지표 계산기
+
+    새 캔들은 모든 지표에 한 번씩 반영하고, 같은 시각의 캔들은 형성 중 캔들 수정으로 처리한다.
+    캔들당 비용은 지표 개수에만 비례하고 이력 길이와 무관하다.
+    """
+    FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, indicators, params=None):
+        self.indicators = list(indicators)
+        self.params = params  # 생성에 사용한 파라미터 (변경 감지용)
+        self.last_ts = None
+        self.candle = None
+        self.update_count = 0
+
+    def update(self, ts, candle):
+        """캔들 하나 반영 (지난 캔들은 무시), 반영 여부 반환"""
+        ts = int(ts)
+        if self.last_ts is not None and ts < self.last_ts:
+            return False
+        new = self.last_ts is None or ts > self.last_ts
+        for indicator in self.indicators:
+            indicator.update(candle, new)
+        self.last_ts = ts
+        self.candle = candle
+        self.update_count += 1
+        return True
+
+    def sync(self, arrays):
+        """과거순 캔들 배열 중 마지막 반영 캔들 이후(같은 시각 포함)만 반영"""
+        ts = np.asarray(arrays['ts'])
+        start = 0 if self.last_ts is None else int(np.searchsorted(ts, self.last_ts, side='left'))
+        columns = [np.asarray(arrays[field])[start:].tolist() for field in self.FIELDS]
+        for i, row in enumerate(zip(*columns)):
+            self.update(ts[start + i], dict(zip(self.FIELDS, row)))
+        return self.values()
+
+    def values(self):
+        """현재 지표 값 (마지막 캔들 OHLCV 포함, 반영한 캔들이 없으면 빈 dict)"""
+        if self.candle is None:
+            return {}
+        values = dict(self.candle)
+        for indicator in self.indicators:
+            values.update(indicator.values())
+        return values
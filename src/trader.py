@@ -1,65 +1,250 @@
 import time
 from datetime import datetime
-from collections import deque
 from utils.logger import log
 from config.config import Config
 from src.api_client import UpbitClient
+from src.async_api_client import AsyncUpbitClient
+from src.http_session import upbit_session
+from src.market_feed import MarketFeed
+from src.indicator_cache import indicator_cache
+from src.screener import MarketScreener
+from src.strategy_registry import StrategyRegistry
+from src.strategy_events import StrategyEventEngine, FillEvent
+from src.signal_gate import SignalGate
+from src.order_tracker import OrderTracker
+from src.order_reconciler import OrderReconciler
+from src.fill_simulator import FillSimulator
+from src.execution_engine import ExecutionEngine, ClientVenue, ParentOrder
+from src.market_workers import MarketWorkerPool
+from src.scheduler import AlignedScheduler, next_boundary, to_monotonic
 
 class MultiCoinTrader:
-    def __init__(self):
+    def __init__(self, session=None):
+        # session: 다른 주소(예: 거래소 에뮬레이터)에 접속할 UpbitSession, 없으면 공용 세션
+        self.session = session
         self.traders = {}
-        self.api_calls = deque(maxlen=600)  # 최근 600개의 API 호출 시간 기록
-        self.last_api_call = None
+        self.client = None  # 모든 트레이더가 공유하는 API 클라이언트
+        self.async_client = None  # 틱 내 독립 요청 동시 실행용 (트레이더 클라이언트와 계좌 캐시 공유)
+        self.market_feed = None
         self.is_running = False
+        self.screener = None
+        self.event_engine = None
+        self.signal_gate = SignalGate()  # 이벤트 엔진 미사용 시 신호 조회 앞단
+        self.workers = None  # 마켓별 작업자 풀 (USE_MARKET_WORKERS)
+        self.scheduler = AlignedScheduler(Config.TRADE_INTERVAL, Config.SCHEDULE_OFFSET, name="거래 주기")
         self.initialize_traders()
+        # 체결 반영(주문 추적기)과 거래 정보 출력이 같은 계좌 캐시를 보도록 클라이언트를 공유
+        self.async_client = AsyncUpbitClient(session, client=self.client)
+        self.order_tracker = OrderTracker(self.client)
+        self.order_tracker.add_listener(self.on_order_complete)
+        self.fill_simulator = FillSimulator()  # 시뮬레이션 주문을 호가 기준으로 체결
+        self.execution_engine = ExecutionEngine(ClientVenue(self.client)) if Config.USE_SMART_EXECUTION else None
+        if Config.USE_EVENT_ENGINE:
+            self.initialize_event_engine()
+        if Config.USE_SCREENER:
+            self.initialize_screener()
         
     def initialize_traders(self):
-        """코인별 트레이더 초기화"""
+        """설정된 마켓별 트레이더 초기화 (모든 마켓이 클라이언트 하나를 공유)"""
         try:
-            # XRP 트레이더
-            from src.strategies.xrp_strategy import XRPStrategy
-            from config.coins.xrp_config import XRPConfig
-            
-            strategy = XRPStrategy()
-            client = UpbitClient()  # API 클라이언트 생성
-            strategy.set_client(client)  # 전에 클라이언트 주입
-            
-            self.traders['XRP'] = {
-                'strategy': strategy,
-                'config': XRPConfig,
-                'client': client,
-                'simulation_balance': {
-                    'KRW': Config.SIMULATION_CASH,
-                    XRPConfig.COIN_TICKER: 0
-                },
-                'simulation_entry_price': 0
-            }
-            
-            log.log('TR', f"XRP 트레이더 초기화 완료")
-            
+            self.client = UpbitClient(self.session)
+            self.traders = StrategyRegistry().build_traders(self.client)
+            log.log('TR', f"트레이더 초기화 완료: {', '.join(self.traders) or '없음'}")
         except Exception as e:
             log.log('WA', f"트레이더 초기화 중 오류: {str(e)}")
     
-    def check_api_rate_limit(self):
-        """API 호출 제한 확인"""
-        now = datetime.now()
+    def initialize_event_engine(self):
+        """마켓별 전략을 이벤트 엔진에 등록"""
+        self.event_engine = StrategyEventEngine(self.client)
+        for trader in self.traders.values():
+            self.event_engine.register(trader['config'].MARKET, trader['strategy'])
+    
+    def get_event_signal(self, coin_ticker):
+        """이벤트 엔진으로 마켓 매매 신호 조회 (이벤트 엔진 미사용 시 None)"""
+        if self.event_engine is None:
+            return None
+        market = self.traders[coin_ticker]['config'].MARKET
+        return self.event_engine.process_market(market, self.client.get_current_price(market))
+    
+    def run_market(self, coin_ticker):
+        """마켓 하나의 상태 출력 및 거래 실행"""
+        try:
+            # 현재 상태 출력 및 거래 실행
+            try:
+                current_price, cash_balance, coin_balance = self.print_trading_info(coin_ticker)
+            except Exception as e:
+                log.detailed_error(f"{coin_ticker} 거래 정보 출력 중 오류", e)
+                return
+                
+            if None in (current_price, cash_balance, coin_balance):
+                log.log('WA', f"{coin_ticker} 거래 정보 누락 (현재가: {current_price}, 현금: {cash_balance}, 코인: {coin_balance})")
+                return
+                
+            # 거래 실행
+            try:
+                self.execute_trade(coin_ticker, self.get_event_signal(coin_ticker))
+            except Exception as e:
+                log.detailed_error(f"{coin_ticker} 거래 실행 중 오류", e)
+            
+        except Exception as e:
+            log.detailed_error(f"{coin_ticker} 거래 중 오류 발생", e)
+    
+    def run_cycle(self):
+        """모든 마켓을 순서대로 한 번 실행"""
+        # 모든 마켓 현재가를 한 번에 조회해 틱 시세 스냅샷 갱신
+        self.refresh_prices()
+        self.order_tracker.poll()
+        self.scan_markets()
         
-        # 1분 이상 지난 호출 기록 제거
-        while self.api_calls and (now - self.api_calls[0]).total_seconds() > 60:
-            self.api_calls.popleft()
+        for coin_ticker in list(self.traders.keys()):
+            if not self.is_running:
+                break
+            self.run_market(coin_ticker)
+    
+    def run_workers(self):
+        """마켓별 작업자로 거래 실행 (공용 시세 갱신/스캔은 TRADE_INTERVAL마다 메인 스레드에서)"""
+        self.workers = MarketWorkerPool(self.run_market)
+        for coin_ticker, trader in self.traders.items():
+            self.workers.add(coin_ticker, getattr(trader['config'], 'TRADE_INTERVAL', Config.TRADE_INTERVAL))
         
-        # 분당 최대 호출 수 확인
-        if len(self.api_calls) >= Config.MAX_API_CALLS:
-            wait_time = 60 - (now - self.api_calls[0]).total_seconds()
-            if wait_time > 0:
-                log.log('TR', f"API 호출 제한 대기: {wait_time:.1f}초")
-                time.sleep(wait_time)
+        # 공용 갱신도 작업자와 같은 경계에 맞추고, 같은 경계에서는 작업자보다 먼저 실행
+        next_refresh = time.monotonic()
+        while self.is_running:
+            if time.monotonic() >= next_refresh:
+                self.refresh_prices()
+                self.order_tracker.poll()
+                self.scan_markets()
+                next_refresh = to_monotonic(next_boundary(Config.TRADE_INTERVAL, Config.SCHEDULE_OFFSET))
+            delay = self.workers.dispatch()
+            self.scheduler.stop_event.wait(max(min(delay, next_refresh - time.monotonic()), 0.0))
+    
+    def publish_fill(self, coin_ticker, side, price, volume, fee=0.0, uuid=None):
+        """체결 이벤트 전달 (이벤트 엔진 사용 시)"""
+        if self.event_engine is None:
+            return
+        market = self.traders[coin_ticker]['config'].MARKET
+        self.event_engine.publish_fill(FillEvent(market, side, price, volume, fee, uuid))
+    
+    def get_coin_ticker(self, market):
+        """마켓 코드에 해당하는 트레이더 키"""
+        for coin_ticker, trader in self.traders.items():
+            if trader['config'].MARKET == market:
+                return coin_ticker
+        return None
+    
+    def on_order_complete(self, order):
+        """주문 완료 시 실제 체결 결과를 전략 포지션에 반영"""
+        coin_ticker = self.get_coin_ticker(order.market)
+        if coin_ticker is None:
+            return
+        if self.event_engine is not None:
+            if order.filled:
+                self.publish_fill(coin_ticker, order.side, order.price, order.volume, order.fee, order.uuid)
+            return
+        
+        # 신호 조회 시 이미 포지션을 바꿨으므로 실제 체결가로 보정하거나 미체결 매수를 되돌림
+        strategy = self.traders[coin_ticker]['strategy']
+        if order.side == 'bid':
+            if order.filled:
+                strategy.enter_position(order.price)
+            else:
+                strategy.exit_position()
+    
+    def track_order(self, result, coin_ticker, side):
+        """주문 응답 추적 시작 후 체결 확인 대기 (시간 내 미확인 주문은 거래 주기마다 일괄 확인)"""
+        order = self.order_tracker.track(result, self.traders[coin_ticker]['config'].MARKET, side)
+        if order is not None:
+            self.order_tracker.wait(order)
+        return order
     
-    def record_api_call(self):
-        """API 호출 기록"""
-        now = datetime.now()
-        self.api_calls.append(now)
-        self.last_api_call = now
+    def execute_smart(self, coin_ticker, side, funds=None, volume=None):
+        """분할 실행으로 매수(funds 원)/매도(volume 수량) 후 ExecutionReport 반환
+
+        체결된 자식 주문은 이미 완료 상태이므로 조회 없이 주문 추적기에 바로 반영하고,
+        이벤트 엔진을 쓰지 않으면 매수 포지션을 부모 주문 평균 체결가로 한 번 더 보정한다.
+        추적 시작 시각은 자식 주문을 낸 시각이어야 실행 중에 조회한 계좌 스냅샷에
+        같은 체결을 다시 더하지 않는다.
+        """
+        market = self.traders[coin_ticker]['config'].MARKET
+        report = self.execution_engine.execute(ParentOrder(market, side, funds=funds, volume=volume))
+        for child in report.filled_children:
+            row = dict(child.row, executed_funds=str(child.funds))
+            order = self.order_tracker.track(row, market, side, placed_at=child.placed_at)
+            if order is not None:
+                self.order_tracker.complete(order, row)
+        if report.open_children:
+            # 완료를 확인하지 못한 자식 주문이 나중에 체결될 수 있으므로 계좌는 다시 조회
+            self.client.account_cache.clear()
+        if self.event_engine is None and side == 'bid':
+            strategy = self.traders[coin_ticker]['strategy']
+            if report.executed_volume > 0:
+                strategy.enter_position(report.price)
+            else:
+                strategy.exit_position()
+        return report
+    
+    def reconcile_orders(self, liquidate=False):
+        """모든 거래 마켓의 미체결 주문 취소 (+ liquidate면 보유 코인 매도) 후 계좌 확인"""
+        try:
+            markets = [trader['config'].MARKET for trader in self.traders.values()]
+            return OrderReconciler(self.client, self.order_tracker).reconcile(markets, liquidate=liquidate)
+        except Exception as e:
+            log.detailed_error("미체결 주문 정리 중 오류", e)
+            return None
+    
+    def initialize_screener(self):
+        """첫 트레이더의 클라이언트/전략으로 전체 마켓 스캐너 생성"""
+        try:
+            trader = next(iter(self.traders.values()))
+            self.screener = MarketScreener(self.client, trader['strategy'])
+        except Exception as e:
+            log.detailed_error("마켓 스캐너 초기화 실패", e)
+    
+    def scan_markets(self):
+        """전체 마켓 매수 후보 스캔 및 로그"""
+        if self.screener is None:
+            return []
+        candidates = self.screener.scan()
+        self.screener.log_candidates()
+        return candidates
+    
+    def use_market_feed(self):
+        """실시간 시세 사용 여부
+
+        REST 주소가 실제 거래소가 아니면(에뮬레이터 등) 웹소켓 시세와 체결의 가격 원천이 달라지므로
+        FEED_WITH_CUSTOM_SERVER를 켜지 않는 한 사용하지 않는다 (시세/호가는 REST 주소에서 조회).
+        """
+        if not Config.USE_WEBSOCKET_FEED:
+            return False
+        server_url = (self.session or upbit_session).server_url
+        if server_url.rstrip('/') != Config.UPBIT_DEFAULT_SERVER_URL and not Config.FEED_WITH_CUSTOM_SERVER:
+            log.log('WA', f"REST 주소({server_url})가 실제 거래소가 아니므로 실시간 시세를 사용하지 않습니다 (FEED_WITH_CUSTOM_SERVER로 변경)")
+            return False
+        return True
+
+    def start_market_feed(self):
+        """실시간 시세 수신 시작 및 클라이언트 연결"""
+        try:
+            markets = [trader['config'].MARKET for trader in self.traders.values()]
+            if self.market_feed is None:
+                self.market_feed = MarketFeed(markets)
+                self.market_feed.start()
+            else:
+                self.market_feed.subscribe(markets)
+            
+            self.client.set_market_feed(self.market_feed)
+            self.async_client.set_market_feed(self.market_feed)
+        except Exception as e:
+            log.detailed_error("실시간 시세 수신 시작 실패 (REST 조회로 대체)", e)
+    
+    def refresh_prices(self):
+        """실시간 시세가 없는 마켓의 현재가 배치 조회"""
+        markets = [trader['config'].MARKET for trader in self.traders.values()]
+        if self.market_feed is not None:
+            markets = [market for market in markets if self.market_feed.get_price(market) is None]
+        if not markets:
+            return {}
+        return self.client.refresh_prices(markets)
     
     def get_profit_info(self, coin_ticker, current_price, coin_balance, avg_buy_price=None):
         """수익률 및 평가손익 계산"""
@@ -106,61 +291,48 @@ class MultiCoinTrader:
         try:
             trader = self.traders[coin_ticker]
             
-            # 현재가 조회
-            try:
-                current_price = trader['client'].get_current_price(trader['config'].MARKET)
-                
-                # 현재가가 None이면 종료
-                if current_price is None:
-                    log.log('WA', f"{coin_ticker} 현재가 조회 실패")
-                    return None, None, None
-            except Exception as e:
-                log.detailed_error(f"{coin_ticker} 현재가 조회 중 오류", e)
-                return None, None, None
-                
-            # 잔고 정보 조회
+            avg_buy_price = None
+            
+            # 현재가 및 잔고 정보 조회
             try:
                 if Config.SIMULATION_MODE:
+                    current_price = trader['client'].get_current_price(trader['config'].MARKET)
                     balance = trader['simulation_balance']
                     cash_balance = balance.get('KRW', 0)
                     coin_balance = balance.get(trader['config'].COIN_TICKER, 0)
                 else:
-                    # 현금 잔고와 코인 잔고를 개별적으로 조회
-                    try:
-                        cash_balance = trader['client'].get_balance('KRW')
-                        if cash_balance is None:
-                            log.log('WA', f"{coin_ticker} 현금 잔고 조회 실패")
-                            cash_balance = 0
-                    except Exception as e:
-                        log.detailed_error(f"{coin_ticker} 현금 잔고 조회 중 오류", e)
+                    # 현재가, 현금 잔고, 코인 잔고, 평균 매수가를 동시에 조회
+                    current_price, cash_balance, coin_balance, avg_buy_price = self.async_client.run(
+                        self.async_client.get_trading_info(trader['config'].MARKET, trader['config'].COIN_TICKER)
+                    )
+                    if cash_balance is None:
+                        log.log('WA', f"{coin_ticker} 현금 잔고 조회 실패")
                         cash_balance = 0
-                    
-                    try:
-                        coin_balance = trader['client'].get_balance(trader['config'].COIN_TICKER)
-                        if coin_balance is None:
-                            log.log('WA', f"{coin_ticker} 코인 잔고 조회 실패")
-                            coin_balance = 0
-                    except Exception as e:
-                        log.detailed_error(f"{coin_ticker} 코인 잔고 조회 중 오류", e)
+                    if coin_balance is None:
+                        log.log('WA', f"{coin_ticker} 코인 잔고 조회 실패")
                         coin_balance = 0
-                    
-                # 숫자 타입으로 변환
-                try:
-                    cash_balance = float(cash_balance)
-                    coin_balance = float(coin_balance)
-                except (TypeError, ValueError) as e:
-                    log.detailed_error(f"{coin_ticker} 잔고 정보 변환 오류", e)
-                    cash_balance = 0
-                    coin_balance = 0
             except Exception as e:
-                log.detailed_error(f"{coin_ticker} 잔고 정보 조회 중 오류", e)
+                log.detailed_error(f"{coin_ticker} 현재가 및 잔고 조회 중 오류", e)
+                return None, None, None
+            
+            # 현재가가 None이면 종료
+            if current_price is None:
+                log.log('WA', f"{coin_ticker} 현재가 조회 실패")
+                return None, None, None
+            
+            # 숫자 타입으로 변환
+            try:
+                cash_balance = float(cash_balance)
+                coin_balance = float(coin_balance)
+            except (TypeError, ValueError) as e:
+                log.detailed_error(f"{coin_ticker} 잔고 정보 변환 오류", e)
                 cash_balance = 0
                 coin_balance = 0
             
             # 수익 정보 계산
             try:
                 profit_amount, profit_rate, avg_buy_price = self.get_profit_info(
-                    coin_ticker, current_price, coin_balance
+                    coin_ticker, current_price, coin_balance, avg_buy_price
                 )
             except Exception as e:
                 log.detailed_error(f"{coin_ticker} 수익 정보 계산 오류", e)
@@ -187,56 +359,99 @@ class MultiCoinTrader:
             log.detailed_error(f"{coin_ticker} 정보 출력 중 오류", e)
             return None, None, None
     
+    def simulate_order(self, coin_ticker, side, funds=None, volume=None):
+        """호가 스냅샷으로 시뮬레이션 주문 체결 (체결되지 않으면 None)"""
+        trader = self.traders[coin_ticker]
+        market = trader['config'].MARKET
+        fill = self.fill_simulator.simulate(
+            market, side, trader['client'].get_orderbook(market), funds=funds, volume=volume,
+            price=trader['client'].get_current_price(market),
+        )
+        if not fill.filled:
+            log.log('TR', f"{coin_ticker} 시뮬레이션 {'매수' if side == 'bid' else '매도'} 미체결: {fill.rejected or '호가 부족'}")
+            return None
+        if fill.unfilled:
+            log.log('WA', f"{coin_ticker} 호가 잔량 부족으로 일부만 체결 (남은 {'금액' if side == 'bid' else '수량'}: {fill.unfilled:,.8f})")
+        return fill
+    
     def simulate_market_buy(self, coin_ticker, amount):
-        """시뮬레이션 매수"""
+        """시뮬레이션 매수 (호가 단계별 체결, 수수료 별도)"""
         trader = self.traders[coin_ticker]
-        current_price = trader['client'].get_current_price(trader['config'].MARKET)
-        if current_price:
-            coin_amount = amount / current_price
-            if trader['simulation_balance']['KRW'] >= amount:
-                trader['simulation_balance']['KRW'] -= amount
-                trader['simulation_balance'][trader['config'].COIN_TICKER] += coin_amount
-                trader['simulation_entry_price'] = current_price
-                
-                log.print_section(f"{coin_ticker} 매수 체결 완료")
-                log.log('TR', f"매수금액: {amount:,}원")
-                log.log('TR', f"매수단가: {current_price:,}원")
-                log.log('TR', f"매수수량: {coin_amount:.4f} {trader['config'].COIN_TICKER}")
-                return True
-        return False
+        balance = trader['simulation_balance']
+        ticker = trader['config'].COIN_TICKER
+        # 수수료까지 보유 현금 안에서 지불
+        amount = min(amount, balance['KRW'] / (1 + self.fill_simulator.fee_rate))
+        fill = self.simulate_order(coin_ticker, 'bid', funds=amount)
+        if fill is None:
+            return False
+        
+        held = balance[ticker]
+        balance['KRW'] -= fill.funds + fill.fee
+        balance[ticker] += fill.volume
+        # 진입가는 수수료를 포함한 평균 매수 단가
+        trader['simulation_entry_price'] = (trader['simulation_entry_price'] * held + fill.funds + fill.fee) / balance[ticker]
+        self.publish_fill(coin_ticker, 'bid', fill.price, fill.volume, fill.fee)
+        
+        log.print_section(f"{coin_ticker} 매수 체결 완료")
+        log.log('TR', f"매수금액: {fill.funds:,.0f}원 (수수료 {fill.fee:,.2f}원)")
+        log.log('TR', f"매수단가: {fill.price:,}원 (최우선 호가 {fill.best_price:,}원, 슬리피지 {fill.slippage * 10000:.1f}bp)")
+        log.log('TR', f"매수수량: {fill.volume:.4f} {ticker}")
+        return True
     
     def simulate_market_sell(self, coin_ticker, coin_amount):
-        """시뮬레이션 매도"""
+        """시뮬레이션 매도 (호가 단계별 체결, 수익률은 수수료 포함)"""
         trader = self.traders[coin_ticker]
-        current_price = trader['client'].get_current_price(trader['config'].MARKET)
-        if current_price and trader['simulation_balance'][trader['config'].COIN_TICKER] >= coin_amount:
-            amount = coin_amount * current_price
-            trader['simulation_balance']['KRW'] += amount
-            trader['simulation_balance'][trader['config'].COIN_TICKER] -= coin_amount
-            profit_rate = ((current_price / trader['simulation_entry_price']) - 1) * 100
-            
-            log.print_section(f"{coin_ticker} 매도 체결 완료")
-            log.log('TR', f"매도수량: {coin_amount:.4f} {trader['config'].COIN_TICKER}")
-            log.log('TR', f"매도단가: {current_price:,}원")
-            log.log('TR', f"매도금액: {amount:,}원")
-            log.log('TR', f"거래수익: {profit_rate:+.2f}%")
-            return True
-        return False
+        balance = trader['simulation_balance']
+        ticker = trader['config'].COIN_TICKER
+        if balance[ticker] < coin_amount:
+            return False
+        fill = self.simulate_order(coin_ticker, 'ask', volume=coin_amount)
+        if fill is None:
+            return False
+        
+        proceeds = fill.funds - fill.fee
+        balance['KRW'] += proceeds
+        balance[ticker] -= fill.volume
+        entry_price = trader['simulation_entry_price']
+        profit_rate = (proceeds / (entry_price * fill.volume) - 1) * 100 if entry_price else 0.0
+        self.publish_fill(coin_ticker, 'ask', fill.price, fill.volume, fill.fee)
+        
+        log.print_section(f"{coin_ticker} 매도 체결 완료")
+        log.log('TR', f"매도수량: {fill.volume:.4f} {ticker}")
+        log.log('TR', f"매도단가: {fill.price:,}원 (최우선 호가 {fill.best_price:,}원, 슬리피지 {fill.slippage * 10000:.1f}bp)")
+        log.log('TR', f"매도금액: {proceeds:,.0f}원 (수수료 {fill.fee:,.2f}원)")
+        log.log('TR', f"거래수익: {profit_rate:+.2f}%")
+        return True
     
-    def execute_trade(self, coin_ticker):
-        """매매 실행"""
+    def get_trading_signal(self, coin_ticker):
+        """전략 매매 신호 조회 (현재가/캔들/포지션이 그대로면 이전 신호 재사용)"""
+        trader = self.traders[coin_ticker]
+        strategy = trader['strategy']
+        market = trader['config'].MARKET
+        return self.signal_gate.evaluate(
+            market, self.client.get_current_price(market), getattr(strategy, 'position', None),
+            getattr(strategy, 'CANDLE_INTERVALS', ()),
+            lambda: strategy.get_trading_signal(market),
+        )
+    
+    def execute_trade(self, coin_ticker, signal=None):
+        """매매 실행 (signal이 없으면 전략에 신호를 직접 조회)"""
         try:
             trader = self.traders[coin_ticker]
             
-            # API 호출 제한 확인
-            self.check_api_rate_limit()
+            # 거래 신호 확인 (API 호출 제한은 클라이언트 계층에서 요청 단위로 적용)
+            if signal is None:
+                try:
+                    signal = self.get_trading_signal(coin_ticker)
+                except Exception as e:
+                    log.detailed_error(f"{coin_ticker} 거래 신호 확인 중 오류", e)
+                    return False
             
-            # 거래 신호 확인
-            try:
-                signal = trader['strategy'].get_trading_signal(trader['config'].MARKET)
-                self.record_api_call()
-            except Exception as e:
-                log.detailed_error(f"{coin_ticker} 거래 신호 확인 중 오류", e)
+            # 이벤트 엔진은 체결 이벤트로 포지션을 바꾸므로 체결 확인 전에는 같은 신호가 다시 나온다.
+            # 같은 방향 주문의 완료(체결/취소)를 확인할 때까지 새 주문을 내지 않음
+            side = {'BUY': 'bid', 'SELL': 'ask'}.get(signal)
+            if side is not None and self.order_tracker.has_open_order(trader['config'].MARKET, side):
+                log.log('TR', f"{coin_ticker} {'매수' if side == 'bid' else '매도'} 주문 체결 확인 대기 중, 신호 보류: {signal}")
                 return False
             
             if signal == 'BUY':
@@ -246,7 +461,7 @@ class MultiCoinTrader:
                         cash_balance = trader['simulation_balance'].get('KRW', 0)
                         trade_amount = min(cash_balance, trader['config'].TRADE_UNIT)
                         
-                        if trade_amount >= 5000:  # 최소 주문금액
+                        if trade_amount >= Config.MIN_ORDER_AMOUNT:
                             return self.simulate_market_buy(coin_ticker, trade_amount)
                     except Exception as e:
                         log.detailed_error(f"{coin_ticker} 시뮬레이션 매수 처리 중 오류", e)
@@ -268,16 +483,19 @@ class MultiCoinTrader:
                         
                         trade_amount = min(cash_balance, trader['config'].TRADE_UNIT)
                         
-                        if trade_amount >= 5000:  # 최소 주문금액
+                        if trade_amount >= Config.MIN_ORDER_AMOUNT:
                             try:
                                 # 매개변수 순서 주의: 마켓, 금액
                                 log.log('TR', f"{coin_ticker} 매수 시도: {trade_amount:,}원")
+                                if self.execution_engine is not None:
+                                    return self.execute_smart(coin_ticker, 'bid', funds=trade_amount)
                                 result = trader['client'].buy_market_order(
                                     market=trader['config'].MARKET, 
                                     price=trade_amount
                                 )
                                 if result:
                                     log.log('TR', f"{coin_ticker} 매수 주문 성공: {trade_amount:,}원")
+                                    self.track_order(result, coin_ticker, 'bid')
                                 else:
                                     log.log('WA', f"{coin_ticker} 매수 주문 실패: 결과가 None")
                                 return result
@@ -319,12 +537,15 @@ class MultiCoinTrader:
                             try:
                                 # 매개변수 순서 주의: 마켓, 수량
                                 log.log('TR', f"{coin_ticker} 매도 시도: {coin_balance} {trader['config'].COIN_TICKER}")
+                                if self.execution_engine is not None:
+                                    return self.execute_smart(coin_ticker, 'ask', volume=coin_balance)
                                 result = trader['client'].sell_market_order(
                                     market=trader['config'].MARKET, 
                                     volume=coin_balance
                                 )
                                 if result:
                                     log.log('TR', f"{coin_ticker} 매도 주문 성공: {coin_balance} {trader['config'].COIN_TICKER}")
+                                    self.track_order(result, coin_ticker, 'ask')
                                 else:
                                     log.log('WA', f"{coin_ticker} 매도 주문 실패: 결과가 None")
                                 return result
@@ -346,20 +567,17 @@ class MultiCoinTrader:
         try:
             self.is_running = True
             
-            # 기존 미체결 주문 취소
+            # 기존 미체결 주문 취소 (모든 마켓 동시 처리 후 계좌 확인)
             if not Config.SIMULATION_MODE:
-                try:
-                    for coin_ticker, trader in self.traders.items():
-                        try:
-                            trader['client'].cancel_all_orders()
-                        except Exception as e:
-                            log.detailed_error(f"{coin_ticker} 미체결 주문 취소 실패", e)
-                except Exception as e:
-                    log.detailed_error("미체결 주문 취소 중 오류", e)
+                self.reconcile_orders()
             
             mode = "시뮬레이션" if Config.SIMULATION_MODE else "실제 거래"
             log.print_header(f"자동매매 프로그램 시작 ({mode})")
             
+            # 실시간 시세 수신 시작
+            if self.use_market_feed():
+                self.start_market_feed()
+            
             # 각 코인별 트레이더 정보 출력
             for coin_ticker, trader in self.traders.items():
                 try:
@@ -389,30 +607,10 @@ class MultiCoinTrader:
                     log.detailed_error(f"{coin_ticker} 정보 출력 중 오류", e)
             
             # 메인 거래 루프
-            while self.is_running:
-                for coin_ticker in list(self.traders.keys()):
-                    try:
-                        # 현재 상태 출력 및 거래 실행
-                        try:
-                            current_price, cash_balance, coin_balance = self.print_trading_info(coin_ticker)
-                        except Exception as e:
-                            log.detailed_error(f"{coin_ticker} 거래 정보 출력 중 오류", e)
-                            continue
-                            
-                        if None in (current_price, cash_balance, coin_balance):
-                            log.log('WA', f"{coin_ticker} 거래 정보 누락 (현재가: {current_price}, 현금: {cash_balance}, 코인: {coin_balance})")
-                            continue
-                            
-                        # 거래 실행
-                        try:
-                            self.execute_trade(coin_ticker)
-                        except Exception as e:
-                            log.detailed_error(f"{coin_ticker} 거래 실행 중 오류", e)
-                        
-                    except Exception as e:
-                        log.detailed_error(f"{coin_ticker} 거래 중 오류 발생", e)
-                
-                time.sleep(Config.TRADE_INTERVAL)
+            if Config.USE_MARKET_WORKERS:
+                self.run_workers()
+            else:
+                self.scheduler.run(self.run_cycle)
                     
         except KeyboardInterrupt:
             self.stop()
@@ -423,22 +621,40 @@ class MultiCoinTrader:
     def stop(self):
         """거래 중지"""
         self.is_running = False
+        self.scheduler.stop()
+        if self.workers is not None:
+            self.workers.close()
         log.print_header("프로그램 종료")
         
         if not Config.SIMULATION_MODE:
-            for coin_ticker, trader in self.traders.items():
-                trader['client'].cancel_all_orders()
-                if Config.SELL_ALL_ON_STOP:
-                    balance = trader['client'].get_balance()
-                    coin_balance = balance.get(trader['config'].COIN_TICKER, 0)
-                    if coin_balance > 0:
-                        trader['client'].sell_market_order(trader['config'].MARKET, coin_balance)
-                        log.log('TR', f"{coin_ticker} 보유 코인 전량 매도: {coin_balance} {trader['config'].COIN_TICKER}")
+            self.reconcile_orders(liquidate=Config.SELL_ALL_ON_STOP)
         
         # 최종 거래 정보 출력
         for coin_ticker in self.traders.keys():
             self.print_trading_info(coin_ticker)
         
+        # HTTP 커넥션 재사용 및 요청 제한 통계 출력 (모든 클라이언트가 공용 세션 사용)
+        (self.session or upbit_session).log_stats()
+        indicator_cache.log_stats()
+        self.order_tracker.log_stats()
+        if Config.SIMULATION_MODE:
+            self.fill_simulator.log_stats()
+        if self.execution_engine is not None:
+            self.execution_engine.log_stats()
+        if self.screener is not None:
+            self.screener.log_stats()
+        if self.event_engine is not None:
+            self.event_engine.log_stats()
+        else:
+            self.signal_gate.log_stats()
+        if self.workers is not None:
+            self.workers.log_stats()
+        else:
+            self.scheduler.log_stats()
+        self.async_client.close()
+        if self.market_feed is not None:
+            self.market_feed.stop()
+        
         mode = "시뮬레이션" if Config.SIMULATION_MODE else "실제 거래"
         log.log('TR', f"{mode} 모드 프로그램이 안전하게 종료되었습니다")
     
@@ -1,3 +1,4 @@
+import math
 import os
 import sys
 import requests
@@ -9,19 +10,55 @@ sys.path.append(project_root)
 
 from config.config import Config
 from utils.logger import log
+from src.http_session import upbit_session, UpbitAPIError
+
+# 원화 마켓 호가 단위 (가격 하한, 호가 단위), 높은 가격대부터
+KRW_TICK_SIZES = (
+    (2000000, 1000),
+    (1000000, 500),
+    (500000, 100),
+    (100000, 50),
+    (10000, 10),
+    (1000, 1),
+    (100, 0.1),
+    (10, 0.01),
+    (1, 0.001),
+    (0.1, 0.0001),
+    (0.01, 0.00001),
+    (0.001, 0.000001),
+    (0.0001, 0.0000001),
+)
+
+
+def get_tick_size(price):
+    """원화 마켓 가격대별 호가 단위"""
+    for floor, tick in KRW_TICK_SIZES:
+        if price >= floor:
+            return tick
+    return 0.00000001
+
+
+def round_to_tick(price, direction='nearest'):
+    """가격을 호가 단위로 맞춤 (direction: 'down' 내림, 'up' 올림, 'nearest' 반올림)"""
+    tick = get_tick_size(price)
+    steps = price / tick
+    if direction == 'down':
+        steps = math.floor(steps + 1e-9)
+    elif direction == 'up':
+        steps = math.ceil(steps - 1e-9)
+    else:
+        steps = round(steps)
+    return round(steps * tick, 8)
 
 def fetch_upbit_market_info():
     """설정된 MARKET에 대한 업비트 종목 정보를 가져와 Config에 저장"""
-    url = "https://api.upbit.com/v1/market/all?isDetails=false"
-    headers = {"accept": "application/json"}
-
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()  # HTTP 오류 발생 시 예외 발생
+        # 공용 세션으로 요청 (HTTP 오류 발생 시 예외 발생)
+        markets = upbit_session.get('/v1/market/all', params={'isDetails': 'false'})
 
         # 설정된 MARKET에 대한 정보만 필터링
         market_info = next(
-            (row for row in response.json() if row.get('market') == Config.MARKET),
+            (row for row in markets if row.get('market') == Config.MARKET),
             None
         )
 
@@ -36,25 +73,21 @@ def fetch_upbit_market_info():
             log.log('WA', f"설정된 MARKET({Config.MARKET})에 대한 정보를 찾을 수 없습니다.")
             return None
             
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, UpbitAPIError) as e:
         log.log('WA', f"업비트 종목 정보를 가져오는 중 오류 발생: {str(e)}")
         return None
 
 def print_all_markets():
     """모든 업비트 마켓 정보 출력"""
-    url = "https://api.upbit.com/v1/market/all?isDetails=false"
-    headers = {"accept": "application/json"}
-
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
+        markets = upbit_session.get('/v1/market/all', params={'isDetails': 'false'})
 
         print("\n=== 업비트 마켓 정보 ===")
         print(f"조회 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print("=" * 40)
         
         # KRW 마켓만 필터링하여 출력
-        krw_markets = [row for row in response.json() if row.get('market').startswith('KRW-')]
+        krw_markets = [row for row in markets if row.get('market').startswith('KRW-')]
         
         for market in krw_markets:
             print(f"{market.get('market'):<10} | {market.get('korean_name')}")
@@ -62,20 +95,16 @@ def print_all_markets():
         print("=" * 40)
         print(f"총 {len(krw_markets)}개의 KRW 마켓이 있습니다.")
         
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, UpbitAPIError) as e:
         print(f"업비트 종목 정보를 가져오는 중 오류 발생: {str(e)}")
 
 def fetch_upbit_candles():
     """설정된 MARKET에 대한 업비트 캔들 정보를 가져와 출력"""
-    url = f"https://api.upbit.com/v1/candles/minutes/30?market={Config.MARKET}&count=5"
-    headers = {"accept": "application/json"}
-
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()  # HTTP 오류 발생 시 예외 발생
+        candles = upbit_session.get('/v1/candles/minutes/30', params={'market': Config.MARKET, 'count': 5})
 
         print("\n=== 업비트 캔들 정보 ===")
-        for row in response.json():
+        for row in candles:
             UTC = row.get('candle_date_time_utc')
             Open = row.get('opening_price')
             High = row.get('high_price')
@@ -84,7 +113,7 @@ def fetch_upbit_candles():
             
             print(f"UTC: {UTC}, Open: {Open}, High: {High}, Low: {Low}, Close: {Close}")
             
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, UpbitAPIError) as e:
         print(f"업비트 캔들 정보를 가져오는 중 오류 발생: {e}")
 
 if __name__ == "__main__":
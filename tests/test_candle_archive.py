@@ -0,0 +1,137 @@
+import os
+import struct
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.candle_archive import HEADER_SIZE, MAGIC, ArchiveFile, CandleArchive
+from src.candle_store import CANDLE_FIELDS
+
+MARKET = 'KRW-BTC'
+INTERVAL = 'minute1'
+START = 1_700_000_040  # 분 경계
+
+
+def candles(start, count, step=60, offset=0.0):
+    """start부터 step초 간격 count개 캔들 (종가 = 시각 + offset)"""
+    ts = start + step * np.arange(count, dtype=np.int64)
+    arrays = {field: ts.astype(np.float64) + offset for field in CANDLE_FIELDS[1:]}
+    arrays['ts'] = ts
+    return arrays
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return CandleArchive(str(tmp_path))
+
+
+@pytest.fixture
+def rewrites(monkeypatch):
+    calls = []
+    original = CandleArchive.rewrite
+
+    def counted(self, *args, **kwargs):
+        calls.append(args[2]['ts'].size)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(CandleArchive, 'rewrite', counted)
+    return calls
+
+
+def assert_continuous(arrays, first, count):
+    assert len(arrays['ts']) == count
+    assert arrays['ts'][0] == first
+    assert np.all(np.diff(arrays['ts']) == 60)
+    np.testing.assert_array_equal(arrays['close'], arrays['ts'].astype(np.float64))
+
+
+def test_append_round_trip_survives_reopen(archive):
+    assert archive.append(MARKET, INTERVAL, candles(START, 100)) == 100
+    assert archive.append(MARKET, INTERVAL, candles(START + 60 * 100, 50)) == 50
+    # 이미 저장된 캔들은 다시 추가하지 않음
+    assert archive.append(MARKET, INTERVAL, candles(START + 60 * 140, 10)) == 0
+
+    reopened = CandleArchive(archive.root)
+    assert_continuous(reopened.read(MARKET, INTERVAL), START, 150)
+    assert reopened.get_range(MARKET, INTERVAL) == (START, START + 60 * 149)
+    assert reopened.get_gaps(MARKET, INTERVAL) == []
+
+
+def test_backward_pages_prepend_without_rewriting_every_page(archive, rewrites):
+    pages, size = 200, 200
+    newest = START + 60 * size * pages
+    archive.write(MARKET, INTERVAL, candles(newest, size))
+    for page in range(1, pages + 1):
+        archive.write(MARKET, INTERVAL, candles(newest - 60 * size * page, size))
+
+    assert_continuous(archive.read(MARKET, INTERVAL), newest - 60 * size * pages, size * (pages + 1))
+    # 여유 공간이 모자랄 때만 두 배로 다시 만드므로 재작성 횟수는 로그 규모
+    assert len(rewrites) <= 10
+    assert sum(rewrites) <= 4 * size * (pages + 1)
+
+
+def test_prepend_then_append_keeps_order(archive):
+    archive.write(MARKET, INTERVAL, candles(START + 60 * 1000, 100))
+    archive.write(MARKET, INTERVAL, candles(START + 60 * 900, 100))
+    archive.write(MARKET, INTERVAL, candles(START + 60 * 1100, 100))
+    assert_continuous(archive.read(MARKET, INTERVAL), START + 60 * 900, 300)
+
+    view = archive.get_view(MARKET, INTERVAL, start=START + 60 * 950, end=START + 60 * 1000)
+    assert view.ts[0] == START + 60 * 950 and len(view) == 50
+    assert list(archive.get_view(MARKET, INTERVAL, count=3).ts) == [START + 60 * i for i in (1197, 1198, 1199)]
+
+
+def test_write_replaces_forming_candle_and_merges_overlap(archive):
+    archive.write(MARKET, INTERVAL, candles(START, 10))
+    # 마지막 캔들부터 다시 받으면 마지막 캔들만 교체하고 나머지는 추가
+    assert archive.write(MARKET, INTERVAL, candles(START + 60 * 9, 3, offset=0.5)) == 12
+    arrays = archive.read(MARKET, INTERVAL)
+    assert arrays['close'][8] == START + 60 * 8
+    np.testing.assert_array_equal(arrays['close'][9:], arrays['ts'][9:] + 0.5)
+
+    # 저장된 구간과 겹치면 새 데이터로 교체하고 시각 중복 없이 병합
+    assert archive.write(MARKET, INTERVAL, candles(START - 60 * 2, 5, offset=0.25)) == 14
+    arrays = archive.read(MARKET, INTERVAL)
+    assert np.all(np.diff(arrays['ts']) == 60)
+    np.testing.assert_array_equal(arrays['close'][:5], arrays['ts'][:5] + 0.25)
+    assert arrays['close'][5] == START + 60 * 3
+
+
+def test_file_without_head_field_reads_from_start(archive):
+    path = archive.get_path(MARKET, INTERVAL)
+    os.makedirs(os.path.dirname(path))
+    ArchiveFile.create(path, candles(START, 20), capacity=64)
+    # head 필드가 없던 이전 헤더 (magic, capacity, count) + 0 채움
+    with open(path, 'r+b') as f:
+        f.write(struct.pack('<8sqq', MAGIC, 64, 20).ljust(HEADER_SIZE, b'\0'))
+
+    assert_continuous(archive.read(MARKET, INTERVAL), START, 20)
+    archive.write(MARKET, INTERVAL, candles(START - 60 * 10, 10))
+    assert_continuous(archive.read(MARKET, INTERVAL), START - 60 * 10, 30)
+
+
+def test_interrupted_append_keeps_previous_count(archive):
+    archive.append(MARKET, INTERVAL, candles(START, 10))
+    archive_file = archive.open(MARKET, INTERVAL)
+    head, count = archive_file.get_bounds()
+    # 데이터만 쓰고 헤더를 갱신하기 전에 중단된 경우
+    archive_file.columns['ts'][head + count] = START + 60 * 10
+    assert len(CandleArchive(archive.root).read(MARKET, INTERVAL)['ts']) == 10
+
+
+def test_gap_recorded_on_discontinuous_append_and_removed(archive):
+    archive.append(MARKET, INTERVAL, candles(START, 10))
+    archive.append(MARKET, INTERVAL, candles(START + 60 * 30, 5))
+    gap = (START + 60 * 9, START + 60 * 30)
+    assert archive.get_gaps(MARKET, INTERVAL) == [gap]
+    assert os.path.exists(archive.get_gap_path(MARKET, INTERVAL))
+
+    archive.append(MARKET, INTERVAL, candles(START + 60 * 40, 5), record_gap=False)
+    assert archive.get_gaps(MARKET, INTERVAL) == [gap]
+
+    archive.remove_gap(MARKET, INTERVAL, gap)
+    assert archive.get_gaps(MARKET, INTERVAL) == []
+    assert not os.path.exists(archive.get_gap_path(MARKET, INTERVAL))
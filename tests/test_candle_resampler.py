@@ -0,0 +1,102 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.candle_resampler import RESAMPLE_INTERVALS, CandleResampler, bucket_start, resample_arrays
+from src.candle_store import CANDLE_FIELDS
+
+DAY_START = 19675 * 86400  # UTC 00:00 = KST 09:00
+
+
+def random_minutes(count=3000, missing=0.2, seed=0, start=DAY_START - 7 * 60):
+    """과거순 랜덤 1분봉 (거래 없는 분은 빠짐)"""
+    rng = np.random.default_rng(seed)
+    ts = start + 60 * np.arange(count, dtype=np.int64)
+    ts = ts[rng.random(count) >= missing]
+    size = len(ts)
+    open_ = 100 + rng.normal(0, 1, size).cumsum()
+    close = open_ + rng.normal(0, 0.5, size)
+    high = np.maximum(open_, close) + rng.random(size)
+    low = np.minimum(open_, close) - rng.random(size)
+    volume = rng.random(size) * 10
+    return {'ts': ts, 'open': open_, 'high': high, 'low': low, 'close': close,
+            'volume': volume, 'value': volume * close}
+
+
+def row_at(arrays, i):
+    return {field: arrays[field][i] for field in CANDLE_FIELDS}
+
+
+def assert_matches_resample(resampler, minutes):
+    for interval in resampler.states:
+        expected = resample_arrays(minutes, interval)
+        view = resampler.get_view(interval)
+        assert len(view) == len(expected['ts']), interval
+        for field in CANDLE_FIELDS:
+            np.testing.assert_allclose(view[field], expected[field], rtol=1e-12, err_msg=f"{interval} {field}")
+
+
+def test_bucket_alignment():
+    ts = DAY_START + 5 * 3600 + 7 * 60 + 30  # UTC 05:07:30 = KST 14:07:30
+    assert bucket_start(ts, 'minute3') == DAY_START + 5 * 3600 + 6 * 60
+    assert bucket_start(ts, 'minute10') == DAY_START + 5 * 3600
+    assert bucket_start(ts, 'minute60') == DAY_START + 5 * 3600
+    assert bucket_start(ts, 'minute240') == DAY_START + 4 * 3600
+    assert bucket_start(ts, 'day') == DAY_START
+    assert bucket_start(DAY_START - 1, 'day') == DAY_START - 86400
+
+
+def test_resample_arrays_aggregates_each_bucket():
+    minutes = random_minutes(count=120, missing=0.0, start=DAY_START)
+    five = resample_arrays(minutes, 'minute5')
+    assert len(five['ts']) == 24
+    assert five['open'][1] == minutes['open'][5]
+    assert five['close'][1] == minutes['close'][9]
+    assert five['high'][1] == minutes['high'][5:10].max()
+    assert five['low'][1] == minutes['low'][5:10].min()
+    assert five['volume'][1] == pytest.approx(minutes['volume'][5:10].sum())
+
+
+def test_streamed_minutes_match_vectorized_resample():
+    minutes = random_minutes()
+    resampler = CandleResampler(capacity=5000)
+    rng = np.random.default_rng(1)
+    for i in range(len(minutes['ts'])):
+        row = row_at(minutes, i)
+        # 형성 중 1분봉 갱신 (일부 체결만 반영) 후 최종 값
+        partial = dict(row, high=(row['open'] + row['high']) / 2, low=(row['open'] + row['low']) / 2,
+                       close=row['open'] + rng.normal(), volume=row['volume'] / 2, value=row['value'] / 2)
+        resampler.update(partial)
+        resampler.update(row)
+    assert_matches_resample(resampler, minutes)
+
+
+def test_load_history_then_stream_matches_resample():
+    minutes = random_minutes(seed=2)
+    split = len(minutes['ts']) // 2
+    resampler = CandleResampler(capacity=5000)
+    resampler.load({field: values[:split] for field, values in minutes.items()})
+    resampler.update_arrays({field: values[split:] for field, values in minutes.items()})
+    assert_matches_resample(resampler, minutes)
+
+
+def test_update_reports_closed_intervals_and_ignores_old_minutes():
+    resampler = CandleResampler(intervals=('minute5', 'minute60'), capacity=100)
+    minutes = random_minutes(count=61, missing=0.0, start=DAY_START)
+    closed = [resampler.update(row_at(minutes, i)) for i in range(61)]
+    assert closed[0] == []
+    assert closed[5] == ['minute5']
+    assert closed[60] == ['minute5', 'minute60']
+    assert sum(1 for item in closed if item) == 12
+
+    before = resampler.get_view('minute5', 1).close[0]
+    assert resampler.update(dict(row_at(minutes, 10), close=-1.0)) == []
+    assert resampler.get_view('minute5', 1).close[0] == before
+
+
+def test_all_intervals_are_resampled():
+    assert set(CandleResampler(capacity=10).states) == set(RESAMPLE_INTERVALS)
@@ -0,0 +1,150 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import Config
+from emulator.orderbook_replay import ReplayVenue
+from src.execution_engine import ExecutionEngine, ParentOrder
+
+MARKET = 'KRW-BTC'
+START = 1_700_000_000
+
+
+def make_snapshots(prices, tick=1000, size=1.0, start=START):
+    """초마다 하나씩, prices[i]를 최우선 매수 호가로 하는 1틱 스프레드 호가"""
+    rows = []
+    for i, bid in enumerate(prices):
+        units = [{
+            'ask_price': bid + tick * (k + 1), 'bid_price': bid - tick * k,
+            'ask_size': size, 'bid_size': size,
+        } for k in range(15)]
+        rows.append((start + i, {'market': MARKET, 'timestamp': (start + i) * 1000, 'orderbook_units': units}))
+    return {MARKET: rows}
+
+
+def flat(seconds=600, bid=50_000_000):
+    """가격이 움직이지 않는 호가 (대기 주문은 체결되지 않음)"""
+    return make_snapshots([bid] * seconds)
+
+
+def zigzag(seconds=600, bid=50_000_000, tick=1000):
+    """두 호가 사이를 오가는 호가 (대기 주문이 번갈아 체결됨)"""
+    return make_snapshots([bid + tick * (i % 3) for i in range(seconds)], tick=tick)
+
+
+class NoFundsVenue(ReplayVenue):
+    """목록/개별 주문 응답에 체결 금액이 없는 거래소"""
+    def get_orders(self, uuids):
+        return [{k: v for k, v in row.items() if k != 'executed_funds'} for row in super().get_orders(uuids)]
+
+    def get_order(self, uuid):
+        return None
+
+
+class FailingCancelVenue(ReplayVenue):
+    """처음 failures번(None이면 항상) 취소에 실패하는 거래소"""
+    def __init__(self, *args, failures=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.failures = failures
+        self.cancel_calls = 0
+
+    def cancel_order(self, uuid):
+        self.cancel_calls += 1
+        if self.failures is None or self.cancel_calls <= self.failures:
+            return None
+        return super().cancel_order(uuid)
+
+
+class RecordingVenue(ReplayVenue):
+    """주문 생성/취소 시각 기록"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = []
+
+    def place_limit_order(self, *args, **kwargs):
+        self.calls.append(self.clock)
+        return super().place_limit_order(*args, **kwargs)
+
+    def cancel_order(self, uuid):
+        self.calls.append(self.clock)
+        return super().cancel_order(uuid)
+
+
+def spent(venue, initial_krw):
+    account = venue.state.get_account('KRW')
+    return initial_krw - account['balance'] - account['locked']
+
+
+@pytest.mark.parametrize('snapshots', [flat, zigzag])
+def test_buy_without_executed_funds_never_overspends(snapshots):
+    initial_krw = 10_000_000
+    venue = NoFundsVenue(snapshots(), initial_krw=initial_krw)
+    parent = ParentOrder(MARKET, 'bid', funds=100_000, duration=60, slices=6)
+    report = ExecutionEngine(venue, poll_interval=1.0, reprice_interval=1.0).execute(parent)
+
+    assert report.executed_volume > 0
+    assert report.executed_funds <= 100_000
+    assert spent(venue, initial_krw) <= 100_000 * (1 + Config.FEE_RATE) + 1e-6
+
+
+@pytest.mark.parametrize('side', ['bid', 'ask'])
+def test_zigzag_book_fills_without_overfill(side):
+    venue = ReplayVenue(zigzag(), initial_krw=1e9, balances={'BTC': 1.0})
+    parent = ParentOrder(MARKET, side, funds=5_000_000 if side == 'bid' else None,
+                         volume=0.1 if side == 'ask' else None, duration=60, slices=6)
+    report = ExecutionEngine(venue, poll_interval=1.0, reprice_interval=1.0).execute(parent)
+
+    assert parent.executed <= parent.total + 1e-8
+    assert parent.is_complete(report.arrival_price)
+    assert report.reprice_count > 0
+    assert not report.open_children
+
+
+def test_failed_cancel_gives_up_instead_of_hanging():
+    venue = FailingCancelVenue(flat(), initial_krw=1e9)
+    engine = ExecutionEngine(venue, poll_interval=1.0, reprice_interval=1.0, cancel_timeout=10)
+    parent = ParentOrder(MARKET, 'bid', funds=1_000_000, style='peg', duration=30)
+    report = engine.execute(parent)
+
+    assert report.elapsed <= 30 + 10 + 2
+    assert venue.cancel_calls > 1  # 실패한 취소는 다시 요청
+    assert len(report.open_children) == 1
+    assert report.executed_volume == 0  # 대기 주문이 남아 있으면 남은 양을 처리하지 않음
+    assert report.ioc_count == 0
+
+
+def test_cancel_retried_until_accepted_then_swept():
+    venue = FailingCancelVenue(flat(), initial_krw=1e9, failures=2)
+    engine = ExecutionEngine(venue, poll_interval=1.0, reprice_interval=1.0, cancel_timeout=10)
+    parent = ParentOrder(MARKET, 'bid', funds=1_000_000, style='peg', duration=30)
+    report = engine.execute(parent)
+
+    assert venue.cancel_calls == 3
+    assert not report.open_children
+    assert report.ioc_count >= 1
+    assert parent.is_complete(report.arrival_price)
+
+
+def test_sweep_fills_remainder_with_capped_ioc():
+    # 대기 주문이 체결되지 않는 호가에서는 마감 후 IOC로 남은 양을 처리
+    venue = ReplayVenue(flat(), initial_krw=1e9, balances={'BTC': 1.0})
+    parent = ParentOrder(MARKET, 'ask', volume=0.05, style='peg', duration=20)
+    report = ExecutionEngine(venue, poll_interval=1.0, reprice_interval=1.0).execute(parent)
+
+    assert report.ioc_count >= 1
+    assert report.executed_volume == pytest.approx(0.05)
+    assert report.unfilled_volume == pytest.approx(0.0, abs=1e-8)
+    assert min(child.price for child in report.children) >= 50_000_000 * (1 - Config.EXECUTION_MAX_SLIPPAGE)
+
+
+def test_order_rate_is_respected():
+    venue = RecordingVenue(zigzag(), initial_krw=1e9)
+    engine = ExecutionEngine(venue, order_rate=0.5, poll_interval=0.25, reprice_interval=0)
+    engine.execute(ParentOrder(MARKET, 'bid', funds=5_000_000, duration=60))
+
+    gaps = [later - earlier for earlier, later in zip(venue.calls, venue.calls[1:])]
+    assert gaps and min(gaps) >= 2.0 - 1e-9
+    assert engine.deferred_count > 0
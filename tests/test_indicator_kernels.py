@@ -0,0 +1,48 @@
+import os
+import sys
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import indicator_kernels as kernels
+
+
+def random_closes(markets=4, candles=300, seed=0):
+    rng = np.random.default_rng(seed)
+    return 100 + rng.normal(0, 1, (markets, candles)).cumsum(axis=1)
+
+
+@pytest.mark.parametrize('candles', [10, 63, 64, 65, 300])
+def test_ema_matches_pandas(candles):
+    close = random_closes(candles=candles)
+    close[0, :candles // 3] = np.nan  # 이력이 짧은 마켓
+    expected = np.array([pd.Series(row).ewm(span=12).mean().to_numpy() for row in close])
+    np.testing.assert_allclose(kernels.ema(close, 12), expected, rtol=1e-10)
+
+
+def test_wilder_matches_recurrence():
+    values = random_closes(candles=200)
+    values[1, :50] = np.nan
+    result = kernels.wilder(values, 14)
+    for row, out in zip(values, result):
+        start = np.flatnonzero(~np.isnan(row))[0]
+        smoothed = row[start:start + 14].mean()
+        assert out[start + 13] == pytest.approx(smoothed)
+        for t in range(start + 14, len(row)):
+            smoothed = (smoothed * 13 + row[t]) / 14
+            assert out[t] == pytest.approx(smoothed)
+        assert np.isnan(out[:start + 13]).all()
+
+
+def test_bollinger_without_history_has_no_warnings():
+    close = random_closes(markets=2, candles=30)
+    close[0] = np.nan  # 이력을 불러오지 못한 마켓
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        _, _, _, std = kernels.bollinger(close, 20, 2.0)
+    assert np.isnan(std[0]).all()
+    assert std[1, -1] == pytest.approx(np.std(close[1, -20:], ddof=1))
@@ -0,0 +1,118 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import rate_limiter as rate_limiter_module
+from src.rate_limiter import RateLimiter, TokenBucket
+
+
+class FakeClock:
+    """time 모듈 대체 (sleep은 시계만 앞으로 옮김)"""
+    def __init__(self, now=1000.0):
+        self.now = now
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter_module, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def limiter(clock):
+    return RateLimiter({'quotation': 10, 'account': 30, 'order': 8})
+
+
+def test_bucket_allows_burst_then_spaces_requests():
+    bucket = TokenBucket(rate=5)
+    bucket.updated = 0.0
+    assert [bucket.reserve(0.0) for _ in range(5)] == [0.0] * 5
+    # 이후 요청은 대기열에 예약되어 1/rate 간격으로 허용
+    assert [bucket.reserve(0.0) for _ in range(3)] == pytest.approx([0.2, 0.4, 0.6])
+    # 예약분을 소화할 시간이 지나면 다시 바로 허용
+    assert bucket.reserve(0.8) == 0.0
+
+
+def test_try_take_never_goes_negative():
+    bucket = TokenBucket(rate=2)
+    bucket.updated = 0.0
+    assert bucket.try_take(0.0) and bucket.try_take(0.0)
+    assert not bucket.try_take(0.0)
+    assert bucket.tokens == pytest.approx(0.0)
+    assert bucket.try_take(0.5)
+
+
+def test_header_resyncs_matching_group(limiter):
+    # 서버 기준 남은 요청이 0이면 로컬 토큰이 남아 있어도 다음 요청은 대기
+    limiter.update_from_header('group=default; min=1799; sec=0')
+    assert limiter.reserve('account') == pytest.approx(1 / 30)
+    assert limiter.reserve('quotation') == 0.0
+
+    limiter.update_from_header('group=order; min=479; sec=2')
+    assert [limiter.reserve('order') for _ in range(3)] == pytest.approx([0.0, 0.0, 1 / 8])
+
+
+def test_header_group_falls_back_to_request_group(limiter):
+    limiter.update_from_header('group=market; min=599; sec=1', group='quotation')
+    assert [limiter.reserve('quotation') for _ in range(2)] == pytest.approx([0.0, 0.1])
+
+
+def test_header_never_adds_tokens(limiter):
+    for _ in range(10):
+        limiter.reserve('quotation')
+    limiter.update_from_header('group=market; min=599; sec=9', group='quotation')
+    assert limiter.reserve('quotation') == pytest.approx(0.1)
+
+
+@pytest.mark.parametrize('header', [None, '', 'group=default; sec=abc', 'garbage'])
+def test_bad_header_is_ignored(limiter, header):
+    limiter.update_from_header(header)
+    assert limiter.reserve('account') == 0.0
+
+
+def test_throttle_blocks_group_for_backoff(limiter, clock):
+    limiter.throttle('order', seconds=2.0)
+    limiter.acquire('order')
+    assert clock.slept == pytest.approx([2.0 + 1 / 8])
+    assert limiter.get_stats()['throttled'] == 1
+    assert limiter.reserve('quotation') == 0.0
+
+
+def test_acquire_async_waits_without_blocking(limiter, monkeypatch):
+    waits = []
+
+    async def fake_sleep(seconds):
+        waits.append(seconds)
+
+    monkeypatch.setattr(rate_limiter_module.asyncio, 'sleep', fake_sleep)
+
+    async def burst():
+        await asyncio.gather(*(limiter.acquire_async('quotation') for _ in range(12)))
+
+    asyncio.run(burst())
+    assert waits == pytest.approx([0.1, 0.2])
+    assert limiter.get_stats()['waits'] == 2
+
+
+@pytest.mark.parametrize('method,path,auth,group', [
+    ('GET', '/v1/ticker', False, 'quotation'),
+    ('GET', '/v1/accounts', True, 'account'),
+    ('GET', '/v1/order', True, 'account'),
+    ('POST', '/v1/orders', True, 'order'),
+    ('DELETE', '/v1/order', True, 'order'),
+])
+def test_group_for(method, path, auth, group):
+    assert RateLimiter.group_for(method, path, auth) == group